@@ -0,0 +1,121 @@
+"""
+Мікробенчмарк DocumentChunker на синтетичному ТЗ.
+
+Генерує документ зі структурою КМУ №205 (секції, підсекції, абзаци
+різної довжини, довгі рядки без крапок — як у таблицях), розбиває
+його в режимі символів та токенів e5 і друкує пропускну здатність,
+пікову пам'ять та масштабування 100 → 500 сторінок. Час на сторінку
+має лишатися сталим (лінійна складність).
+
+Запуск: ``python scripts/benchmark_chunker.py [сторінок]``.
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+from src.config import settings
+from src.rag.chunker import DocumentChunker, load_tokenizer
+from src.utils.exceptions import RAGError
+
+PAGES = 500
+# ~1800 символів тексту на сторінку А4
+CHARS_PER_PAGE = 1800
+
+WORDS = (
+    "система забезпечує обробку персональних даних відповідно до вимог "
+    "законодавства України модуль інтеграції обмінюється даними з реєстрами "
+    "через систему електронної взаємодії державних електронних інформаційних "
+    "ресурсів Трембіта користувач авторизується за допомогою кваліфікованого "
+    "електронного підпису журнал подій зберігається не менше трьох років"
+).split()
+
+
+def synthetic_tz(pages: int, seed: int = 205) -> list[str]:
+    """
+    Синтетичне ТЗ з абзацами-рядками, як їх віддає DOCX reader.
+
+    Args:
+        pages: Кількість сторінок.
+        seed: Seed генератора.
+
+    Returns:
+        Абзаци документу.
+    """
+    rng = random.Random(seed)
+    lines: list[str] = []
+    chars = 0
+    section = subsection = 0
+
+    while chars < pages * CHARS_PER_PAGE:
+        if rng.random() < 0.03:
+            section += 1
+            subsection = 0
+            lines.append(f"{section}. Розділ {section}")
+        elif rng.random() < 0.08:
+            subsection += 1
+            lines.append(f"{section}.{subsection}. Підрозділ {subsection}")
+
+        if rng.random() < 0.1:
+            # Рядок таблиці: довгий, без кінця речення
+            line = " | ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 200)))
+        else:
+            sentences = [
+                " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 30))).capitalize() + "."
+                for _ in range(rng.randint(1, 8))
+            ]
+            line = " ".join(sentences)
+        lines.append(line)
+        chars += len(line)
+
+    return lines
+
+
+def run(chunker: DocumentChunker, lines: list[str]) -> tuple[float, int, int]:
+    """
+    Розбиття документу з вимірюванням часу та пікової пам'яті.
+
+    Returns:
+        (секунди, кількість чанків, пікова пам'ять у байтах).
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    chunks = sum(1 for _ in chunker.iter_chunks(iter(lines), source_file="synthetic.docx"))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, chunks, peak
+
+
+def report(name: str, chunker: DocumentChunker, pages: int) -> None:
+    """Друк результатів для одного режиму чанкера."""
+    small = run(chunker, synthetic_tz(pages // 5))[0]
+    elapsed, chunks, peak = run(chunker, synthetic_tz(pages))
+
+    print(f"{name}:")
+    print(f"  {pages} сторінок: {elapsed:.2f}с, {pages / elapsed:.0f} стор/с, чанків: {chunks}")
+    print(f"  Пікова пам'ять: {peak / 1024 / 1024:.1f} МБ")
+    print(f"  Масштабування ×5 сторінок: ×{elapsed / small:.1f} часу")
+
+
+if __name__ == "__main__":
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else PAGES
+    chars = sum(len(line) for line in synthetic_tz(pages))
+    print(f"Синтетичне ТЗ: {pages} сторінок, {chars / 1_000_000:.1f} млн символів\n")
+
+    report("Символи (1000/200)", DocumentChunker(chunk_size=1000, chunk_overlap=200), pages)
+
+    try:
+        if not settings.chunk_tokenizer:
+            raise RAGError("CHUNK_TOKENIZER не задано")
+        load_tokenizer(settings.chunk_tokenizer)
+    except RAGError as e:
+        print(f"\nТокени: пропущено ({e})")
+    else:
+        print()
+        report(
+            f"Токени {settings.chunk_tokenizer} ({settings.chunk_size}/{settings.chunk_overlap})",
+            DocumentChunker.from_settings(),
+            pages,
+        )
@@ -0,0 +1,85 @@
+"""
+Бенчмарк часу імпорту API (``python -X importtime``).
+
+Автомасштабовані контейнери платять за кожну секунду холодного старту.
+Скрипт імпортує ``src.main`` в чистому інтерпретаторі, друкує
+найповільніші модулі та завершується з помилкою, якщо:
+- імпортовано важку залежність, що має завантажуватися ліниво;
+- сумарний час імпорту перевищує бюджет.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Модулі, які не повинні імпортуватися при старті API
+HEAVY_MODULES = (
+    "torch",
+    "sentence_transformers",
+    "transformers",
+    "qdrant_client",
+    "docx",
+    "numpy",
+)
+
+# Бюджет сумарного часу імпорту src.main (секунди)
+IMPORT_BUDGET_SECONDS = 2.5
+
+TOP_N = 15
+
+
+def measure(module: str = "src.main") -> list[tuple[str, int, int]]:
+    """
+    Імпорт модуля з ``-X importtime`` у підпроцесі.
+
+    Args:
+        module: Модуль для імпорту.
+
+    Returns:
+        Список (модуль, self мкс, cumulative мкс) у порядку імпорту.
+    """
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        env=env,
+        check=True,
+    )
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def imported_heavy_modules(rows: list[tuple[str, int, int]]) -> list[str]:
+    """Важкі залежності серед імпортованих модулів."""
+    names = {name for name, _, _ in rows}
+    return [module for module in HEAVY_MODULES if module in names]
+
+
+if __name__ == "__main__":
+    rows = measure()
+    total = sum(self_us for _, self_us, _ in rows) / 1_000_000
+
+    print(f"Імпорт src.main: {total:.2f}с, модулів: {len(rows)}\n")
+    print(f"Топ-{TOP_N} за cumulative часом:")
+    for name, _, cumulative_us in sorted(rows, key=lambda r: r[2], reverse=True)[:TOP_N]:
+        print(f"  {cumulative_us / 1000:8.1f} мс  {name}")
+
+    heavy = imported_heavy_modules(rows)
+    if heavy:
+        print(f"\n✗ Важкі залежності імпортуються при старті: {', '.join(heavy)}")
+        sys.exit(1)
+    if total > IMPORT_BUDGET_SECONDS:
+        print(f"\n✗ Час імпорту перевищує бюджет {IMPORT_BUDGET_SECONDS}с")
+        sys.exit(1)
+    print(f"\n✓ У межах бюджету {IMPORT_BUDGET_SECONDS}с, важких залежностей немає")
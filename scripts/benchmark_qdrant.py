@@ -0,0 +1,133 @@
+"""
+Звіт recall/latency для налаштувань колекції Qdrant.
+
+Запити будуються з векторів колекції (нормалізована сума двох
+випадкових точок), еталон — точний перебір (``exact=True``). Для
+пошуку без фільтра та з фільтром по ``section_id`` друкується
+recall@k налаштованого пошуку (HNSW ``QDRANT_HNSW_EF``, квантизація з
+rescoring) відносно еталону та затримки p50/p95.
+
+Запуск: ``python scripts/benchmark_qdrant.py [запитів] [top_k]``.
+"""
+
+import math
+import random
+import statistics
+import sys
+import time
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import FieldCondition, Filter, MatchValue
+
+from src.config import settings
+from src.rag.collection import search_params
+
+QUERIES = 200
+TOP_K = 5
+SEED = 205
+
+
+def sample_queries(client: QdrantClient, count: int) -> list[tuple[list[float], str | None]]:
+    """
+    Запити з векторів колекції.
+
+    Args:
+        client: Клієнт Qdrant.
+        count: Кількість запитів.
+
+    Returns:
+        Пари (вектор запиту, section_id першої точки).
+    """
+    points, _ = client.scroll(
+        settings.qdrant_collection,
+        limit=max(count * 2, 100),
+        with_vectors=True,
+        with_payload=["section_id"],
+    )
+    if len(points) < 2:
+        raise SystemExit(f"Колекція '{settings.qdrant_collection}' порожня — спершу інгестія")
+
+    rng = random.Random(SEED)
+    queries = []
+    for _ in range(count):
+        a, b = rng.sample(points, 2)
+        vector = [x + y for x, y in zip(a.vector, b.vector)]
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        queries.append(([x / norm for x in vector], (a.payload or {}).get("section_id")))
+    return queries
+
+
+def timed_search(
+    client: QdrantClient,
+    vector: list[float],
+    query_filter: Filter | None,
+    top_k: int,
+    exact: bool,
+) -> tuple[list, float]:
+    """Один запит: (ID результатів, затримка в мс)."""
+    start = time.perf_counter()
+    response = client.query_points(
+        settings.qdrant_collection,
+        query=vector,
+        query_filter=query_filter,
+        search_params=search_params(exact=exact),
+        limit=top_k,
+    )
+    return [point.id for point in response.points], (time.perf_counter() - start) * 1000
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Перцентиль (q від 0 до 100)."""
+    return statistics.quantiles(values, n=100)[int(q) - 1] if len(values) > 1 else values[0]
+
+
+def report(
+    client: QdrantClient,
+    queries: list[tuple[list[float], str | None]],
+    top_k: int,
+    filtered: bool,
+) -> None:
+    """Recall@k та затримки для одного сценарію."""
+    recalls: list[float] = []
+    latencies: dict[bool, list[float]] = {True: [], False: []}
+
+    for vector, section_id in queries:
+        query_filter = None
+        if filtered and section_id:
+            query_filter = Filter(
+                must=[FieldCondition(key="section_id", match=MatchValue(value=section_id))]
+            )
+        expected, exact_ms = timed_search(client, vector, query_filter, top_k, exact=True)
+        found, approx_ms = timed_search(client, vector, query_filter, top_k, exact=False)
+        latencies[True].append(exact_ms)
+        latencies[False].append(approx_ms)
+        if expected:
+            recalls.append(len(set(found) & set(expected)) / len(expected))
+
+    name = "З фільтром section_id" if filtered else "Без фільтра"
+    print(f"{name}:")
+    print(f"  recall@{top_k}: {statistics.mean(recalls):.3f}")
+    for exact, label in ((False, "налаштований"), (True, "точний перебір")):
+        values = latencies[exact]
+        p50, p95 = percentile(values, 50), percentile(values, 95)
+        print(f"  {label:15s} p50 {p50:6.2f} мс, p95 {p95:6.2f} мс")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else QUERIES
+    top_k = int(sys.argv[2]) if len(sys.argv) > 2 else TOP_K
+
+    client = QdrantClient(url=settings.qdrant_url)
+    info = client.get_collection(settings.qdrant_collection)
+    config = info.config
+
+    print(f"Колекція '{settings.qdrant_collection}': {info.points_count} точок")
+    hnsw = config.hnsw_config
+    print(f"HNSW: m={hnsw.m}, ef_construct={hnsw.ef_construct}, ef={settings.qdrant_hnsw_ef}")
+    print(f"Квантизація: {config.quantization_config or 'немає'}")
+    print(f"Payload індекси: {', '.join(info.payload_schema) or 'немає'}\n")
+
+    queries = sample_queries(client, count)
+    report(client, queries, top_k, filtered=False)
+    print()
+    report(client, queries, top_k, filtered=True)
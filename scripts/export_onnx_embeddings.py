@@ -0,0 +1,109 @@
+"""
+Експорт моделі ембедінгів в int8 ONNX та перевірка якості.
+
+Одноразова команда для CPU-вузлів без GPU:
+1. експорт ``settings.embedding_model`` в ONNX з динамічною int8 квантизацією
+   у ``settings.embedding_onnx_dir``;
+2. порівняння косинусної подібності int8 та fp32 ембедінгів на корпусі
+   зразків ТЗ (data/samples/).
+
+Після успішної перевірки встановіть EMBEDDING_BACKEND=onnx.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from docx import Document
+from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+from src.config import settings
+from src.rag.chunker import DocumentChunker
+from src.rag.embeddings import EmbeddingService
+
+SAMPLES_DIR = Path("data/samples")
+
+# Мінімальна середня косинусна подібність int8 до fp32
+MIN_MEAN_SIMILARITY = 0.98
+
+
+def export_onnx_model() -> Path:
+    """
+    Експорт та int8 квантизація моделі ембедінгів.
+
+    Returns:
+        Директорія з експортованою моделлю.
+    """
+    output_dir = Path(settings.embedding_onnx_dir)
+    print(f"Експорт {settings.embedding_model} → {output_dir}")
+
+    model = SentenceTransformer(settings.embedding_model, backend="onnx")
+    model.save(str(output_dir))
+    export_dynamic_quantized_onnx_model(
+        model,
+        quantization_config=settings.embedding_onnx_quantization,
+        model_name_or_path=str(output_dir),
+    )
+
+    print(f"Квантизація: {settings.embedding_onnx_quantization}")
+    return output_dir
+
+
+def load_sample_texts() -> list[str]:
+    """Чанки корпусу зразків ТЗ для порівняння."""
+    chunker = DocumentChunker.from_settings()
+    texts: list[str] = []
+    for file_path in sorted(SAMPLES_DIR.glob("*.docx")):
+        doc = Document(str(file_path))
+        text = "\n".join(p.text for p in doc.paragraphs if p.text.strip())
+        texts.extend(chunk.text for chunk in chunker.chunk_document(text, file_path.name))
+    return texts
+
+
+def check_quality(texts: list[str]) -> bool:
+    """
+    Порівняння int8 ONNX з fp32 моделлю.
+
+    Args:
+        texts: Тексти для ембедінгу.
+
+    Returns:
+        True, якщо середня подібність не нижча за MIN_MEAN_SIMILARITY.
+    """
+    results = {}
+    for backend in ("torch", "onnx"):
+        model = EmbeddingService(backend=backend).model
+        start = time.perf_counter()
+        embeddings = model.encode(texts, show_progress_bar=False, normalize_embeddings=True)
+        elapsed = time.perf_counter() - start
+        results[backend] = embeddings
+        per_text_ms = elapsed / len(texts) * 1000
+        print(f"{backend}: {len(texts)} текстів за {elapsed:.1f}с ({per_text_ms:.1f} мс/текст)")
+
+    similarities = np.sum(results["torch"] * results["onnx"], axis=1)
+    mean = float(similarities.mean())
+
+    print("\nКосинусна подібність int8 vs fp32:")
+    print(f"  середня: {mean:.4f}")
+    print(f"  мінімальна: {float(similarities.min()):.4f}")
+    print(f"  p5: {float(np.percentile(similarities, 5)):.4f}")
+
+    return mean >= MIN_MEAN_SIMILARITY
+
+
+if __name__ == "__main__":
+    export_onnx_model()
+
+    sample_texts = load_sample_texts()
+    if not sample_texts:
+        print(f"Зразки не знайдено в {SAMPLES_DIR}, перевірку якості пропущено.")
+        sys.exit(0)
+
+    if not check_quality(sample_texts):
+        print(
+            f"\n✗ Середня подібність нижча за {MIN_MEAN_SIMILARITY}, "
+            "залиште EMBEDDING_BACKEND=torch"
+        )
+        sys.exit(1)
+    print("\n✓ Якість прийнятна, можна встановити EMBEDDING_BACKEND=onnx")
@@ -41,6 +41,16 @@ def ingest_samples() -> None:
     total = sum(results.values())
     print(f"\nЗагалом: {total} чанків з {len(results)} файлів")
 
+    stats = pipeline.stats
+    print(
+        f"Проіндексовано: {stats.files_ingested} файлів, {stats.chunks} чанків "
+        f"(пропущено незмінених: {stats.files_skipped}) за {stats.elapsed_s:.1f}с"
+    )
+    print(
+        f"Пропускна здатність: {stats.docs_per_second:.2f} docs/s, "
+        f"{stats.chunks_per_second:.1f} chunks/s"
+    )
+
 
 if __name__ == "__main__":
     ingest_samples()
@@ -1,41 +1,64 @@
 """
 Ініціалізація Qdrant колекції для RAG.
 
-Створює колекцію з налаштуваннями для multilingual-e5-large.
+Створює колекцію з налаштуваннями для multilingual-e5-large: HNSW,
+вектори на диску та int8 квантизація за QDRANT_*, keyword індекси
+``section_id`` / ``source_file`` та sparse-вектором BM25. Існуючій
+колекції додаються відсутні payload індекси.
+
+``--recreate`` перестворює колекцію (напр. щоб додати sparse-вектори
+колекції, створеній до гібридного пошуку) та скидає маніфест інгестії,
+щоб наступна інгестія проіндексувала всі файли.
 """
 
+import sys
+
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams
 
 from src.config import settings
+from src.rag.collection import create_collection, ensure_payload_indexes, has_sparse_vectors
+from src.rag.ingestion import IngestionManifest
+
+# Розмірність multilingual-e5-large
+DIMENSION = 1024
+
 
+def setup_qdrant(recreate: bool = False) -> None:
+    """
+    Створення колекції у Qdrant.
 
-def setup_qdrant() -> None:
-    """Створення колекції у Qdrant."""
+    Args:
+        recreate: Видалити існуючу колекцію та скинути маніфест інгестії.
+    """
     client = QdrantClient(url=settings.qdrant_url)
 
-    collections = client.get_collections().collections
-    existing_names = [c.name for c in collections]
+    if recreate and client.collection_exists(settings.qdrant_collection):
+        client.delete_collection(settings.qdrant_collection)
+        IngestionManifest().reset(settings.qdrant_collection)
+        print(f"Колекцію '{settings.qdrant_collection}' видалено, маніфест інгестії скинуто.")
 
-    if settings.qdrant_collection in existing_names:
+    if client.collection_exists(settings.qdrant_collection):
         print(f"Колекція '{settings.qdrant_collection}' вже існує.")
         info = client.get_collection(settings.qdrant_collection)
         print(f"Кількість точок: {info.points_count}")
+        created = ensure_payload_indexes(client, settings.qdrant_collection)
+        if created:
+            print(f"Додано payload індекси: {', '.join(created)}")
+        if not has_sparse_vectors(client, settings.qdrant_collection):
+            print("Колекція без sparse-векторів BM25: гібридний пошук вимкнено.")
+            print("Перестворіть: python scripts/setup_qdrant.py --recreate, потім інгестія.")
         return
 
-    # Розмірність multilingual-e5-large = 1024
-    client.create_collection(
-        collection_name=settings.qdrant_collection,
-        vectors_config=VectorParams(
-            size=1024,
-            distance=Distance.COSINE,
-        ),
-    )
+    create_collection(client, settings.qdrant_collection, DIMENSION)
 
     print(f"Колекція '{settings.qdrant_collection}' створена успішно!")
-    print(f"Розмірність векторів: 1024 (multilingual-e5-large)")
-    print(f"Метрика: Cosine Similarity")
+    print(f"Розмірність векторів: {DIMENSION} (multilingual-e5-large)")
+    print("Метрика: Cosine Similarity")
+    print(f"HNSW: m={settings.qdrant_hnsw_m}, ef_construct={settings.qdrant_hnsw_ef_construct}")
+    print(f"Вектори на диску: {settings.qdrant_on_disk_vectors}")
+    print(f"Int8 квантизація: {settings.qdrant_quantization_enabled}")
+    print("Sparse-вектор BM25: так (гібридний пошук)")
 
 
 if __name__ == "__main__":
-    setup_qdrant()
+    setup_qdrant(recreate="--recreate" in sys.argv[1:])
@@ -4,7 +4,9 @@
 
 from typing import Any
 
-from src.llm.router import LLMRouter
+from src.llm.router import LLMRouter, get_shared_router
+from src.utils.deadline import current_deadline
+from src.utils.exceptions import GenerationTimeoutError
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -25,7 +27,7 @@ class BaseAgent:
     role: str = "assistant"
 
     def __init__(self, llm_router: LLMRouter | None = None) -> None:
-        self.llm_router = llm_router or LLMRouter()
+        self.llm_router = llm_router or get_shared_router()
 
     async def execute(self, **kwargs: Any) -> dict[str, Any]:
         """
@@ -36,10 +38,18 @@ class BaseAgent:
 
         Returns:
             Результат виконання.
+
+        Raises:
+            GenerationTimeoutError: Якщо дедлайн генерації вже вичерпано.
         """
+        deadline = current_deadline.get()
+        if deadline is not None and deadline.expired:
+            raise GenerationTimeoutError(f"Дедлайн вичерпано до запуску агента {self.name}")
+
         logger.info(
             "agent_execution_started",
             agent=self.name,
+            deadline_remaining_s=round(deadline.remaining(), 1) if deadline else None,
         )
         try:
             result = await self._process(**kwargs)
@@ -69,6 +69,7 @@ class ComplianceCheckerAgent(BaseAgent):
         Args:
             project_name: Назва проєкту.
             sections: Список згенерованих секцій.
+            use_cache: Дозволити кеш відповіді LLM (за замовчуванням True).
 
         Returns:
             Результат перевірки з оцінкою та рекомендаціями.
@@ -95,6 +96,7 @@ class ComplianceCheckerAgent(BaseAgent):
             system_prompt=COMPLIANCE_SYSTEM_PROMPT,
             temperature=0.2,
             max_tokens=2048,
+            use_cache=kwargs.get("use_cache", True),
         )
 
         # Парсинг відповіді Claude
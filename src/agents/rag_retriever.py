@@ -7,7 +7,8 @@
 from typing import Any
 
 from src.agents.base import BaseAgent
-from src.rag.retriever import RAGRetriever
+from src.config import settings
+from src.rag.retriever import RAGRetriever, get_shared_retriever
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -31,7 +32,7 @@ class RAGRetrieverAgent(BaseAgent):
         **kwargs: Any,
     ) -> None:
         super().__init__(**kwargs)
-        self.retriever = retriever or RAGRetriever()
+        self.retriever = retriever or get_shared_retriever()
 
     async def _process(self, **kwargs: Any) -> dict[str, Any]:
         """
@@ -52,15 +53,12 @@ class RAGRetrieverAgent(BaseAgent):
         # Формування пошукового запиту з вимог
         search_query = self._build_search_query(project_description, requirements)
 
-        contexts: dict[str, str] = {}
-
-        for section_id in sections:
-            context = await self.retriever.search_for_section(
-                section_id=section_id,
-                project_description=search_query,
-                top_k=3,
-            )
-            contexts[section_id] = context
+        # Один пакетний запит для всіх секцій (+ fallback лише для порожніх)
+        contexts = await self.retriever.search_for_sections(
+            section_ids=sections,
+            project_description=search_query,
+            top_k=settings.rag_top_k,
+        )
 
         logger.info(
             "rag_contexts_retrieved",
@@ -64,6 +64,7 @@ class RequirementsAnalystAgent(BaseAgent):
             project_name: Назва проєкту.
             project_description: Опис проєкту.
             additional_requirements: Додаткові вимоги (опціонально).
+            use_cache: Дозволити кеш відповіді LLM (за замовчуванням True).
 
         Returns:
             Структуровані вимоги у форматі dict.
@@ -89,6 +90,7 @@ class RequirementsAnalystAgent(BaseAgent):
             prompt=prompt,
             system_prompt=REQUIREMENTS_SYSTEM_PROMPT,
             temperature=0.3,
+            use_cache=kwargs.get("use_cache", True),
         )
 
         # Парсинг JSON відповіді
@@ -5,6 +5,7 @@
 з використанням RAG контексту.
 """
 
+from collections.abc import AsyncIterator
 from typing import Any
 
 from src.agents.base import BaseAgent
@@ -71,30 +72,7 @@ class SectionGeneratorAgent(BaseAgent):
             Словник з id, title, content, subsections.
         """
         section_id = kwargs.get("section_id", "1")
-        project_name = kwargs.get("project_name", "")
-        project_description = kwargs.get("project_description", "")
-        requirements = kwargs.get("requirements", {})
-        rag_context = kwargs.get("rag_context", "")
-
-        section_info = KMU_205_STRUCTURE.get(section_id, {})
-        section_title = section_info.get("title", f"Секція {section_id}")
-
-        # Підготовка тексту вимог
-        requirements_text = self._format_requirements(requirements)
-
-        # Підготовка інструкцій для підсекцій
-        subsections = get_all_subsections(section_id)
-        subsections_instruction = self._format_subsections_instruction(subsections)
-
-        prompt = SECTION_PROMPT_TEMPLATE.format(
-            section_id=section_id,
-            section_title=section_title,
-            project_name=project_name,
-            project_description=project_description,
-            requirements_text=requirements_text,
-            rag_context=rag_context or "Контекст не знайдено.",
-            subsections_instruction=subsections_instruction,
-        )
+        section_title, subsections, prompt = self._build_prompt(**kwargs)
 
         response = await self.llm_router.route(
             task_type="section_generation",
@@ -126,6 +104,65 @@ class SectionGeneratorAgent(BaseAgent):
 
         return result
 
+    async def stream(self, **kwargs: Any) -> AsyncIterator[str]:
+        """
+        Потокова генерація однієї секції ТЗ.
+
+        Приймає ті ж параметри, що й ``execute``, але повертає текст
+        фрагментами по мірі генерації LLM.
+
+        Yields:
+            Фрагменти контенту секції.
+        """
+        section_id = kwargs.get("section_id", "1")
+        _, _, prompt = self._build_prompt(**kwargs)
+
+        logger.info("section_stream_started", section_id=section_id)
+
+        async for chunk in self.llm_router.route_stream(
+            task_type="section_generation",
+            prompt=prompt,
+            system_prompt=SECTION_SYSTEM_PROMPT,
+            temperature=0.7,
+            max_tokens=4096,
+        ):
+            yield chunk
+
+    def _build_prompt(self, **kwargs: Any) -> tuple[str, list[dict[str, str]], str]:
+        """
+        Побудова промпту для секції.
+
+        Returns:
+            Кортеж (назва секції, підсекції, текст промпту).
+        """
+        section_id = kwargs.get("section_id", "1")
+        project_name = kwargs.get("project_name", "")
+        project_description = kwargs.get("project_description", "")
+        requirements = kwargs.get("requirements", {})
+        rag_context = kwargs.get("rag_context", "")
+
+        section_info = KMU_205_STRUCTURE.get(section_id, {})
+        section_title = section_info.get("title", f"Секція {section_id}")
+
+        # Підготовка тексту вимог
+        requirements_text = self._format_requirements(requirements)
+
+        # Підготовка інструкцій для підсекцій
+        subsections = get_all_subsections(section_id)
+        subsections_instruction = self._format_subsections_instruction(subsections)
+
+        prompt = SECTION_PROMPT_TEMPLATE.format(
+            section_id=section_id,
+            section_title=section_title,
+            project_name=project_name,
+            project_description=project_description,
+            requirements_text=requirements_text,
+            rag_context=rag_context or "Контекст не знайдено.",
+            subsections_instruction=subsections_instruction,
+        )
+
+        return section_title, subsections, prompt
+
     async def generate_all_sections(
         self,
         project_name: str,
@@ -1,18 +1,56 @@
 """
 FastAPI додаток ENFORENCE.
 
-Конфігурація CORS, middleware, обробка помилок.
+Конфігурація CORS, middleware, обробка помилок, lifespan ресурсів.
 """
 
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from src.api.routes import documents, generation, health, projects
+from src.api.warmup import WarmupState, run_warmup
 from src.config import settings
+from src.llm.router import close_shared_router, get_shared_router
+from src.rag.retriever import close_shared_retriever, get_shared_retriever
 from src.utils.exceptions import EnforenceException, ProjectNotFoundError
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Життєвий цикл додатку.
+
+    Створює спільні LLM роутер (HTTP пули до RunPod та Anthropic)
+    з фоновим health check провайдерів та RAGRetriever, запускає
+    фоновий прогрів (``/ready``) і закриває ресурси при зупинці.
+    """
+    app.state.llm_router = get_shared_router()
+    app.state.llm_router.start_health_probe()
+    app.state.rag_retriever = get_shared_retriever()
+
+    app.state.warmup = WarmupState(ready=not settings.warmup_enabled)
+    warmup_task = None
+    if settings.warmup_enabled:
+        warmup_task = asyncio.create_task(
+            run_warmup(app.state.warmup, app.state.rag_retriever, app.state.llm_router)
+        )
+    try:
+        yield
+    finally:
+        if warmup_task is not None:
+            warmup_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await warmup_task
+        await close_shared_retriever()
+        await close_shared_router()
+
+
 def create_app() -> FastAPI:
     """
     Створення та налаштування FastAPI додатку.
@@ -29,6 +67,7 @@ def create_app() -> FastAPI:
         version="0.1.0",
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
 
     # CORS для фронтенду Марії
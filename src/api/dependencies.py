@@ -6,10 +6,11 @@ Dependency Injection для FastAPI.
 
 from collections.abc import AsyncGenerator
 
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db.session import get_db_session
+from src.llm.router import LLMRouter, get_shared_router
 from src.services.document_service import DocumentService
 from src.services.export_service import ExportService
 from src.services.generation_service import GenerationService
@@ -22,6 +23,12 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def get_llm_router(request: Request) -> LLMRouter:
+    """Отримання спільного LLM роутера, створеного у lifespan."""
+    router = getattr(request.app.state, "llm_router", None)
+    return router or get_shared_router()
+
+
 async def get_project_service(
     session: AsyncSession = Depends(get_session),
 ) -> ProjectService:
@@ -38,9 +45,10 @@ async def get_document_service(
 
 async def get_generation_service(
     session: AsyncSession = Depends(get_session),
+    llm_router: LLMRouter = Depends(get_llm_router),
 ) -> GenerationService:
     """Отримання сервісу генерації."""
-    return GenerationService(session)
+    return GenerationService(session, llm_router=llm_router)
 
 
 async def get_export_service(
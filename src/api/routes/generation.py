@@ -2,9 +2,12 @@
 Endpoints для генерації ТЗ.
 """
 
+import json
 import time
+from collections.abc import AsyncIterator
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from src.api.dependencies import get_generation_service
 from src.models.generation import (
@@ -12,7 +15,12 @@ from src.models.generation import (
     GenerationStartResponse,
     GenerationStatusResponse,
 )
+from src.models.kmu_205 import KMU_205_STRUCTURE
 from src.services.generation_service import GenerationService
+from src.utils.exceptions import EnforenceException
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
@@ -22,7 +30,7 @@ async def start_generation(
     project_id: str,
     data: GenerationRequest | None = None,
     service: GenerationService = Depends(get_generation_service),
-) -> GenerationStartResponse:
+) -> GenerationStartResponse | JSONResponse:
     """
     Запуск генерації ТЗ для проєкту.
 
@@ -37,6 +45,12 @@ async def start_generation(
     """
     requirements = data.requirements if data else {}
 
+    if service.is_generation_running(project_id):
+        return JSONResponse(
+            status_code=409,
+            content={"detail": f"Генерація для проєкту {project_id} вже виконується"},
+        )
+
     task = await service.start_generation(
         project_id=project_id,
         additional_requirements=requirements,
@@ -49,6 +63,31 @@ async def start_generation(
     )
 
 
+@router.post("/{project_id}/cancel", status_code=202, response_model=None)
+async def cancel_generation(
+    project_id: str,
+    service: GenerationService = Depends(get_generation_service),
+) -> dict | JSONResponse:
+    """
+    Скасування генерації ТЗ, що виконується.
+
+    In-flight запити до LLM перериваються, task отримує статус cancelled.
+
+    Args:
+        project_id: ID проєкту.
+
+    Returns:
+        Підтвердження скасування.
+    """
+    if not service.cancel_generation(project_id):
+        return JSONResponse(
+            status_code=409,
+            content={"detail": f"Для проєкту {project_id} немає активної генерації"},
+        )
+
+    return {"status": "cancelling", "project_id": project_id}
+
+
 @router.get("/{project_id}/status", response_model=GenerationStatusResponse)
 async def get_generation_status(
     project_id: str,
@@ -74,6 +113,7 @@ async def get_generation_status(
         select(GenerationTaskModel)
         .where(GenerationTaskModel.project_id == project_id)
         .order_by(GenerationTaskModel.created_at.desc())
+        .limit(1)
     )
     task = result.scalar_one_or_none()
 
@@ -97,3 +137,52 @@ async def get_generation_status(
         elapsed_seconds=round(elapsed, 1) if elapsed else None,
         error_message=task.error_message,
     )
+
+
+@router.get("/{project_id}/sections/{section_id}/stream", response_model=None)
+async def stream_section(
+    project_id: str,
+    section_id: str,
+    service: GenerationService = Depends(get_generation_service),
+) -> StreamingResponse | JSONResponse:
+    """
+    Потокова генерація секції ТЗ (Server-Sent Events).
+
+    Кожна подія ``data`` містить JSON ``{"delta": "..."}`` з наступним
+    фрагментом тексту; завершення позначається подією ``done``,
+    помилка — подією ``error``.
+
+    Args:
+        project_id: ID проєкту.
+        section_id: Номер секції (1-10).
+
+    Returns:
+        text/event-stream з фрагментами контенту секції.
+    """
+    if section_id not in KMU_205_STRUCTURE:
+        return JSONResponse(
+            status_code=404,
+            content={"detail": f"Секцію {section_id} не знайдено у структурі КМУ №205"},
+        )
+
+    chunks = await service.stream_section(project_id=project_id, section_id=section_id)
+
+    return StreamingResponse(
+        _sse_events(chunks, section_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _sse_events(chunks: AsyncIterator[str], section_id: str) -> AsyncIterator[str]:
+    """Перетворення фрагментів LLM у SSE події."""
+    try:
+        async for chunk in chunks:
+            yield f"data: {json.dumps({'delta': chunk}, ensure_ascii=False)}\n\n"
+    except EnforenceException as e:
+        logger.error("section_stream_failed", section_id=section_id, error=e.message)
+        payload = json.dumps({"detail": e.message}, ensure_ascii=False)
+        yield f"event: error\ndata: {payload}\n\n"
+        return
+
+    yield f"event: done\ndata: {json.dumps({'section_id': section_id})}\n\n"
@@ -1,8 +1,9 @@
 """
-Health check endpoint.
+Health check та readiness endpoints.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
 
 from src.config import settings
 
@@ -22,3 +23,22 @@ async def health_check() -> dict:
         "version": "0.1.0",
         "environment": settings.environment,
     }
+
+
+@router.get("/ready", response_model=None)
+async def readiness_check(request: Request) -> dict | JSONResponse:
+    """
+    Готовність воркера приймати трафік.
+
+    На відміну від ``/health`` (процес живий), повертає 200 лише після
+    прогріву моделі ембедінгів, Qdrant та LLM пулів; до того — 503.
+
+    Returns:
+        Статус прогріву та результати перевірок.
+    """
+    state = getattr(request.app.state, "warmup", None)
+    if state is None:
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    if not state.ready:
+        return JSONResponse(status_code=503, content=state.as_dict())
+    return state.as_dict()
@@ -0,0 +1,85 @@
+"""
+Прогрів воркера при старті та readiness.
+
+Перша генерація після деплою інакше платить за завантаження моделі
+ембедінгів, з'єднання з Qdrant та TLS до обох LLM провайдерів.
+``/ready`` повідомляє про готовність лише після завершення прогріву,
+тож балансувальник не надсилає запити на холодний воркер.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.config import settings
+from src.llm.router import LLMRouter
+from src.rag.retriever import RAGRetriever
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class WarmupState:
+    """Стан прогріву воркера."""
+
+    ready: bool = False
+    started_at: float = field(default_factory=time.monotonic)
+    duration_ms: float | None = None
+    checks: dict[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Представлення для /ready."""
+        return {
+            "status": "ready" if self.ready else "warming_up",
+            "duration_ms": self.duration_ms,
+            "checks": self.checks,
+        }
+
+
+async def run_warmup(
+    state: WarmupState,
+    retriever: RAGRetriever,
+    llm_router: LLMRouter,
+    retry_interval: float | None = None,
+) -> None:
+    """
+    Прогрів ресурсів воркера.
+
+    Модель ембедінгів та Qdrant обов'язкові — прогрів повторюється,
+    доки вони не стануть доступні. Прогрів LLM пулів best-effort:
+    недоступного провайдера обробляє circuit breaker.
+
+    Args:
+        state: Стан, що читає ``/ready``.
+        retriever: Спільний RAGRetriever.
+        llm_router: Спільний LLM роутер.
+        retry_interval: Пауза між спробами (секунди).
+    """
+    retry_interval = settings.warmup_retry_interval if retry_interval is None else retry_interval
+    llm_warmup = asyncio.create_task(llm_router.warm_up())
+
+    try:
+        while True:
+            try:
+                await retriever.warm_up()
+                state.checks["rag"] = "ok"
+                break
+            except Exception as e:
+                state.checks["rag"] = f"error: {e}"
+                logger.warning("warmup_rag_failed", error=str(e), retry_in=retry_interval)
+                await asyncio.sleep(retry_interval)
+    except asyncio.CancelledError:
+        llm_warmup.cancel()
+        raise
+
+    try:
+        state.checks["llm"] = await llm_warmup
+    except Exception as e:
+        state.checks["llm"] = f"error: {e}"
+        logger.warning("warmup_llm_failed", error=str(e))
+
+    state.duration_ms = round((time.monotonic() - state.started_at) * 1000, 2)
+    state.ready = True
+    logger.info("warmup_complete", duration_ms=state.duration_ms, checks=state.checks)
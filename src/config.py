@@ -29,17 +29,132 @@ class Settings(BaseSettings):
     anthropic_api_key: str = ""
     default_llm_provider: str = "mamay"
 
+    # LLM HTTP connection pool (спільний для всього процесу)
+    llm_timeout: float = 120.0
+    llm_max_connections: int = 20
+    llm_max_keepalive_connections: int = 10
+    llm_keepalive_expiry: float = 30.0
+    llm_http2: bool = True
+
+    # LLM ліміти по провайдерах (0 = без обмеження)
+    mamay_max_concurrency: int = 4
+    mamay_requests_per_minute: int = 0
+    mamay_tokens_per_minute: int = 0
+    claude_max_concurrency: int = 5
+    claude_requests_per_minute: int = 50
+    claude_tokens_per_minute: int = 40000
+
+    # Повтори транзитних помилок (429/5xx); загальний час ≤ max_generation_time
+    mamay_retry_attempts: int = 2
+    claude_retry_attempts: int = 4
+    llm_retry_base_delay: float = 1.0
+    llm_retry_max_delay: float = 20.0
+
+    # Circuit breaker та фонові health check провайдерів
+    llm_breaker_failure_threshold: int = 3
+    llm_breaker_recovery_timeout: float = 30.0
+    llm_health_probe_interval: float = 30.0
+
+    # Hedged requests MamayLM → Claude (section_generation)
+    llm_hedging_enabled: bool = False
+    llm_hedge_percentile: float = 0.9
+    llm_hedge_default_delay: float = 30.0
+    llm_hedge_min_samples: int = 20
+
+    # Кеш відповідей LLM (порожній шлях — лише in-memory)
+    llm_cache_enabled: bool = True
+    llm_cache_max_temperature: float = 0.3
+    llm_cache_ttl: int = 86400
+    llm_cache_memory_size: int = 256
+    # Максимум записів SQLite рівня (витісняються найдавніше використані)
+    llm_cache_disk_size: int = 10000
+    llm_cache_path: str = "./data/cache/llm_cache.sqlite"
+
+    # Бекенд пошуку RAG: qdrant або numpy (вбудований індекс без Qdrant)
+    rag_backend: str = "qdrant"
+    vector_index_path: str = "./data/vector_index"
+    # Тип векторів вбудованого індексу: float32 або float16 (вдвічі менше пам'яті)
+    vector_index_dtype: str = "float32"
+    # Режим пошуку: dense або hybrid (щільний + BM25, RRF; потребує колекції
+    # зі sparse-вектором, інакше пошук лишається щільним)
+    rag_search_mode: str = "dense"
+    # Кандидатів з кожного ранжування для злиття та константа RRF
+    rag_hybrid_candidates: int = 20
+    rag_rrf_k: int = 60
+    # Кількість чанків контексту на секцію
+    rag_top_k: int = 3
+    # Контекст секції: кандидатів для MMR, бюджет токенів, баланс
+    # релевантність/різноманітність та поріг майже дубліката (Жаккар)
+    rag_context_candidates: int = 8
+    rag_context_max_tokens: int = 1500
+    rag_mmr_lambda: float = 0.7
+    rag_duplicate_threshold: float = 0.8
+    # Кеш результатів пошуку (інвалідується версією даних колекції)
+    rag_cache_enabled: bool = True
+    rag_cache_size: int = 1024
+    # Переранжування cross-encoder (пари всіх секцій одним проходом на CPU;
+    # після RAG_RERANK_TIMEOUT секунд лишається порядок векторного пошуку)
+    rag_rerank_enabled: bool = False
+    rag_rerank_model: str = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+    rag_rerank_candidates: int = 10
+    rag_rerank_timeout: float = 2.0
+    rag_rerank_max_length: int = 256
+
     # Qdrant
     qdrant_url: str = "http://localhost:6333"
     qdrant_collection: str = "tz_samples"
+    # Параметри колекції (застосовуються при створенні)
+    qdrant_hnsw_m: int = 16
+    qdrant_hnsw_ef_construct: int = 200
+    qdrant_on_disk_vectors: bool = False
+    # Скалярна int8 квантизація з rescoring за оригінальними векторами
+    qdrant_quantization_enabled: bool = False
+    qdrant_quantization_quantile: float = 0.99
+    qdrant_quantization_oversampling: float = 2.0
+    # Ширина пошуку HNSW (більше — вищий recall, повільніше)
+    qdrant_hnsw_ef: int = 128
+
+    # Маніфест проіндексованих файлів (інкрементальна інгестія)
+    ingestion_manifest_path: str = "./data/cache/ingestion_manifest.json"
+    # Конвеєрна інгестія (0 процесів — за кількістю CPU)
+    ingestion_workers: int = 0
+    ingestion_embed_batch_size: int = 256
+    ingestion_upsert_batch_size: int = 128
+    ingestion_max_in_flight: int = 4
+    # Чанкінг: розмір у токенах токенізатора (порожній — у символах);
+    # e5 обрізає вхід на 512 токенах
+    chunk_tokenizer: str = "intfloat/multilingual-e5-large"
+    chunk_size: int = 480
+    chunk_overlap: int = 64
 
     # Embedding
     embedding_model: str = "intfloat/multilingual-e5-large"
+    # Бекенд: torch (fp32) або onnx (int8, ONNX Runtime на CPU)
+    embedding_backend: str = "torch"
+    embedding_onnx_dir: str = "./data/models/embeddings-onnx-int8"
+    embedding_onnx_quantization: str = "avx512_vnni"
+    # Спільний сервер ембедінгів (порожній сокет — модель у кожному воркері)
+    embedding_server_socket: str = ""
+    embedding_server_batch_window_ms: float = 5.0
+    embedding_server_max_batch: int = 64
+    # Кеш ембедінгів (порожній шлях — лише in-memory)
+    embedding_cache_enabled: bool = True
+    embedding_cache_memory_size: int = 4096
+    embedding_cache_path: str = "./data/cache/embeddings.sqlite"
 
     # Generation
     max_generation_time: int = 300
+    # Бюджети етапів (секунди, обмежені залишком max_generation_time)
+    generation_budget_analysis: float = 45.0
+    generation_budget_rag: float = 30.0
+    generation_budget_sections: float = 180.0
+    generation_budget_compliance: float = 45.0
     enable_parallel_generation: bool = True
 
+    # Прогрів при старті (/ready до завершення повертає 503)
+    warmup_enabled: bool = True
+    warmup_retry_interval: float = 5.0
+
     @property
     def is_development(self) -> bool:
         """Перевірка чи середовище є development."""
@@ -3,7 +3,16 @@
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import httpx
+
+from src.config import settings
+
+if TYPE_CHECKING:
+    from src.llm.retry import RetryPolicy
 
 
 @dataclass
@@ -17,6 +26,61 @@ class LLMResponse:
     duration_ms: float = 0.0
 
 
+def create_http_client(timeout: float | None = None) -> httpx.AsyncClient:
+    """
+    Створення HTTP клієнта з пулом з'єднань для LLM провайдера.
+
+    Ліміти пулу, keep-alive та HTTP/2 беруться з налаштувань, щоб
+    TLS-з'єднання з RunPod та api.anthropic.com перевикористовувались
+    між запитами.
+
+    Args:
+        timeout: Таймаут запиту в секундах (за замовчуванням з налаштувань).
+
+    Returns:
+        Налаштований httpx.AsyncClient.
+    """
+    limits = httpx.Limits(
+        max_connections=settings.llm_max_connections,
+        max_keepalive_connections=settings.llm_max_keepalive_connections,
+        keepalive_expiry=settings.llm_keepalive_expiry,
+    )
+    return httpx.AsyncClient(
+        timeout=timeout if timeout is not None else settings.llm_timeout,
+        limits=limits,
+        http2=settings.llm_http2,
+    )
+
+
+async def iter_sse_data(response: httpx.Response) -> AsyncIterator[str]:
+    """
+    Розбір Server-Sent Events потоку.
+
+    Повертає поле ``data`` кожної події (багаторядкові data об'єднуються
+    через перенос рядка). Поля ``event``/``id`` ігноруються — тип події
+    OpenAI та Anthropic дублюють у JSON.
+
+    Args:
+        response: Відкрита потокова відповідь httpx.
+
+    Yields:
+        Вміст поля data кожної події.
+    """
+    data_lines: list[str] = []
+    async for line in response.aiter_lines():
+        if not line:
+            if data_lines:
+                yield "\n".join(data_lines)
+                data_lines = []
+            continue
+        if line.startswith("data:"):
+            value = line[5:]
+            data_lines.append(value[1:] if value.startswith(" ") else value)
+
+    if data_lines:
+        yield "\n".join(data_lines)
+
+
 class BaseLLMClient(ABC):
     """
     Абстрактний базовий клас для LLM клієнтів.
@@ -24,6 +88,19 @@ class BaseLLMClient(ABC):
     Всі LLM провайдери (MamayLM, Claude) мають реалізувати цей інтерфейс.
     """
 
+    provider: str = "unknown"
+
+    # Чи дешевий health_check для періодичних перевірок у закритому стані
+    health_probe_always: bool = True
+
+    # Повтори транзитних помилок (None — клієнт не повторює запити)
+    retry_policy: "RetryPolicy | None" = None
+
+    @property
+    def model_id(self) -> str:
+        """Ідентифікатор моделі (для ключів кешу та метрик)."""
+        return self.provider
+
     @abstractmethod
     async def generate(
         self,
@@ -49,6 +126,63 @@ class BaseLLMClient(ABC):
         """
         ...
 
+    async def generate_once(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> LLMResponse:
+        """
+        Одна спроба генерації без повторів.
+
+        LLMRouter повторює спроби за ``retry_policy`` сам, займаючи слот
+        провайдера лише на час кожної спроби, а не на паузи між ними.
+        Реалізація за замовчуванням — ``generate``.
+
+        Raises:
+            LLMError: Помилка генерації (``retryable`` — для транзитних).
+        """
+        return await self.generate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        """
+        Потокова генерація тексту від LLM.
+
+        Реалізація за замовчуванням повертає повну відповідь ``generate``
+        одним фрагментом; провайдери з підтримкою SSE перевизначають її.
+
+        Args:
+            prompt: Основний промпт.
+            system_prompt: Системний промпт (опціонально).
+            temperature: Температура генерації (0.0-1.0).
+            max_tokens: Максимальна кількість токенів відповіді.
+
+        Yields:
+            Фрагменти тексту у порядку генерації.
+
+        Raises:
+            LLMError: Помилка генерації.
+        """
+        response = await self.generate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        yield response.text
+
     @abstractmethod
     async def health_check(self) -> bool:
         """
@@ -58,3 +192,19 @@ class BaseLLMClient(ABC):
             True якщо провайдер доступний.
         """
         ...
+
+    async def warm_up(self) -> bool:
+        """
+        Прогрів HTTP пулу (DNS, TCP, TLS) до першого реального запиту.
+
+        За замовчуванням — health check; клієнти з платним health check
+        перевизначають метод.
+
+        Returns:
+            True, якщо провайдер відповів.
+        """
+        return await self.health_check()
+
+    async def close(self) -> None:
+        """Закриття ресурсів клієнта (HTTP пулу)."""
+        return None
@@ -0,0 +1,215 @@
+"""
+Кеш відповідей LLM.
+
+Детерміновані (низькотемпературні) виклики — аналіз вимог, compliance
+check — при повторній генерації проєкту дають ті самі промпти. Кеш
+адресується вмістом запиту (провайдер, модель, промпти, параметри) і
+має два рівні:
+- in-memory LRU з TTL (найшвидший, в межах процесу);
+- SQLite на диску (переживає рестарт, спільний для воркерів), обмежений
+  LLM_CACHE_DISK_SIZE записами з витісненням за часом останнього
+  звернення; прострочені записи періодично видаляються.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from src.config import settings
+from src.llm.base import LLMResponse
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Інтервал видалення прострочених записів SQLite (секунди)
+PURGE_INTERVAL = 600
+
+
+def make_cache_key(
+    provider: str,
+    model: str,
+    system_prompt: str | None,
+    prompt: str,
+    temperature: float,
+    max_tokens: int,
+) -> str:
+    """
+    Ключ кешу — SHA-256 від усіх параметрів, що впливають на відповідь.
+
+    Returns:
+        Hex-дайджест ключа.
+    """
+    raw = json.dumps(
+        [provider, model, system_prompt or "", prompt, round(temperature, 4), max_tokens],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    Дворівневий кеш відповідей LLM (LRU у пам'яті + SQLite).
+
+    Порожній ``db_path`` вимикає дисковий рівень.
+    """
+
+    def __init__(
+        self,
+        db_path: str | None = None,
+        max_memory_items: int | None = None,
+        ttl_seconds: int | None = None,
+        max_disk_items: int | None = None,
+    ) -> None:
+        self.db_path = settings.llm_cache_path if db_path is None else db_path
+        self.max_memory_items = max_memory_items or settings.llm_cache_memory_size
+        self.ttl_seconds = ttl_seconds or settings.llm_cache_ttl
+        self.max_disk_items = max_disk_items or settings.llm_cache_disk_size
+        self._last_purge = 0.0
+        self._memory: OrderedDict[str, tuple[float, LLMResponse]] = OrderedDict()
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> LLMResponse | None:
+        """
+        Пошук відповіді в кеші (спочатку пам'ять, потім диск).
+
+        Args:
+            key: Ключ з ``make_cache_key``.
+
+        Returns:
+            Закешована відповідь або None.
+        """
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            created_at, response = entry
+            if now - created_at < self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return response
+            del self._memory[key]
+
+        if self.db_path:
+            row = await asyncio.to_thread(self._disk_get, key, now)
+            if row is not None:
+                created_at, response = row
+                self._remember(key, created_at, response)
+                self.hits += 1
+                return response
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, response: LLMResponse) -> None:
+        """Збереження відповіді в обох рівнях кешу."""
+        created_at = time.time()
+        self._remember(key, created_at, response)
+        if self.db_path:
+            await asyncio.to_thread(self._disk_set, key, created_at, response)
+
+    def _remember(self, key: str, created_at: float, response: LLMResponse) -> None:
+        """Додавання в LRU з витісненням найстаріших записів."""
+        self._memory[key] = (created_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Ліниве відкриття SQLite (викликається під self._lock)."""
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, provider TEXT, model TEXT, text TEXT, "
+                "tokens_used INTEGER, duration_ms REAL, created_at REAL, last_access REAL)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(llm_cache)")}
+            if "last_access" not in columns:
+                # Кеш, створений до обмеження розміру
+                self._conn.execute("ALTER TABLE llm_cache ADD COLUMN last_access REAL")
+                self._conn.execute("UPDATE llm_cache SET last_access = created_at")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_cache_last_access ON llm_cache (last_access)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _disk_get(self, key: str, now: float) -> tuple[float, LLMResponse] | None:
+        """Читання з SQLite з перевіркою TTL."""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT provider, model, text, tokens_used, duration_ms, created_at "
+                "FROM llm_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            provider, model, text, tokens_used, duration_ms, created_at = row
+            if now - created_at >= self.ttl_seconds:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            conn.commit()
+        response = LLMResponse(
+            text=text,
+            provider=provider,
+            model=model,
+            tokens_used=tokens_used,
+            duration_ms=duration_ms,
+        )
+        return created_at, response
+
+    def _disk_set(self, key: str, created_at: float, response: LLMResponse) -> None:
+        """Запис у SQLite з витісненням понад ``max_disk_items``."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, provider, model, text, tokens_used, "
+                "duration_ms, created_at, last_access) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.provider,
+                    response.model,
+                    response.text,
+                    response.tokens_used,
+                    response.duration_ms,
+                    created_at,
+                    created_at,
+                ),
+            )
+            if created_at - self._last_purge >= PURGE_INTERVAL:
+                expired = conn.execute(
+                    "DELETE FROM llm_cache WHERE created_at <= ?",
+                    (created_at - self.ttl_seconds,),
+                ).rowcount
+                self._last_purge = created_at
+                if expired:
+                    logger.info("llm_cache_expired_purged", entries=expired)
+            conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_items,),
+            )
+            conn.commit()
+
+    def stats(self) -> dict[str, int]:
+        """Статистика влучань у кеш."""
+        return {"hits": self.hits, "misses": self.misses, "memory_items": len(self._memory)}
+
+    def close(self) -> None:
+        """Закриття SQLite з'єднання."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,96 @@
+"""
+Circuit breaker для LLM провайдерів.
+
+Якщо RunPod pod холодний або впав, кожен запит чекав би повний
+HTTP таймаут перед fallback. Breaker після серії помилок "відкривається"
+і роутер одразу пропускає провайдера; через ``recovery_timeout`` один
+пробний запит (half-open) перевіряє, чи провайдер відновився.
+"""
+
+import time
+from enum import Enum
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CircuitState(str, Enum):
+    """Стан circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker одного провайдера (closed → open → half-open → closed).
+
+    Живиться результатами викликів та фоновим health check.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        failure_threshold: int = 3,
+        recovery_timeout: float = 30.0,
+    ) -> None:
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        """Поточний стан з урахуванням закінчення recovery_timeout."""
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Чи можна надіслати запит провайдеру.
+
+        У стані half-open пропускається лише один пробний запит.
+        """
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Успішний виклик або health check — закриття breaker."""
+        if self._state != CircuitState.CLOSED:
+            logger.info("circuit_closed", provider=self.provider)
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Помилка виклику; відкриття breaker після порогу або невдалої проби."""
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != CircuitState.OPEN:
+                logger.warning(
+                    "circuit_opened",
+                    provider=self.provider,
+                    failures=self._failures,
+                )
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        """Звільнення пробного слоту (запит скасовано без результату)."""
+        self._trial_in_flight = False
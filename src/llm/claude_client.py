@@ -4,18 +4,22 @@
 Claude використовується для compliance checking та як fallback для MamayLM.
 """
 
+import json
 import time
+from collections.abc import AsyncIterator
 
 import httpx
 
 from src.config import settings
-from src.llm.base import BaseLLMClient, LLMResponse
+from src.llm.base import BaseLLMClient, LLMResponse, create_http_client, iter_sse_data
+from src.llm.retry import RetryPolicy, http_status_error
 from src.utils.exceptions import LLMError
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 ANTHROPIC_API_URL = "https://api.anthropic.com/v1/messages"
+ANTHROPIC_MODELS_URL = "https://api.anthropic.com/v1/models"
 ANTHROPIC_VERSION = "2023-06-01"
 
 
@@ -28,16 +32,28 @@ class ClaudeClient(BaseLLMClient):
     - Fallback генерації якщо MamayLM недоступний
     """
 
+    provider = "claude"
+
+    # health_check — платний запит до Messages API
+    health_probe_always = False
+
     def __init__(
         self,
         api_key: str | None = None,
         model: str = "claude-sonnet-4-20250514",
-        timeout: float = 120.0,
+        timeout: float | None = None,
+        http_client: httpx.AsyncClient | None = None,
     ) -> None:
         self.api_key = api_key or settings.anthropic_api_key
         self.model = model
-        self.timeout = timeout
-        self.client = httpx.AsyncClient(timeout=timeout)
+        self.timeout = timeout if timeout is not None else settings.llm_timeout
+        self.client = http_client or create_http_client(self.timeout)
+        self.retry_policy: RetryPolicy = RetryPolicy.from_settings("claude")
+
+    @property
+    def model_id(self) -> str:
+        """Назва моделі Anthropic."""
+        return self.model
 
     async def generate(
         self,
@@ -59,30 +75,31 @@ class ClaudeClient(BaseLLMClient):
             LLMResponse з текстом відповіді.
 
         Raises:
-            LLMError: Якщо API недоступний або помилка автентифікації.
+            LLMError: Якщо API недоступний або помилка автентифікації. Транзитні помилки
+                (429/5xx, з'єднання) попередньо повторюються згідно retry_policy.
         """
-        headers = {
-            "x-api-key": self.api_key,
-            "anthropic-version": ANTHROPIC_VERSION,
-            "content-type": "application/json",
-        }
-
-        payload: dict = {
-            "model": self.model,
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-            "messages": [{"role": "user", "content": prompt}],
-        }
+        payload = self._build_payload(prompt, system_prompt, temperature, max_tokens)
+        return await self.retry_policy.retrying()(self._generate_once, payload)
 
-        if system_prompt:
-            payload["system"] = system_prompt
+    async def generate_once(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> LLMResponse:
+        """Одна спроба генерації (повтори виконує LLMRouter)."""
+        payload = self._build_payload(prompt, system_prompt, temperature, max_tokens)
+        return await self._generate_once(payload)
 
+    async def _generate_once(self, payload: dict) -> LLMResponse:
+        """Одна спроба запиту (повтори — у ``generate``)."""
         start_time = time.monotonic()
 
         try:
             response = await self.client.post(
                 ANTHROPIC_API_URL,
-                headers=headers,
+                headers=self._headers(),
                 json=payload,
             )
             response.raise_for_status()
@@ -110,16 +127,129 @@ class ClaudeClient(BaseLLMClient):
 
         except httpx.HTTPStatusError as e:
             logger.error("claude_http_error", status=e.response.status_code)
+            raise http_status_error(e, provider="claude") from e
+        except httpx.RequestError as e:
+            logger.error("claude_connection_error", error=str(e))
             raise LLMError(
-                f"HTTP {e.response.status_code}: {e.response.text}",
+                f"Не вдалося з'єднатися з Claude API: {e}",
                 provider="claude",
+                retryable=True,
             ) from e
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        """
+        Потокова генерація через Anthropic Messages SSE потік.
+
+        Args:
+            prompt: Текст промпту.
+            system_prompt: Системний промпт.
+            temperature: Температура генерації.
+            max_tokens: Ліміт токенів.
+
+        Yields:
+            Фрагменти тексту (text_delta) у порядку генерації.
+
+        Raises:
+            LLMError: Якщо API недоступний або повернув подію error.
+        """
+        payload = self._build_payload(prompt, system_prompt, temperature, max_tokens)
+        payload["stream"] = True
+
+        start_time = time.monotonic()
+        first_token_ms: float | None = None
+        input_tokens = 0
+        output_tokens = 0
+
+        try:
+            async with self.client.stream(
+                "POST",
+                ANTHROPIC_API_URL,
+                headers=self._headers(),
+                json=payload,
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                response.raise_for_status()
+
+                async for data in iter_sse_data(response):
+                    event = json.loads(data)
+                    event_type = event.get("type")
+
+                    if event_type == "content_block_delta":
+                        text = event.get("delta", {}).get("text")
+                        if not text:
+                            continue
+                        if first_token_ms is None:
+                            first_token_ms = (time.monotonic() - start_time) * 1000
+                        yield text
+                    elif event_type == "message_start":
+                        usage = event.get("message", {}).get("usage", {})
+                        input_tokens = usage.get("input_tokens", 0)
+                    elif event_type == "message_delta":
+                        output_tokens = event.get("usage", {}).get("output_tokens", 0)
+                    elif event_type == "message_stop":
+                        break
+                    elif event_type == "error":
+                        error = event.get("error", {})
+                        raise LLMError(
+                            f"{error.get('type', 'error')}: {error.get('message', '')}",
+                            provider="claude",
+                        )
+
+        except httpx.HTTPStatusError as e:
+            logger.error("claude_http_error", status=e.response.status_code)
+            raise http_status_error(e, provider="claude") from e
         except httpx.RequestError as e:
             logger.error("claude_connection_error", error=str(e))
             raise LLMError(
                 f"Не вдалося з'єднатися з Claude API: {e}",
                 provider="claude",
+                retryable=True,
             ) from e
+        except json.JSONDecodeError as e:
+            raise LLMError(f"Некоректна SSE подія: {e}", provider="claude") from e
+
+        logger.info(
+            "claude_stream_complete",
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            ttft_ms=round(first_token_ms, 2) if first_token_ms is not None else None,
+            duration_ms=round((time.monotonic() - start_time) * 1000, 2),
+        )
+
+    def _headers(self) -> dict[str, str]:
+        """Заголовки автентифікації Anthropic API."""
+        return {
+            "x-api-key": self.api_key,
+            "anthropic-version": ANTHROPIC_VERSION,
+            "content-type": "application/json",
+        }
+
+    def _build_payload(
+        self,
+        prompt: str,
+        system_prompt: str | None,
+        temperature: float,
+        max_tokens: int,
+    ) -> dict:
+        """Формування тіла запиту Messages API."""
+        payload: dict = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+
+        if system_prompt:
+            payload["system"] = system_prompt
+
+        return payload
 
     async def health_check(self) -> bool:
         """Перевірка доступності Claude API."""
@@ -127,11 +257,7 @@ class ClaudeClient(BaseLLMClient):
             # Мінімальний запит для перевірки API key
             response = await self.client.post(
                 ANTHROPIC_API_URL,
-                headers={
-                    "x-api-key": self.api_key,
-                    "anthropic-version": ANTHROPIC_VERSION,
-                    "content-type": "application/json",
-                },
+                headers=self._headers(),
                 json={
                     "model": self.model,
                     "max_tokens": 10,
@@ -143,6 +269,18 @@ class ClaudeClient(BaseLLMClient):
         except Exception:
             return False
 
+    async def warm_up(self) -> bool:
+        """Прогрів TLS з'єднання безкоштовним запитом списку моделей."""
+        try:
+            response = await self.client.get(
+                ANTHROPIC_MODELS_URL,
+                headers=self._headers(),
+                timeout=15.0,
+            )
+            return response.status_code == 200
+        except Exception:
+            return False
+
     async def close(self) -> None:
         """Закриття HTTP клієнта."""
         await self.client.aclose()
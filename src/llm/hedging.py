@@ -0,0 +1,76 @@
+"""
+Hedged requests між MamayLM та Claude.
+
+Якщо MamayLM не відповів (або не видав перший токен) за час, що
+відповідає заданому перцентилю його історичної латентності, той самий
+запит надсилається до Claude; перемагає перша успішна відповідь,
+інша скасовується.
+"""
+
+import math
+from collections import deque
+from dataclasses import dataclass
+
+from src.config import settings
+
+
+class LatencyTracker:
+    """Ковзне вікно латентностей провайдера для обчислення перцентилів."""
+
+    def __init__(self, window: int = 200) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        """Додавання виміру латентності (секунди)."""
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> float | None:
+        """
+        Перцентиль латентності (nearest-rank).
+
+        Args:
+            q: Перцентиль від 0 до 1.
+
+        Returns:
+            Значення в секундах або None, якщо вимірів недостатньо.
+        """
+        if len(self._samples) < settings.llm_hedge_min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+@dataclass
+class HedgeStats:
+    """Метрики hedged запитів."""
+
+    hedged_calls: int = 0
+    hedges_launched: int = 0
+    hedge_wins: int = 0
+    primary_wins: int = 0
+
+    def as_dict(self) -> dict[str, float]:
+        """Представлення для логів та моніторингу."""
+        win_rate = self.hedge_wins / self.hedges_launched if self.hedges_launched else 0.0
+        return {
+            "hedged_calls": self.hedged_calls,
+            "hedges_launched": self.hedges_launched,
+            "hedge_wins": self.hedge_wins,
+            "primary_wins": self.primary_wins,
+            "hedge_win_rate": round(win_rate, 3),
+        }
+
+
+def hedge_delay(tracker: LatencyTracker) -> float:
+    """
+    Затримка перед запуском hedge запиту.
+
+    Перцентиль ``llm_hedge_percentile`` історичної латентності, або
+    ``llm_hedge_default_delay`` поки вимірів замало.
+    """
+    delay = tracker.percentile(settings.llm_hedge_percentile)
+    return delay if delay is not None else settings.llm_hedge_default_delay
@@ -4,12 +4,15 @@
 MamayLM — українська мовна модель для генерації контенту ТЗ.
 """
 
+import json
 import time
+from collections.abc import AsyncIterator
 
 import httpx
 
 from src.config import settings
-from src.llm.base import BaseLLMClient, LLMResponse
+from src.llm.base import BaseLLMClient, LLMResponse, create_http_client, iter_sse_data
+from src.llm.retry import RetryPolicy, http_status_error
 from src.utils.exceptions import LLMError
 from src.utils.logger import get_logger
 
@@ -23,16 +26,25 @@ class MamayLMClient(BaseLLMClient):
     Використовує OpenAI-сумісний API (vLLM/llama.cpp backend).
     """
 
+    provider = "mamay"
+
     def __init__(
         self,
         base_url: str | None = None,
-        timeout: float = 120.0,
+        timeout: float | None = None,
+        http_client: httpx.AsyncClient | None = None,
     ) -> None:
         self.base_url = (base_url or settings.mamay_llm_url).rstrip("/")
-        self.timeout = timeout
-        self.client = httpx.AsyncClient(timeout=timeout)
+        self.timeout = timeout if timeout is not None else settings.llm_timeout
+        self.client = http_client or create_http_client(self.timeout)
+        self.retry_policy: RetryPolicy = RetryPolicy.from_settings("mamay")
         self.model_name = "MamayLM-Gemma-2-9B"
 
+    @property
+    def model_id(self) -> str:
+        """Назва моделі на vLLM сервері."""
+        return self.model_name
+
     async def generate(
         self,
         prompt: str,
@@ -53,20 +65,26 @@ class MamayLMClient(BaseLLMClient):
             LLMResponse з українським текстом.
 
         Raises:
-            LLMError: Якщо RunPod API недоступний.
+            LLMError: Якщо RunPod API недоступний. Транзитні помилки
+                (429/5xx, з'єднання) попередньо повторюються згідно retry_policy;
+                таймаут читання (завислий pod) не повторюється.
         """
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
+        payload = self._build_payload(prompt, system_prompt, temperature, max_tokens)
+        return await self.retry_policy.retrying()(self._generate_once, payload)
 
-        payload = {
-            "model": self.model_name,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-        }
+    async def generate_once(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> LLMResponse:
+        """Одна спроба генерації (повтори виконує LLMRouter)."""
+        payload = self._build_payload(prompt, system_prompt, temperature, max_tokens)
+        return await self._generate_once(payload)
 
+    async def _generate_once(self, payload: dict) -> LLMResponse:
+        """Одна спроба запиту (повтори — у ``generate``)."""
         start_time = time.monotonic()
 
         try:
@@ -97,16 +115,121 @@ class MamayLMClient(BaseLLMClient):
 
         except httpx.HTTPStatusError as e:
             logger.error("mamay_http_error", status=e.response.status_code)
+            raise http_status_error(e, provider="mamay") from e
+        except httpx.ReadTimeout as e:
+            # Завислий pod не відповість і на повтор — одразу відмова для breaker
+            logger.error("mamay_read_timeout", timeout=self.timeout)
+            raise LLMError(
+                f"RunPod не відповів за {self.timeout} с",
+                provider="mamay",
+                retryable=False,
+            ) from e
+        except httpx.RequestError as e:
+            logger.error("mamay_connection_error", error=str(e))
+            raise LLMError(
+                f"Не вдалося з'єднатися з RunPod: {e}",
+                provider="mamay",
+                retryable=True,
+            ) from e
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        """
+        Потокова генерація через OpenAI-сумісний SSE потік vLLM.
+
+        Args:
+            prompt: Текст промпту українською.
+            system_prompt: Системний промпт для контексту.
+            temperature: Температура генерації.
+            max_tokens: Ліміт токенів відповіді.
+
+        Yields:
+            Фрагменти тексту (delta.content) у порядку генерації.
+
+        Raises:
+            LLMError: Якщо RunPod API недоступний.
+        """
+        payload = self._build_payload(prompt, system_prompt, temperature, max_tokens)
+        payload["stream"] = True
+
+        start_time = time.monotonic()
+        first_token_ms: float | None = None
+        chunks = 0
+
+        try:
+            async with self.client.stream(
+                "POST",
+                f"{self.base_url}/v1/chat/completions",
+                json=payload,
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                response.raise_for_status()
+
+                async for data in iter_sse_data(response):
+                    if data == "[DONE]":
+                        break
+                    choices = json.loads(data).get("choices") or []
+                    delta = choices[0].get("delta", {}).get("content") if choices else None
+                    if not delta:
+                        continue
+                    if first_token_ms is None:
+                        first_token_ms = (time.monotonic() - start_time) * 1000
+                    chunks += 1
+                    yield delta
+
+        except httpx.HTTPStatusError as e:
+            logger.error("mamay_http_error", status=e.response.status_code)
+            raise http_status_error(e, provider="mamay") from e
+        except httpx.ReadTimeout as e:
+            # Завислий pod не відповість і на повтор — одразу відмова для breaker
+            logger.error("mamay_read_timeout", timeout=self.timeout)
             raise LLMError(
-                f"HTTP {e.response.status_code}: {e.response.text}",
+                f"RunPod не відповів за {self.timeout} с",
                 provider="mamay",
+                retryable=False,
             ) from e
         except httpx.RequestError as e:
             logger.error("mamay_connection_error", error=str(e))
             raise LLMError(
                 f"Не вдалося з'єднатися з RunPod: {e}",
                 provider="mamay",
+                retryable=True,
             ) from e
+        except json.JSONDecodeError as e:
+            raise LLMError(f"Некоректна SSE подія: {e}", provider="mamay") from e
+
+        logger.info(
+            "mamay_stream_complete",
+            chunks=chunks,
+            ttft_ms=round(first_token_ms, 2) if first_token_ms is not None else None,
+            duration_ms=round((time.monotonic() - start_time) * 1000, 2),
+        )
+
+    def _build_payload(
+        self,
+        prompt: str,
+        system_prompt: str | None,
+        temperature: float,
+        max_tokens: int,
+    ) -> dict:
+        """Формування тіла запиту /v1/chat/completions."""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        return {
+            "model": self.model_name,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
 
     async def health_check(self) -> bool:
         """Перевірка доступності MamayLM на RunPod."""
@@ -0,0 +1,186 @@
+"""
+Обмеження навантаження на LLM провайдерів.
+
+Для кожного провайдера:
+- семафор паралельних запитів (не перевантажувати єдиний vLLM pod);
+- token bucket запитів за хвилину (RPM) та токенів за хвилину (TPM),
+  щоб не отримувати 429 від Anthropic.
+
+Час очікування в черзі фіксується для моніторингу.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from src.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Груба оцінка для кирилиці: ~3 символи на токен
+CHARS_PER_TOKEN = 3
+
+
+def estimate_tokens(*texts: str | None) -> int:
+    """
+    Приблизна кількість токенів у текстах (без токенізатора).
+
+    Args:
+        *texts: Тексти промптів.
+
+    Returns:
+        Оцінка кількості токенів.
+    """
+    return sum(len(t) for t in texts if t) // CHARS_PER_TOKEN + 1
+
+
+class TokenBucket:
+    """
+    Асинхронний token bucket з безперервним поповненням.
+
+    Ємність дорівнює хвилинному ліміту, тож короткий сплеск до
+    повного ліміту дозволений, а далі запити вирівнюються.
+    """
+
+    def __init__(self, rate_per_minute: int) -> None:
+        self.capacity = float(rate_per_minute)
+        self.rate = rate_per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Поповнення відра пропорційно часу, що минув."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """
+        Очікування доступності ``amount`` одиниць.
+
+        Запити, більші за ємність, обрізаються до ємності,
+        щоб не чекати вічно.
+        """
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+
+    def adjust(self, delta: float) -> None:
+        """
+        Корекція після фактичного використання.
+
+        Додатне ``delta`` — списати ще (оцінка була заниженою),
+        від'ємне — повернути надлишок. Баланс може стати від'ємним,
+        тоді наступні запити чекатимуть довше.
+        """
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - delta)
+
+
+@dataclass
+class LimiterStats:
+    """Статистика очікування в черзі провайдера."""
+
+    requests: int = 0
+    waited_requests: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    in_flight: int = 0
+
+    def as_dict(self) -> dict[str, float]:
+        """Представлення для логів та health endpoint."""
+        avg = self.total_wait_ms / self.requests if self.requests else 0.0
+        return {
+            "requests": self.requests,
+            "waited_requests": self.waited_requests,
+            "avg_wait_ms": round(avg, 2),
+            "max_wait_ms": round(self.max_wait_ms, 2),
+            "in_flight": self.in_flight,
+        }
+
+
+class ProviderLimiter:
+    """
+    Ліміти паралельності та швидкості для одного LLM провайдера.
+
+    Нульове значення ліміту означає "без обмеження".
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        max_concurrency: int = 0,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+    ) -> None:
+        self.provider = provider
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency > 0 else None
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.stats = LimiterStats()
+
+    @classmethod
+    def from_settings(cls, provider: str) -> "ProviderLimiter":
+        """Створення лімітера з налаштувань ``{provider}_*``."""
+        return cls(
+            provider=provider,
+            max_concurrency=getattr(settings, f"{provider}_max_concurrency"),
+            requests_per_minute=getattr(settings, f"{provider}_requests_per_minute"),
+            tokens_per_minute=getattr(settings, f"{provider}_tokens_per_minute"),
+        )
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int = 0) -> AsyncIterator[None]:
+        """
+        Зайняття слоту провайдера на час запиту.
+
+        Args:
+            estimated_tokens: Оцінка токенів запиту для TPM ліміту.
+        """
+        start = time.monotonic()
+
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+        try:
+            if self._requests is not None:
+                await self._requests.acquire(1)
+            if self._tokens is not None and estimated_tokens:
+                await self._tokens.acquire(estimated_tokens)
+
+            self._record_wait((time.monotonic() - start) * 1000)
+            self.stats.in_flight += 1
+            try:
+                yield
+            finally:
+                self.stats.in_flight -= 1
+        finally:
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    def record_usage(self, actual_tokens: int, estimated_tokens: int) -> None:
+        """Звірка фактичних токенів з оцінкою для TPM відра."""
+        if self._tokens is not None and actual_tokens:
+            self._tokens.adjust(actual_tokens - estimated_tokens)
+
+    def _record_wait(self, wait_ms: float) -> None:
+        """Фіксація часу очікування в черзі."""
+        self.stats.requests += 1
+        self.stats.total_wait_ms += wait_ms
+        self.stats.max_wait_ms = max(self.stats.max_wait_ms, wait_ms)
+        if wait_ms >= 1.0:
+            self.stats.waited_requests += 1
+            logger.info(
+                "llm_queue_wait",
+                provider=self.provider,
+                wait_ms=round(wait_ms, 2),
+                in_flight=self.stats.in_flight,
+            )
@@ -0,0 +1,164 @@
+"""
+Політики повторних спроб для LLM провайдерів.
+
+Транзитні помилки (429, 5xx, розрив з'єднання) повторюються з
+експоненційною затримкою та jitter через tenacity. Заголовок
+Retry-After має пріоритет над розрахованою затримкою, а сумарний час
+спроб не перевищує ``settings.max_generation_time`` (та залишку
+поточного дедлайну генерації, якщо він заданий); якщо Retry-After
+довший за залишок, повтор не виконується. Таймаут читання
+MamayLM не повторюється: завислий pod інакше коштував би
+``mamay_retry_attempts × llm_timeout`` до першої відмови в circuit
+breaker.
+"""
+
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+import httpx
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception,
+    stop_after_attempt,
+    stop_after_delay,
+    stop_any,
+    wait_random_exponential,
+)
+from tenacity.stop import stop_base
+
+from src.config import settings
+from src.utils.deadline import current_deadline
+from src.utils.exceptions import LLMError
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 529 — "overloaded" від Anthropic
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504, 529})
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Розбір заголовка Retry-After (секунди або HTTP-дата).
+
+    Returns:
+        Затримка в секундах або None.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def http_status_error(error: httpx.HTTPStatusError, provider: str) -> LLMError:
+    """Перетворення HTTP помилки на LLMError з ознакою retryable."""
+    response = error.response
+    return LLMError(
+        f"HTTP {response.status_code}: {response.text}",
+        provider=provider,
+        status_code=response.status_code,
+        retryable=response.status_code in RETRYABLE_STATUS_CODES,
+        retry_after=parse_retry_after(response.headers.get("retry-after")),
+    )
+
+
+def _is_retryable(error: BaseException) -> bool:
+    return isinstance(error, LLMError) and error.retryable
+
+
+class _StopRetryAfterPastDeadline(stop_base):
+    """Зупинка, якщо Retry-After довший за залишок дедлайну (повтор не встигне)."""
+
+    def __init__(self, provider: str, deadline: float) -> None:
+        self.provider = provider
+        self.deadline = deadline
+
+    def __call__(self, retry_state: RetryCallState) -> bool:
+        error = retry_state.outcome.exception() if retry_state.outcome else None
+        if not isinstance(error, LLMError) or error.retry_after is None:
+            return False
+        remaining = self.deadline - (retry_state.seconds_since_start or 0.0)
+        if error.retry_after <= remaining:
+            return False
+        logger.warning(
+            "llm_retry_after_exceeds_deadline",
+            provider=self.provider,
+            retry_after_s=round(error.retry_after, 2),
+            remaining_s=round(remaining, 2),
+        )
+        return True
+
+
+@dataclass
+class RetryPolicy:
+    """Політика повторів одного провайдера."""
+
+    provider: str
+    max_attempts: int
+    base_delay: float
+    max_delay: float
+    deadline: float
+
+    @classmethod
+    def from_settings(cls, provider: str) -> "RetryPolicy":
+        """Створення політики з налаштувань ``{provider}_retry_attempts``."""
+        return cls(
+            provider=provider,
+            max_attempts=max(1, getattr(settings, f"{provider}_retry_attempts")),
+            base_delay=settings.llm_retry_base_delay,
+            max_delay=settings.llm_retry_max_delay,
+            deadline=float(settings.max_generation_time),
+        )
+
+    def retrying(self) -> AsyncRetrying:
+        """Налаштований tenacity AsyncRetrying для одного виклику."""
+        deadline = self._effective_deadline()
+        return AsyncRetrying(
+            stop=stop_any(
+                stop_after_attempt(self.max_attempts),
+                stop_after_delay(deadline),
+                _StopRetryAfterPastDeadline(self.provider, deadline),
+            ),
+            wait=lambda retry_state: self._wait(retry_state, deadline),
+            retry=retry_if_exception(_is_retryable),
+            before_sleep=self._before_sleep,
+            reraise=True,
+        )
+
+    def _effective_deadline(self) -> float:
+        """Дедлайн політики, обмежений залишком дедлайну генерації."""
+        generation_deadline = current_deadline.get()
+        if generation_deadline is None:
+            return self.deadline
+        return min(self.deadline, generation_deadline.remaining())
+
+    def _wait(self, retry_state: RetryCallState, deadline: float) -> float:
+        """Retry-After або exponential backoff з jitter, обрізані до дедлайну."""
+        error = retry_state.outcome.exception() if retry_state.outcome else None
+        if isinstance(error, LLMError) and error.retry_after is not None:
+            delay = error.retry_after
+        else:
+            delay = wait_random_exponential(multiplier=self.base_delay, max=self.max_delay)(
+                retry_state
+            )
+        remaining = deadline - (retry_state.seconds_since_start or 0.0)
+        return max(0.0, min(delay, remaining))
+
+    def _before_sleep(self, retry_state: RetryCallState) -> None:
+        """Логування перед повтором."""
+        error = retry_state.outcome.exception() if retry_state.outcome else None
+        logger.warning(
+            "llm_retry",
+            provider=self.provider,
+            attempt=retry_state.attempt_number,
+            sleep_s=round(retry_state.upcoming_sleep, 2),
+            status=getattr(error, "status_code", None),
+        )
@@ -4,13 +4,29 @@
 Стратегія:
 - MamayLM: генерація контенту українською (секції 1-10)
 - Claude: compliance checking, валідація якості
-- Fallback: Claude якщо MamayLM недоступний
+- Fallback: Claude якщо MamayLM недоступний (одразу, якщо circuit breaker
+  MamayLM відкритий)
+- Hedging (опціонально): повільний MamayLM дублюється запитом до Claude
+- Кеш: низькотемпературні відповіді повторно використовуються
+
+Роутер (разом з HTTP пулами клієнтів) є спільним для процесу:
+створюється у lifespan FastAPI та закривається при зупинці.
 """
 
+import asyncio
+import contextlib
+import time
+from collections.abc import AsyncGenerator, AsyncIterator
+
 from src.config import settings
 from src.llm.base import BaseLLMClient, LLMResponse
+from src.llm.cache import ResponseCache, make_cache_key
+from src.llm.circuit_breaker import CircuitBreaker, CircuitState
 from src.llm.claude_client import ClaudeClient
+from src.llm.hedging import HedgeStats, LatencyTracker, hedge_delay
 from src.llm.mamay_client import MamayLMClient
+from src.llm.rate_limiter import ProviderLimiter, estimate_tokens
+from src.utils.deadline import current_deadline
 from src.utils.exceptions import LLMError
 from src.utils.logger import get_logger
 
@@ -19,6 +35,10 @@ logger = get_logger(__name__)
 # Типи задач для маршрутизації
 COMPLIANCE_TASKS = {"compliance_check", "quality_validation", "structure_review"}
 GENERATION_TASKS = {"section_generation", "content_creation", "requirements_analysis"}
+# Задачі, для яких дозволено hedging (довгі відповіді MamayLM)
+HEDGE_TASKS = {"section_generation"}
+
+_shared_router: "LLMRouter | None" = None
 
 
 class LLMRouter:
@@ -26,17 +46,39 @@ class LLMRouter:
     Маршрутизатор запитів між MamayLM та Claude.
 
     Розподіляє задачі між провайдерами на основі типу задачі
-    з автоматичним fallback на Claude.
+    з автоматичним fallback на Claude. Кожен виклик проходить через
+    ліміти паралельності та RPM/TPM відповідного провайдера.
     """
 
     def __init__(
         self,
         mamay_client: MamayLMClient | None = None,
         claude_client: ClaudeClient | None = None,
+        limiters: dict[str, ProviderLimiter] | None = None,
+        cache: ResponseCache | None = None,
     ) -> None:
         self.mamay_client = mamay_client or MamayLMClient()
         self.claude_client = claude_client or ClaudeClient()
         self.default_provider = settings.default_llm_provider
+        self.limiters = limiters or {
+            "mamay": ProviderLimiter.from_settings("mamay"),
+            "claude": ProviderLimiter.from_settings("claude"),
+        }
+        self.breakers = {
+            provider: CircuitBreaker(
+                provider,
+                failure_threshold=settings.llm_breaker_failure_threshold,
+                recovery_timeout=settings.llm_breaker_recovery_timeout,
+            )
+            for provider in ("mamay", "claude")
+        }
+        self.health: dict[str, bool] = {}
+        self._probe_task: asyncio.Task[None] | None = None
+        # Латентність повної відповіді та першого токена (для hedging)
+        self.latency = {provider: LatencyTracker() for provider in self.breakers}
+        self.first_token_latency = {provider: LatencyTracker() for provider in self.breakers}
+        self.hedge_stats = HedgeStats()
+        self.cache = cache or (ResponseCache() if settings.llm_cache_enabled else None)
 
     async def route(
         self,
@@ -45,6 +87,7 @@ class LLMRouter:
         system_prompt: str | None = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
+        use_cache: bool = True,
     ) -> LLMResponse:
         """
         Маршрутизація запиту до відповідного LLM провайдера.
@@ -55,6 +98,8 @@ class LLMRouter:
             system_prompt: Системний промпт.
             temperature: Температура генерації.
             max_tokens: Ліміт токенів.
+            use_cache: Дозволити кеш відповідей (лише для температури
+                не вище ``llm_cache_max_temperature``).
 
         Returns:
             LLMResponse від обраного провайдера.
@@ -62,38 +107,359 @@ class LLMRouter:
         Raises:
             LLMError: Якщо обидва провайдери недоступні.
         """
+        params = {
+            "prompt": prompt,
+            "system_prompt": system_prompt,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        use_cache = use_cache and temperature <= settings.llm_cache_max_temperature
+
         # Compliance задачі завжди через Claude (reasoning capabilities)
         if task_type in COMPLIANCE_TASKS:
             logger.info("routing_to_claude", task_type=task_type)
-            return await self.claude_client.generate(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
+            return await self._generate("claude", params, use_cache)
+
+        if settings.llm_hedging_enabled and task_type in HEDGE_TASKS:
+            return await self._route_hedged(task_type, params, use_cache)
 
         # Генерація контенту — спочатку MamayLM, потім Claude як fallback
         logger.info("routing_to_mamay", task_type=task_type)
         try:
-            return await self.mamay_client.generate(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
+            return await self._generate("mamay", params, use_cache)
         except LLMError as e:
             logger.warning(
                 "mamay_fallback_to_claude",
                 task_type=task_type,
                 mamay_error=str(e),
             )
-            return await self.claude_client.generate(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                temperature=temperature,
-                max_tokens=max_tokens,
+            return await self._generate("claude", params, use_cache)
+
+    async def route_stream(
+        self,
+        task_type: str,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        """
+        Потокова маршрутизація запиту (SSE від провайдера).
+
+        Правила вибору провайдера ті ж, що й у ``route``. Fallback на Claude
+        можливий лише до першого отриманого фрагмента — після цього помилка
+        MamayLM пробрасується, щоб не змішувати тексти двох моделей.
+
+        Args:
+            task_type: Тип задачі (compliance_check, section_generation, тощо).
+            prompt: Текст промпту.
+            system_prompt: Системний промпт.
+            temperature: Температура генерації.
+            max_tokens: Ліміт токенів.
+
+        Yields:
+            Фрагменти тексту у порядку генерації.
+
+        Raises:
+            LLMError: Якщо обидва провайдери недоступні.
+        """
+        params = {
+            "prompt": prompt,
+            "system_prompt": system_prompt,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+
+        if task_type in COMPLIANCE_TASKS:
+            logger.info("routing_stream_to_claude", task_type=task_type)
+            async for chunk in self._stream("claude", params):
+                yield chunk
+            return
+
+        if settings.llm_hedging_enabled and task_type in HEDGE_TASKS:
+            async for chunk in self._route_stream_hedged(task_type, params):
+                yield chunk
+            return
+
+        logger.info("routing_stream_to_mamay", task_type=task_type)
+        started = False
+        try:
+            async for chunk in self._stream("mamay", params):
+                started = True
+                yield chunk
+            return
+        except LLMError as e:
+            if started:
+                raise
+            logger.warning(
+                "mamay_stream_fallback_to_claude",
+                task_type=task_type,
+                mamay_error=str(e),
             )
 
+        async for chunk in self._stream("claude", params):
+            yield chunk
+
+    async def _generate(
+        self,
+        provider: str,
+        params: dict,
+        use_cache: bool = False,
+    ) -> LLMResponse:
+        """Виклик провайдера (через кеш) в межах його лімітів та circuit breaker."""
+        cache_key = None
+        if use_cache and self.cache is not None:
+            cache_key = make_cache_key(provider, self.get_client(provider).model_id, **params)
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                logger.info("llm_cache_hit", provider=provider)
+                return cached
+
+        breaker = self._acquire_breaker(provider)
+        limiter = self.limiters[provider]
+        estimated = estimate_tokens(params["prompt"], params["system_prompt"])
+
+        client = self.get_client(provider)
+        try:
+            if client.retry_policy is None:
+                response = await self._attempt(provider, params, estimated)
+            else:
+                # Слот займається на кожну спробу, а не на паузи між ними
+                response = await client.retry_policy.retrying()(
+                    self._attempt, provider, params, estimated
+                )
+        except LLMError:
+            breaker.record_failure()
+            raise
+        except asyncio.CancelledError:
+            breaker.release_trial()
+            raise
+
+        breaker.record_success()
+        limiter.record_usage(response.tokens_used, estimated)
+        if cache_key is not None and self.cache is not None:
+            await self.cache.set(cache_key, response)
+        return response
+
+    async def _attempt(self, provider: str, params: dict, estimated: int) -> LLMResponse:
+        """
+        Одна спроба в слоті провайдера з виміром латентності.
+
+        Скасована спроба (hedge переміг) теж потрапляє у вікно латентності:
+        час до скасування — нижня межа її латентності, без якої вікно
+        бачило б лише швидкі відповіді й занижувало затримку hedge.
+        """
+        async with self.limiters[provider].slot(estimated):
+            start = time.monotonic()
+            try:
+                response = await self.get_client(provider).generate_once(**params)
+            except asyncio.CancelledError:
+                self.latency[provider].record(time.monotonic() - start)
+                raise
+            self.latency[provider].record(time.monotonic() - start)
+        return response
+
+    async def _stream(self, provider: str, params: dict) -> AsyncGenerator[str, None]:
+        """Потоковий виклик провайдера; слот утримується до кінця потоку."""
+        breaker = self._acquire_breaker(provider)
+        limiter = self.limiters[provider]
+        estimated = estimate_tokens(params["prompt"], params["system_prompt"])
+        parts: list[str] = []
+        start: float | None = None
+
+        try:
+            async with limiter.slot(estimated):
+                start = time.monotonic()
+                async for chunk in self.get_client(provider).generate_stream(**params):
+                    if not parts:
+                        self.first_token_latency[provider].record(time.monotonic() - start)
+                    parts.append(chunk)
+                    yield chunk
+                self.latency[provider].record(time.monotonic() - start)
+        except LLMError:
+            breaker.record_failure()
+            raise
+        except (asyncio.CancelledError, GeneratorExit):
+            if start is not None and not parts:
+                # Нижня межа часу до першого токена скасованого потоку
+                self.first_token_latency[provider].record(time.monotonic() - start)
+            breaker.release_trial()
+            raise
+
+        breaker.record_success()
+        limiter.record_usage(estimated + estimate_tokens("".join(parts)), estimated)
+
+    async def _route_hedged(
+        self,
+        task_type: str,
+        params: dict,
+        use_cache: bool = False,
+    ) -> LLMResponse:
+        """
+        Hedged виклик: MamayLM, а після затримки — паралельно Claude.
+
+        Затримка — перцентиль історичної латентності MamayLM. Перемагає
+        перша успішна відповідь; інший запит скасовується.
+        """
+        self.hedge_stats.hedged_calls += 1
+        delay = hedge_delay(self.latency["mamay"])
+        logger.info("routing_to_mamay_hedged", task_type=task_type, hedge_delay=round(delay, 2))
+
+        primary = asyncio.create_task(self._generate("mamay", params, use_cache))
+        tasks: set[asyncio.Task[LLMResponse]] = {primary}
+        last_error: BaseException | None = None
+        # Скасування виклику (таймаут етапу, скасування генерації) теж
+        # скасовує запити, що ще тривають, і звільняє їхні слоти
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+
+            if done:
+                error = primary.exception()
+                if error is None:
+                    self.hedge_stats.primary_wins += 1
+                    return primary.result()
+                logger.warning(
+                    "mamay_fallback_to_claude",
+                    task_type=task_type,
+                    mamay_error=str(error),
+                )
+                return await self._generate("claude", params, use_cache)
+
+            self.hedge_stats.hedges_launched += 1
+            logger.info("hedge_launched", task_type=task_type, hedge_delay=round(delay, 2))
+            hedge = asyncio.create_task(self._generate("claude", params, use_cache))
+            tasks.add(hedge)
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        self._record_hedge_winner(task is hedge, task_type)
+                        return task.result()
+                    last_error = error
+        finally:
+            running = [task for task in tasks if not task.done()]
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        assert last_error is not None
+        raise last_error
+
+    async def _route_stream_hedged(self, task_type: str, params: dict) -> AsyncIterator[str]:
+        """
+        Hedged потік: якщо MamayLM не видав перший токен вчасно,
+        запускається потік Claude; далі транслюється той, що почав першим.
+        """
+        self.hedge_stats.hedged_calls += 1
+        delay = hedge_delay(self.first_token_latency["mamay"])
+        logger.info(
+            "routing_stream_to_mamay_hedged",
+            task_type=task_type,
+            hedge_delay=round(delay, 2),
+        )
+
+        streams: dict[str, AsyncGenerator[str, None]] = {"mamay": self._stream("mamay", params)}
+        firsts: dict[str, asyncio.Future[str]] = {
+            "mamay": asyncio.ensure_future(anext(streams["mamay"]))
+        }
+        winner: str | None = None
+        try:
+            done, _ = await asyncio.wait(set(firsts.values()), timeout=delay)
+
+            if done:
+                if firsts["mamay"].exception() is None:
+                    winner = "mamay"
+                    self.hedge_stats.primary_wins += 1
+                elif isinstance(firsts["mamay"].exception(), StopAsyncIteration):
+                    return
+            else:
+                self.hedge_stats.hedges_launched += 1
+                logger.info("hedge_launched", task_type=task_type, hedge_delay=round(delay, 2))
+                streams["claude"] = self._stream("claude", params)
+                firsts["claude"] = asyncio.ensure_future(anext(streams["claude"]))
+
+                pending = set(firsts.values())
+                while pending and winner is None:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for provider, task in firsts.items():
+                        if task in done and task.exception() is None:
+                            winner = provider
+                            self._record_hedge_winner(provider == "claude", task_type)
+                            break
+        finally:
+            # Скасування програвшого потоку (і обох, якщо скасовано сам виклик)
+            for provider, task in firsts.items():
+                if provider == winner:
+                    continue
+                task.cancel()
+                with contextlib.suppress(BaseException):
+                    await task
+                with contextlib.suppress(BaseException):
+                    await streams[provider].aclose()
+
+        if winner is None:
+            if "claude" not in streams:
+                logger.warning(
+                    "mamay_stream_fallback_to_claude",
+                    task_type=task_type,
+                    mamay_error=str(firsts["mamay"].exception()),
+                )
+                async for chunk in self._stream("claude", params):
+                    yield chunk
+                return
+            error = firsts["claude"].exception() or firsts["mamay"].exception()
+            if isinstance(error, StopAsyncIteration):
+                return
+            assert error is not None
+            raise error
+
+        try:
+            yield firsts[winner].result()
+            async for chunk in streams[winner]:
+                yield chunk
+        finally:
+            await streams[winner].aclose()
+
+    def _record_hedge_winner(self, hedge_won: bool, task_type: str) -> None:
+        """Облік переможця hedged запиту."""
+        if hedge_won:
+            self.hedge_stats.hedge_wins += 1
+        else:
+            self.hedge_stats.primary_wins += 1
+        logger.info(
+            "hedge_resolved",
+            task_type=task_type,
+            winner="claude" if hedge_won else "mamay",
+            **self.hedge_stats.as_dict(),
+        )
+
+    def _acquire_breaker(self, provider: str) -> CircuitBreaker:
+        """
+        Перевірка дедлайну та circuit breaker перед викликом.
+
+        Raises:
+            LLMError: Якщо дедлайн вичерпано або breaker відкритий —
+                без мережевого запиту.
+        """
+        deadline = current_deadline.get()
+        if deadline is not None and deadline.expired:
+            raise LLMError("Дедлайн генерації вичерпано", provider=provider)
+
+        breaker = self.breakers[provider]
+        if not breaker.allow_request():
+            raise LLMError("Провайдер тимчасово вимкнено (circuit open)", provider=provider)
+        return breaker
+
+    def limiter_stats(self) -> dict[str, dict[str, float]]:
+        """Статистика черг по провайдерах."""
+        return {name: limiter.stats.as_dict() for name, limiter in self.limiters.items()}
+
     def get_client(self, provider: str) -> BaseLLMClient:
         """
         Отримання конкретного LLM клієнта.
@@ -112,13 +478,100 @@ class LLMRouter:
             raise ValueError(f"Невідомий LLM провайдер: {provider}")
 
     async def health_check(self) -> dict[str, bool]:
-        """Перевірка доступності всіх LLM провайдерів."""
-        return {
-            "mamay": await self.mamay_client.health_check(),
-            "claude": await self.claude_client.health_check(),
-        }
+        """Перевірка доступності всіх LLM провайдерів (оновлює breakers)."""
+        for provider in self.breakers:
+            await self._probe(provider)
+        return dict(self.health)
+
+    async def warm_up(self) -> dict[str, bool]:
+        """
+        Прогрів HTTP пулів усіх провайдерів паралельно.
+
+        Returns:
+            Словник {провайдер: чи відповів}.
+        """
+        providers = list(self.breakers)
+        results = await asyncio.gather(
+            *(self.get_client(provider).warm_up() for provider in providers)
+        )
+        warmed = dict(zip(providers, results))
+        logger.info("llm_pools_warmed_up", **warmed)
+        return warmed
+
+    def circuit_states(self) -> dict[str, str]:
+        """Поточні стани circuit breakers по провайдерах."""
+        return {provider: breaker.state.value for provider, breaker in self.breakers.items()}
+
+    def start_health_probe(self, interval: float | None = None) -> None:
+        """
+        Запуск фонового health check провайдерів.
+
+        Провайдери з дешевим health check перевіряються завжди, решта —
+        лише коли їх breaker не закритий (щоб вчасно відновити роботу).
+
+        Args:
+            interval: Інтервал перевірок у секундах (0 — вимкнено).
+        """
+        interval = settings.llm_health_probe_interval if interval is None else interval
+        if interval <= 0 or self._probe_task is not None:
+            return
+        self._probe_task = asyncio.create_task(self._probe_loop(interval))
+        logger.info("llm_health_probe_started", interval=interval)
+
+    async def _probe_loop(self, interval: float) -> None:
+        """Періодична перевірка провайдерів."""
+        while True:
+            for provider, breaker in self.breakers.items():
+                client = self.get_client(provider)
+                if client.health_probe_always or breaker.state != CircuitState.CLOSED:
+                    await self._probe(provider)
+            await asyncio.sleep(interval)
+
+    async def _probe(self, provider: str) -> bool:
+        """Health check одного провайдера з оновленням кешу та breaker."""
+        healthy = await self.get_client(provider).health_check()
+        breaker = self.breakers[provider]
+        if healthy:
+            breaker.record_success()
+        elif breaker.state != CircuitState.OPEN:
+            breaker.record_failure()
+        self.health[provider] = healthy
+        return healthy
 
     async def close(self) -> None:
-        """Закриття всіх HTTP клієнтів."""
+        """Зупинка health check та закриття всіх HTTP клієнтів."""
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._probe_task
+            self._probe_task = None
         await self.mamay_client.close()
         await self.claude_client.close()
+        if self.cache is not None:
+            self.cache.close()
+
+
+def get_shared_router() -> LLMRouter:
+    """
+    Отримання спільного для процесу LLMRouter.
+
+    Створюється ліниво при першому зверненні, щоб агенти не будували
+    власні HTTP пули на кожен запит.
+
+    Returns:
+        Екземпляр LLMRouter.
+    """
+    global _shared_router
+    if _shared_router is None:
+        _shared_router = LLMRouter()
+        logger.info("llm_router_created")
+    return _shared_router
+
+
+async def close_shared_router() -> None:
+    """Закриття спільного LLMRouter та його HTTP пулів."""
+    global _shared_router
+    if _shared_router is not None:
+        await _shared_router.close()
+        _shared_router = None
+        logger.info("llm_router_closed")
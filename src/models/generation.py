@@ -22,7 +22,7 @@ class GenerationStatusResponse(BaseModel):
     """Статус генерації ТЗ."""
 
     task_id: str
-    status: str = Field(..., description="pending | processing | completed | failed")
+    status: str = Field(..., description="pending | processing | completed | failed | cancelled")
     progress: float = Field(0.0, ge=0.0, le=1.0, description="Прогрес від 0 до 1")
     current_step: str | None = Field(None, description="Поточний крок генерації")
     elapsed_seconds: float | None = None
@@ -1,16 +1,66 @@
 """
 Розбиття тексту на семантичні чанки для RAG.
 
-Оптимізовано для документів ТЗ українською мовою.
+Оптимізовано для документів ТЗ українською мовою. Розмір чанка
+вимірюється в токенах моделі ембедінгів (e5 обрізає вхід на 512
+токенах) або, без токенізатора, в символах. Розбиття однопрохідне:
+кожне речення вимірюється один раз і жадібно пакується в чанки.
 """
 
 import re
+from collections import deque
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
 
+from src.config import settings
+from src.utils.exceptions import RAGError
 from src.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from tokenizers import Tokenizer
+
 logger = get_logger(__name__)
 
+# Заголовок секції на окремому рядку (1. Назва, 2.1. Назва, тощо)
+SECTION_HEADING = re.compile(r"^(\d+\.?\d*\.?)\s+(.+?)$", re.MULTILINE)
+# Номер секції без назви — назва на наступному рядку
+SECTION_NUMBER_ONLY = re.compile(r"(\d+\.?\d*\.?)\s*")
+# Межа речення в абзаці: пробіли після крапки, знаку питання чи оклику
+SENTENCE_END = re.compile(r"(?<=[.?!])\s+")
+# Слово з пробілами після нього (розбиття задовгого речення)
+WORD = re.compile(r"\S+\s*")
+
+
+@lru_cache(maxsize=4)
+def load_tokenizer(name: str) -> "Tokenizer":
+    """
+    Завантаження fast-токенізатора (один раз на процес).
+
+    Args:
+        name: Назва моделі на HuggingFace Hub, директорія з
+            ``tokenizer.json`` (напр. ONNX експорт) або шлях до файлу.
+
+    Returns:
+        Токенізатор ``tokenizers``.
+
+    Raises:
+        RAGError: Якщо токенізатор не вдалося завантажити.
+    """
+    from tokenizers import Tokenizer
+
+    path = Path(name)
+    try:
+        if path.is_dir():
+            return Tokenizer.from_file(str(path / "tokenizer.json"))
+        if path.is_file():
+            return Tokenizer.from_file(str(path))
+        return Tokenizer.from_pretrained(name)
+    except Exception as e:
+        raise RAGError(f"Не вдалося завантажити токенізатор {name}: {e}") from e
+
 
 @dataclass
 class TextChunk:
@@ -27,16 +77,46 @@ class DocumentChunker:
     """
     Розбиття документів ТЗ на семантичні чанки.
 
-    Враховує структуру КМУ №205 (секції, підсекції).
+    Враховує структуру КМУ №205 (секції, підсекції). ``chunk_size`` та
+    ``chunk_overlap`` задані в токенах ``tokenizer`` або, якщо
+    токенізатор не вказано, в символах.
     """
 
     def __init__(
         self,
         chunk_size: int = 1000,
         chunk_overlap: int = 200,
+        tokenizer: str | None = None,
     ) -> None:
+        if not 0 <= chunk_overlap < chunk_size:
+            raise ValueError("chunk_overlap має бути в межах [0, chunk_size)")
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.tokenizer = tokenizer or None
+
+    @classmethod
+    def from_settings(cls) -> "DocumentChunker":
+        """Чанкер з розміром у токенах за налаштуваннями (CHUNK_*)."""
+        return cls(
+            chunk_size=settings.chunk_size,
+            chunk_overlap=settings.chunk_overlap,
+            tokenizer=settings.chunk_tokenizer,
+        )
+
+    def measure(self, texts: list[str]) -> list[int]:
+        """
+        Розмір текстів в одиницях ``chunk_size``.
+
+        Args:
+            texts: Фрагменти тексту.
+
+        Returns:
+            Кількість токенів (без спецтокенів) або символів кожного фрагмента.
+        """
+        if self.tokenizer is None:
+            return [len(text) for text in texts]
+        encodings = load_tokenizer(self.tokenizer).encode_batch(texts, add_special_tokens=False)
+        return [len(encoding.ids) for encoding in encodings]
 
     def chunk_document(
         self,
@@ -53,97 +133,204 @@ class DocumentChunker:
         Returns:
             Список TextChunk з метаданими.
         """
-        # Спроба розбити по секціях ТЗ
-        sections = self._split_by_sections(text)
-
-        chunks: list[TextChunk] = []
-        for section_id, section_title, section_text in sections:
-            section_chunks = self._split_text(section_text)
-            for i, chunk_text in enumerate(section_chunks):
-                chunks.append(
-                    TextChunk(
-                        text=chunk_text.strip(),
-                        section_id=section_id,
-                        section_title=section_title,
-                        source_file=source_file,
-                        chunk_index=i,
-                    )
-                )
-
-        logger.info(
-            "document_chunked",
-            source=source_file,
-            total_chunks=len(chunks),
-            sections_found=len(sections),
-        )
-
-        return chunks
-
-    def _split_by_sections(
-        self, text: str
-    ) -> list[tuple[str | None, str | None, str]]:
-        """
-        Розбиття тексту по секціях КМУ №205.
+        return list(self.iter_chunks(text.split("\n"), source_file=source_file))
 
-        Шукає патерни виду "1. Загальні відомості", "2.1. Опис процесів", тощо.
+    def iter_chunks(
+        self,
+        lines: Iterable[str],
+        source_file: str | None = None,
+    ) -> Iterator[TextChunk]:
         """
-        # Патерн для заголовків секцій (1. Назва, 2.1. Назва, тощо)
-        section_pattern = re.compile(
-            r"^(\d+\.?\d*\.?)\s+(.+?)$",
-            re.MULTILINE,
-        )
-
-        matches = list(section_pattern.finditer(text))
-
-        if not matches:
-            # Якщо секцій не знайдено — повертаємо весь текст
-            return [(None, None, text)]
+        Потокове розбиття документу на чанки з урахуванням секцій КМУ №205.
 
-        sections = []
-        for i, match in enumerate(matches):
-            section_id = match.group(1).rstrip(".")
-            section_title = match.group(2).strip()
-            start = match.end()
-            end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
-            section_text = text[start:end].strip()
+        Рядки споживаються по одному, чанки віддаються, щойно наступне
+        речення не вміщується в ``chunk_size``, тож пам'ять обмежена
+        розміром чанка, а не документу.
+        Виняток — документ без жодного заголовка секції: текст до першого
+        заголовка буферизується до кінця (він відкидається, якщо
+        заголовок з'явиться).
 
-            if section_text:
-                sections.append((section_id, section_title, section_text))
+        Шукає заголовки виду "1. Загальні відомості", "2.1. Опис процесів".
 
-        return sections
+        Args:
+            lines: Рядки (абзаци) документу.
+            source_file: Назва файлу-джерела.
 
-    def _split_text(self, text: str) -> list[str]:
+        Yields:
+            TextChunk з метаданими.
         """
-        Розбиття тексту на чанки з перекриттям.
+        section: _SectionSplitter | None = None
+        preamble: list[str] = []
+        # Рядок "1." без назви: назвою стає наступний непорожній рядок
+        pending_id: str | None = None
+        pending_lines: list[str] = []
+        total_chunks = 0
+        sections_found = 0
+
+        for paragraph in lines:
+            for line in paragraph.split("\n"):
+                if pending_id is not None:
+                    if not line.strip():
+                        pending_lines.append(line)
+                        continue
+                    heading: tuple[str, str] | None = (pending_id, line.strip())
+                    pending_id, pending_lines = None, []
+                elif match := SECTION_NUMBER_ONLY.fullmatch(line):
+                    pending_id, pending_lines = match.group(1).rstrip("."), [line]
+                    continue
+                elif match := SECTION_HEADING.match(line):
+                    heading = (match.group(1).rstrip("."), match.group(2).strip())
+                else:
+                    heading = None
+
+                if heading is None:
+                    if section is None:
+                        preamble.append(line)
+                    else:
+                        for chunk in section.feed(line):
+                            total_chunks += 1
+                            yield chunk
+                    continue
+
+                if section is not None:
+                    for chunk in section.finish():
+                        total_chunks += 1
+                        yield chunk
+                sections_found += 1
+                section = _SectionSplitter(self, heading[0], heading[1], source_file)
+
+        # Номер без назви в кінці документу: заголовок з порожньою
+        # назвою (якщо після номера є пробіли) або звичайний текст
+        if pending_lines and (match := SECTION_HEADING.match("\n".join(pending_lines))):
+            if section is not None:
+                for chunk in section.finish():
+                    total_chunks += 1
+                    yield chunk
+            sections_found += 1
+            section = _SectionSplitter(
+                self, match.group(1).rstrip("."), match.group(2).strip(), source_file
+            )
+        else:
+            for line in pending_lines:
+                if section is None:
+                    preamble.append(line)
+                else:
+                    for chunk in section.feed(line):
+                        total_chunks += 1
+                        yield chunk
+
+        if section is None:
+            # Секцій не знайдено — увесь текст як одна секція
+            section = _SectionSplitter(self, None, None, source_file)
+            sections_found = 1
+            for line in preamble:
+                for chunk in section.feed(line):
+                    total_chunks += 1
+                    yield chunk
+        for chunk in section.finish():
+            total_chunks += 1
+            yield chunk
 
-        Args:
-            text: Текст для розбиття.
+        logger.info(
+            "document_chunked",
+            source=source_file,
+            total_chunks=total_chunks,
+            sections_found=sections_found,
+        )
 
-        Returns:
-            Список чанків.
-        """
-        if len(text) <= self.chunk_size:
-            return [text]
 
-        chunks = []
-        start = 0
+class _SectionSplitter:
+    """
+    Однопрохідне розбиття однієї секції на чанки.
 
-        while start < len(text):
-            end = start + self.chunk_size
+    Абзац ділиться на речення, кожне вимірюється один раз і додається
+    в поточний чанк. Коли речення не вміщується, чанк віддається, а
+    наступний починається з хвоста речень розміром до ``chunk_overlap``.
+    Кожен чанк містить хоча б одне нове речення, тож розбиття завжди
+    просувається, а кожне речення потрапляє в обмежену кількість чанків.
+    """
 
-            # Шукаємо кінець речення для чистого розрізу
-            if end < len(text):
-                # Шукаємо крапку, знак питання або оклику
-                for sep in [". ", ".\n", "? ", "! ", "\n\n"]:
-                    last_sep = text.rfind(sep, start, end)
-                    if last_sep > start:
-                        end = last_sep + len(sep)
-                        break
+    def __init__(
+        self,
+        chunker: DocumentChunker,
+        section_id: str | None,
+        section_title: str | None,
+        source_file: str | None,
+    ) -> None:
+        self.chunker = chunker
+        self.section_id = section_id
+        self.section_title = section_title
+        self.source_file = source_file
+        # Речення поточного чанка: (текст з роздільником, розмір)
+        self.units: deque[tuple[str, int]] = deque()
+        self.size = 0
+        # Речення, що ще не потрапили в жоден відданий чанк
+        self.fresh = 0
+        self.emitted = 0
+
+    def feed(self, line: str) -> list[TextChunk]:
+        """Додавання абзацу; віддає чанки, що заповнилися."""
+        line = line.strip()
+        if not line:
+            return []
+
+        bounds = [0, *(match.end() for match in SENTENCE_END.finditer(line)), len(line)]
+        sentences = [line[start:end] for start, end in zip(bounds, bounds[1:]) if start < end]
+        sentences[-1] += "\n"
 
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
+        chunks: list[TextChunk] = []
+        for sentence, size in zip(sentences, self.chunker.measure(sentences)):
+            if size <= self.chunker.chunk_size:
+                chunks.extend(self._add(sentence, size))
+            else:
+                for piece, piece_size in self._split_long(sentence):
+                    chunks.extend(self._add(piece, piece_size))
+        return chunks
 
-            start = end - self.chunk_overlap
+    def finish(self) -> list[TextChunk]:
+        """Кінець секції: віддає останній неповний чанк."""
+        return [self._emit()] if self.fresh else []
 
+    def _add(self, text: str, size: int) -> list[TextChunk]:
+        """Додавання речення в поточний чанк (з віддачею заповненого)."""
+        chunks = []
+        limit = self.chunker.chunk_size
+        if self.fresh and self.size + size > limit:
+            chunks.append(self._emit())
+        # Перекриття поступається місцем новому реченню
+        while self.units and self.size + size > limit:
+            self.size -= self.units.popleft()[1]
+
+        self.units.append((text, size))
+        self.size += size
+        self.fresh += 1
         return chunks
+
+    def _emit(self) -> TextChunk:
+        """Віддача поточного чанка та залишення хвоста для перекриття."""
+        chunk = TextChunk(
+            text="".join(text for text, _ in self.units).strip(),
+            section_id=self.section_id,
+            section_title=self.section_title,
+            source_file=self.source_file,
+            chunk_index=self.emitted,
+        )
+        self.emitted += 1
+        self.fresh = 0
+        while self.units and self.size > self.chunker.chunk_overlap:
+            self.size -= self.units.popleft()[1]
+        return chunk
+
+    def _split_long(self, sentence: str) -> list[tuple[str, int]]:
+        """Речення, довше за ``chunk_size``: розбиття на слова (або зрізи слова)."""
+        limit = self.chunker.chunk_size
+        words = WORD.findall(sentence)
+        pieces: list[tuple[str, int]] = []
+        for word, size in zip(words, self.chunker.measure(words)):
+            if size <= limit:
+                pieces.append((word, size))
+                continue
+            # Токен покриває хоча б один символ, тож зріз у limit символів вміщується
+            slices = [word[start : start + limit] for start in range(0, len(word), limit)]
+            pieces.extend(zip(slices, self.chunker.measure(slices)))
+        return pieces
@@ -0,0 +1,181 @@
+"""
+Схема та параметри пошуку колекції Qdrant.
+
+Кожен пошук по секції фільтрує за ``section_id``; без payload індексу
+Qdrant перебирає точки для перевірки фільтра. Колекція створюється з
+keyword індексами ``section_id`` та ``source_file``, налаштованим HNSW,
+опційно векторами на диску та скалярною int8 квантизацією
+(оригінальні вектори лишаються для rescoring). Поруч із щільним
+вектором зберігається іменований sparse-вектор BM25 (IDF рахує Qdrant)
+для гібридного пошуку. Версія даних у metadata колекції (Qdrant 1.16+)
+змінюється кожною інгестією та інвалідує кеш пошуку RAGRetriever.
+
+Спільна для інгестії, ``scripts/setup_qdrant.py`` та RAGRetriever.
+"""
+
+import uuid
+from typing import TYPE_CHECKING
+
+from src.config import settings
+from src.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from qdrant_client import QdrantClient
+    from qdrant_client.models import SearchParams
+
+logger = get_logger(__name__)
+
+# Поля payload, за якими фільтрують пошук та видалення
+PAYLOAD_INDEXES = ("section_id", "source_file")
+
+# Іменований sparse-вектор BM25 (щільний вектор — без імені)
+SPARSE_VECTOR = "bm25"
+
+# Ключ metadata колекції з версією даних
+VERSION_KEY = "data_version"
+
+
+def create_collection(client: "QdrantClient", collection_name: str, dimension: int) -> None:
+    """
+    Створення колекції з налаштуваннями QDRANT_* та payload індексами.
+
+    Args:
+        client: Синхронний клієнт Qdrant.
+        collection_name: Назва колекції.
+        dimension: Розмірність векторів.
+    """
+    from qdrant_client.models import (
+        Distance,
+        HnswConfigDiff,
+        Modifier,
+        ScalarQuantization,
+        ScalarQuantizationConfig,
+        ScalarType,
+        SparseVectorParams,
+        VectorParams,
+    )
+
+    quantization = None
+    if settings.qdrant_quantization_enabled:
+        quantization = ScalarQuantization(
+            scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8,
+                quantile=settings.qdrant_quantization_quantile,
+                # Квантизовані вектори в RAM, оригінали (для rescoring) — де задано
+                always_ram=True,
+            )
+        )
+
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config=VectorParams(
+            size=dimension,
+            distance=Distance.COSINE,
+            on_disk=settings.qdrant_on_disk_vectors,
+        ),
+        hnsw_config=HnswConfigDiff(
+            m=settings.qdrant_hnsw_m,
+            ef_construct=settings.qdrant_hnsw_ef_construct,
+        ),
+        quantization_config=quantization,
+        sparse_vectors_config={SPARSE_VECTOR: SparseVectorParams(modifier=Modifier.IDF)},
+    )
+    ensure_payload_indexes(client, collection_name)
+
+    logger.info(
+        "qdrant_collection_created",
+        collection=collection_name,
+        dimension=dimension,
+        hnsw_m=settings.qdrant_hnsw_m,
+        hnsw_ef_construct=settings.qdrant_hnsw_ef_construct,
+        on_disk=settings.qdrant_on_disk_vectors,
+        quantization=settings.qdrant_quantization_enabled,
+    )
+
+
+def ensure_payload_indexes(client: "QdrantClient", collection_name: str) -> list[str]:
+    """
+    Створення відсутніх keyword індексів ``PAYLOAD_INDEXES``.
+
+    Для вже існуючої колекції індекси додаються без переіндексації векторів.
+
+    Args:
+        client: Синхронний клієнт Qdrant.
+        collection_name: Назва колекції.
+
+    Returns:
+        Поля, для яких індекс створено.
+    """
+    from qdrant_client.models import PayloadSchemaType
+
+    existing = client.get_collection(collection_name).payload_schema or {}
+    created = []
+    for field_name in PAYLOAD_INDEXES:
+        if field_name in existing:
+            continue
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=PayloadSchemaType.KEYWORD,
+            wait=True,
+        )
+        created.append(field_name)
+
+    if created:
+        logger.info("qdrant_payload_indexes_created", collection=collection_name, fields=created)
+    return created
+
+
+def has_sparse_vectors(client: "QdrantClient", collection_name: str) -> bool:
+    """
+    Чи має колекція sparse-вектор BM25.
+
+    Колекції, створені до гібридного пошуку, його не мають — sparse-вектор
+    неможливо додати до існуючої колекції, потрібне перестворення.
+    """
+    sparse = client.get_collection(collection_name).config.params.sparse_vectors or {}
+    return SPARSE_VECTOR in sparse
+
+
+def bump_collection_version(client: "QdrantClient", collection_name: str) -> str:
+    """
+    Нова версія даних колекції (після зміни точок інгестією).
+
+    Args:
+        client: Синхронний клієнт Qdrant.
+        collection_name: Назва колекції.
+
+    Returns:
+        Нова версія.
+    """
+    version = uuid.uuid4().hex
+    client.update_collection(collection_name, metadata={VERSION_KEY: version})
+    logger.info("qdrant_collection_version_bumped", collection=collection_name, version=version)
+    return version
+
+
+def search_params(exact: bool = False) -> "SearchParams":
+    """
+    Параметри пошуку за налаштуваннями.
+
+    З квантизацією кандидати відбираються за int8 векторами
+    (``limit × oversampling``), а потім переранжуються за оригінальними.
+
+    Args:
+        exact: Точний перебір без HNSW та квантизації (еталон для recall).
+
+    Returns:
+        SearchParams для ``query_points`` / ``QueryRequest``.
+    """
+    from qdrant_client.models import QuantizationSearchParams, SearchParams
+
+    if exact:
+        return SearchParams(exact=True, quantization=QuantizationSearchParams(ignore=True))
+
+    quantization = None
+    if settings.qdrant_quantization_enabled:
+        quantization = QuantizationSearchParams(
+            rescore=True,
+            oversampling=settings.qdrant_quantization_oversampling,
+        )
+    return SearchParams(hnsw_ef=settings.qdrant_hnsw_ef, quantization=quantization)
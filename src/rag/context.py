@@ -0,0 +1,198 @@
+"""
+Побудова RAG контексту секції в межах бюджету токенів.
+
+Чанки перекриваються (CHUNK_OVERLAP), а зразки ТЗ повторюють типові
+формулювання, тож просте об'єднання top-k дублює текст у промпті
+кожної секції. ContextBuilder:
+- відбирає кандидатів за Maximal Marginal Relevance (релевантність
+  мінус схожість з уже відібраними, лексична схожість Жаккара) та
+  відкидає майже дублікати;
+- зшиває сусідні чанки однієї секції файлу, прибираючи перекриття;
+- пакує фрагменти до RAG_CONTEXT_MAX_TOKENS.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from src.config import settings
+from src.llm.rate_limiter import CHARS_PER_TOKEN, estimate_tokens
+from src.rag.lexical import tokenize
+
+# Роздільник фрагментів контексту у промпті
+SEPARATOR = "\n\n---\n\n"
+
+# Мінімальна довжина перекриття сусідніх чанків для зшивання
+MIN_OVERLAP_CHARS = 20
+
+
+@dataclass
+class BuiltContext:
+    """Контекст секції та статистика пакування."""
+
+    text: str
+    tokens: int
+    raw_tokens: int
+    chunks: int
+
+    @property
+    def tokens_saved(self) -> int:
+        """Економія токенів відносно об'єднання top-k."""
+        return max(self.raw_tokens - self.tokens, 0)
+
+
+class ContextBuilder:
+    """Відбір, зшивання та пакування чанків у контекст секції."""
+
+    def __init__(
+        self,
+        max_tokens: int | None = None,
+        mmr_lambda: float | None = None,
+        duplicate_threshold: float | None = None,
+    ) -> None:
+        self.max_tokens = settings.rag_context_max_tokens if max_tokens is None else max_tokens
+        self.mmr_lambda = settings.rag_mmr_lambda if mmr_lambda is None else mmr_lambda
+        self.duplicate_threshold = (
+            settings.rag_duplicate_threshold
+            if duplicate_threshold is None
+            else duplicate_threshold
+        )
+
+    def build(self, results: list[dict[str, Any]], top_k: int) -> BuiltContext:
+        """
+        Контекст з кандидатів пошуку.
+
+        Args:
+            results: Кандидати, відсортовані за релевантністю (з ``text``,
+                ``score``, ``source_file``, ``chunk_index``).
+            top_k: Максимальна кількість чанків у контексті.
+
+        Returns:
+            Контекст та кількість токенів до і після пакування.
+        """
+        if not results:
+            return BuiltContext(text="", tokens=0, raw_tokens=0, chunks=0)
+        raw_tokens = estimate_tokens(SEPARATOR.join(r["text"] for r in results[:top_k]))
+
+        selected = self.select(results, top_k)
+        parts: list[str] = []
+        used = 0
+        for segment in self._merge_adjacent(selected):
+            tokens = estimate_tokens(segment)
+            if used + tokens > self.max_tokens:
+                if parts:
+                    continue
+                # Найрелевантніший фрагмент завжди потрапляє в контекст
+                segment = self._truncate(segment, self.max_tokens)
+                tokens = estimate_tokens(segment)
+            parts.append(segment)
+            used += tokens
+
+        text = SEPARATOR.join(parts)
+        return BuiltContext(
+            text=text,
+            tokens=estimate_tokens(text),
+            raw_tokens=raw_tokens,
+            chunks=len(selected),
+        )
+
+    def select(self, results: list[dict[str, Any]], top_k: int) -> list[dict[str, Any]]:
+        """
+        Maximal Marginal Relevance відбір без майже дублікатів.
+
+        Args:
+            results: Кандидати, відсортовані за релевантністю.
+            top_k: Максимальна кількість відібраних чанків.
+
+        Returns:
+            Відібрані чанки в порядку відбору.
+        """
+        top_score = max(r["score"] for r in results) or 1.0
+        terms = [frozenset(tokenize(r["text"])) for r in results]
+        remaining = list(range(len(results)))
+        chosen: list[int] = []
+
+        while remaining and len(chosen) < top_k:
+            best, best_value = None, float("-inf")
+            for i in list(remaining):
+                redundancy = max((_jaccard(terms[i], terms[j]) for j in chosen), default=0.0)
+                if redundancy >= self.duplicate_threshold:
+                    remaining.remove(i)
+                    continue
+                value = (
+                    self.mmr_lambda * results[i]["score"] / top_score
+                    - (1 - self.mmr_lambda) * redundancy
+                )
+                if value > best_value:
+                    best, best_value = i, value
+            if best is None:
+                break
+            chosen.append(best)
+            remaining.remove(best)
+
+        return [results[i] for i in chosen]
+
+    @staticmethod
+    def _merge_adjacent(selected: list[dict[str, Any]]) -> list[str]:
+        """
+        Зшивання сусідніх чанків однієї секції файлу.
+
+        Група займає позицію свого найрелевантнішого чанка.
+
+        Returns:
+            Тексти фрагментів у порядку релевантності.
+        """
+        groups: dict[tuple[Any, Any], list[tuple[int, int, str]]] = {}
+        for rank, result in enumerate(selected):
+            index = result.get("chunk_index")
+            if index is None:
+                groups[("", rank)] = [(rank, 0, result["text"])]
+                continue
+            key = (result.get("source_file"), result.get("section_id"))
+            groups.setdefault(key, []).append((rank, index, result["text"]))
+
+        segments: list[tuple[int, str]] = []
+        for chunks in groups.values():
+            chunks.sort(key=lambda chunk: chunk[1])
+            rank, previous, text = chunks[0]
+            for chunk_rank, index, chunk_text in chunks[1:]:
+                if index == previous + 1:
+                    text = _stitch(text, chunk_text)
+                    rank = min(rank, chunk_rank)
+                else:
+                    segments.append((rank, text))
+                    rank, text = chunk_rank, chunk_text
+                previous = index
+            segments.append((rank, text))
+
+        return [text for _, text in sorted(segments)]
+
+    @staticmethod
+    def _truncate(text: str, max_tokens: int) -> str:
+        """Обрізання тексту до бюджету по межі слова."""
+        limit = max(max_tokens - 1, 0) * CHARS_PER_TOKEN
+        if len(text) <= limit:
+            return text
+        cut = text[:limit]
+        return cut.rsplit(maxsplit=1)[0] if " " in cut.strip() else cut
+
+
+def _jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    """Схожість Жаккара множин термінів."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _stitch(first: str, second: str) -> str:
+    """
+    Об'єднання сусідніх чанків без повтору перекриття.
+
+    Шукається найдовший суфікс ``first``, що є префіксом ``second``.
+    """
+    probe = second[:MIN_OVERLAP_CHARS]
+    start = first.find(probe) if len(probe) == MIN_OVERLAP_CHARS else -1
+    while start != -1:
+        if second.startswith(first[start:]):
+            return first + second[len(first) - start :]
+        start = first.find(probe, start + 1)
+    return f"{first}\n{second}"
@@ -0,0 +1,154 @@
+"""
+Персистентний кеш ембедінгів.
+
+Прямий прохід e5-large — найдорожча частина як повторної індексації
+корпусу зразків, так і пошукових запитів. Кеш адресується SHA-256
+вмістом тексту в межах назви моделі та має два рівні:
+- in-memory LRU (повторні запити в межах процесу);
+- SQLite з float32 BLOB (переживає рестарт, спільний для воркерів).
+"""
+
+import hashlib
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+
+from src.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def embedding_cache_key(text: str) -> str:
+    """
+    Ключ кешу — SHA-256 від тексту.
+
+    Returns:
+        Hex-дайджест ключа.
+    """
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Дворівневий кеш ембедінгів (LRU у пам'яті + SQLite), розділений за моделлю.
+
+    Порожній ``db_path`` вимикає дисковий рівень. Методи синхронні —
+    EmbeddingService викликається з ``asyncio.to_thread``.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        db_path: str | None = None,
+        max_memory_items: int | None = None,
+    ) -> None:
+        self.model_name = model_name
+        self.db_path = settings.embedding_cache_path if db_path is None else db_path
+        self.max_memory_items = max_memory_items or settings.embedding_cache_memory_size
+        self._memory: OrderedDict[str, list[float]] = OrderedDict()
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        """
+        Пошук ембедінгів у кеші (спочатку пам'ять, потім диск).
+
+        Args:
+            keys: Ключі з ``embedding_cache_key``.
+
+        Returns:
+            Словник {ключ: вектор} лише для знайдених ключів.
+        """
+        found: dict[str, list[float]] = {}
+        with self._lock:
+            missing = []
+            for key in dict.fromkeys(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+                else:
+                    missing.append(key)
+
+            if missing and self.db_path:
+                for key, vector in self._disk_get(missing).items():
+                    self._remember(key, vector)
+                    found[key] = vector
+
+        self.hits += len(found)
+        self.misses += len(set(keys)) - len(found)
+        return found
+
+    def set_many(self, items: dict[str, list[float]]) -> None:
+        """Збереження ембедінгів в обох рівнях кешу."""
+        if not items:
+            return
+        with self._lock:
+            for key, vector in items.items():
+                self._remember(key, vector)
+            if self.db_path:
+                self._disk_set(items)
+
+    def _remember(self, key: str, vector: list[float]) -> None:
+        """Додавання в LRU з витісненням найстаріших записів (під self._lock)."""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Ліниве відкриття SQLite (викликається під self._lock)."""
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, key TEXT NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model, key))"
+            )
+        return self._conn
+
+    def _disk_get(self, keys: list[str]) -> dict[str, list[float]]:
+        """Читання з SQLite пакетами (ліміт параметрів SQLite)."""
+        conn = self._connect()
+        result: dict[str, list[float]] = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, vector FROM embeddings "
+                f"WHERE model = ? AND key IN ({placeholders})",
+                (self.model_name, *chunk),
+            ).fetchall()
+            for key, blob in rows:
+                result[key] = array("f", blob).tolist()
+        return result
+
+    def _disk_set(self, items: dict[str, list[float]]) -> None:
+        """Запис у SQLite як float32 BLOB."""
+        conn = self._connect()
+        conn.executemany(
+            "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)",
+            [
+                (self.model_name, key, array("f", vector).tobytes())
+                for key, vector in items.items()
+            ],
+        )
+        conn.commit()
+
+    def stats(self) -> dict[str, int]:
+        """Статистика влучань у кеш."""
+        return {"hits": self.hits, "misses": self.misses, "memory_items": len(self._memory)}
+
+    def close(self) -> None:
+        """Закриття SQLite з'єднання."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,77 @@
+"""
+Клієнт локального сервера ембедінгів (``src.rag.embedding_server``).
+
+Протокол: кадри ``4 байти довжини (big-endian) + JSON``.
+Запит ``{"op": "embed", "texts": [...]}`` → ``{"embeddings": [...]}``,
+``{"op": "info"}`` → ``{"model": ..., "dimension": ...}``,
+помилка → ``{"error": "..."}``.
+"""
+
+import json
+import socket
+import struct
+from typing import Any
+
+from src.utils.exceptions import RAGError
+
+HEADER = struct.Struct(">I")
+
+
+def encode_frame(message: dict[str, Any]) -> bytes:
+    """Серіалізація повідомлення в кадр протоколу."""
+    body = json.dumps(message, ensure_ascii=False).encode()
+    return HEADER.pack(len(body)) + body
+
+
+class EmbeddingServerClient:
+    """
+    Синхронний клієнт сервера ембедінгів.
+
+    EmbeddingService викликається з ``asyncio.to_thread``, тому клієнт
+    блокуючий; з'єднання відкривається на кожен запит (Unix socket
+    дешевий, а потоки не ділять сокет).
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 60.0) -> None:
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Ембедінги текстів від сервера."""
+        return self._request({"op": "embed", "texts": texts})["embeddings"]
+
+    def dimension(self) -> int:
+        """Розмірність векторів моделі сервера."""
+        return int(self._request({"op": "info"})["dimension"])
+
+    def _request(self, message: dict[str, Any]) -> dict[str, Any]:
+        """
+        Надсилання кадру та читання відповіді.
+
+        Raises:
+            RAGError: Сервер недоступний або повернув помилку.
+        """
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self.socket_path)
+                sock.sendall(encode_frame(message))
+                (length,) = HEADER.unpack(self._recv_exactly(sock, HEADER.size))
+                response = json.loads(self._recv_exactly(sock, length))
+        except OSError as e:
+            raise RAGError(f"Сервер ембедінгів недоступний ({self.socket_path}): {e}") from e
+
+        if "error" in response:
+            raise RAGError(f"Помилка сервера ембедінгів: {response['error']}")
+        return response
+
+    @staticmethod
+    def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+        """Читання рівно ``size`` байт."""
+        data = bytearray()
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("з'єднання закрито сервером")
+            data.extend(chunk)
+        return bytes(data)
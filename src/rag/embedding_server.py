@@ -0,0 +1,205 @@
+"""
+Локальний сервер ембедінгів на Unix socket.
+
+Кожен воркер uvicorn інакше завантажує власну копію e5-large (~2 ГБ)
+і платить холодний старт на першому RAG запиті. Сервер тримає одну
+модель в окремому процесі та об'єднує запити всіх воркерів у пакети
+з коротким вікном динамічного батчингу.
+
+Протокол описано в ``src.rag.embedding_client``.
+
+Запуск: ``python -m src.rag.embedding_server``.
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from src.config import settings
+from src.rag.embedding_client import HEADER, encode_frame
+from src.rag.embeddings import EmbeddingService
+from src.utils.exceptions import RAGError
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+async def read_frame(reader: asyncio.StreamReader) -> dict[str, Any]:
+    """Читання одного кадру з асинхронного потоку."""
+    header = await reader.readexactly(HEADER.size)
+    (length,) = HEADER.unpack(header)
+    frame: dict[str, Any] = json.loads(await reader.readexactly(length))
+    return frame
+
+
+@dataclass
+class _PendingRequest:
+    """Запит воркера, що очікує в черзі батчера."""
+
+    texts: list[str]
+    future: asyncio.Future[list[list[float]]] = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+class EmbeddingServer:
+    """
+    Сервер ембедінгів з динамічним батчингом.
+
+    Запити, що надійшли протягом ``batch_window_ms`` від першого,
+    об'єднуються в один виклик моделі (до ``max_batch`` текстів).
+    """
+
+    def __init__(
+        self,
+        socket_path: str | None = None,
+        embedding_service: EmbeddingService | None = None,
+        batch_window_ms: float | None = None,
+        max_batch: int | None = None,
+    ) -> None:
+        self.socket_path = socket_path or settings.embedding_server_socket
+        # Сервер сам рахує ембедінги — клієнтський режим тут вимкнено
+        self.embedding_service = embedding_service or EmbeddingService(server_socket="")
+        if batch_window_ms is None:
+            batch_window_ms = settings.embedding_server_batch_window_ms
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch = max_batch or settings.embedding_server_max_batch
+        self._queue: asyncio.Queue[_PendingRequest] = asyncio.Queue()
+        self._server: asyncio.AbstractServer | None = None
+        self._batcher: asyncio.Task[None] | None = None
+        self.batches = 0
+
+    async def start(self) -> None:
+        """Запуск батчера та прослуховування Unix socket."""
+        if not self.socket_path:
+            raise RAGError("EMBEDDING_SERVER_SOCKET не задано")
+
+        path = Path(self.socket_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.unlink(missing_ok=True)
+
+        self._batcher = asyncio.create_task(self._batch_loop())
+        self._server = await asyncio.start_unix_server(self._handle_client, path=str(path))
+        logger.info(
+            "embedding_server_started",
+            socket=self.socket_path,
+            model=self.embedding_service.model_name,
+            batch_window_ms=self.batch_window * 1000,
+        )
+
+    async def stop(self) -> None:
+        """Зупинка сервера та батчера."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+        Path(self.socket_path).unlink(missing_ok=True)
+
+    async def serve_forever(self) -> None:
+        """Запуск та обслуговування до скасування."""
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """
+        Постановка текстів у чергу батчера.
+
+        Args:
+            texts: Тексти для ембедінгу.
+
+        Returns:
+            Вектори у порядку ``texts``.
+        """
+        request = _PendingRequest(texts)
+        await self._queue.put(request)
+        return await request.future
+
+    async def _handle_client(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """Обслуговування з'єднання воркера (кілька запитів поспіль)."""
+        try:
+            while True:
+                try:
+                    message = await read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    break
+
+                try:
+                    if message.get("op") == "info":
+                        response = {
+                            "model": self.embedding_service.model_name,
+                            "dimension": await asyncio.to_thread(
+                                lambda: self.embedding_service.embedding_dimension
+                            ),
+                        }
+                    else:
+                        response = {"embeddings": await self.embed(message["texts"])}
+                except Exception as e:
+                    logger.error("embedding_server_request_error", error=str(e))
+                    response = {"error": str(e)}
+
+                writer.write(encode_frame(response))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def _batch_loop(self) -> None:
+        """Збирання запитів у пакети та виклик моделі."""
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0].texts)
+            deadline = time.monotonic() + self.batch_window
+
+            while size < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(self._queue.get(), timeout)
+                except TimeoutError:
+                    break
+                batch.append(request)
+                size += len(request.texts)
+
+            await self._run_batch(batch)
+
+    async def _run_batch(self, batch: list[_PendingRequest]) -> None:
+        """Один виклик моделі для всіх запитів пакета."""
+        texts = [text for request in batch for text in request.texts]
+        try:
+            embeddings = await asyncio.to_thread(self.embedding_service.embed_batch, texts)
+        except Exception as e:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+
+        self.batches += 1
+        offset = 0
+        for request in batch:
+            count = len(request.texts)
+            if not request.future.done():
+                request.future.set_result(embeddings[offset : offset + count])
+            offset += count
+
+        logger.debug("embedding_server_batch", requests=len(batch), texts=len(texts))
+
+
+if __name__ == "__main__":
+    asyncio.run(EmbeddingServer().serve_forever())
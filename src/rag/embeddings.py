@@ -2,39 +2,125 @@
 Сервіс ембедінгів для семантичного пошуку.
 
 Використовує multilingual-e5-large для підтримки української мови.
+sentence-transformers (і torch) імпортуються лише при завантаженні
+моделі, щоб не сповільнювати старт API та клієнтський режим.
 """
 
-import hashlib
-from functools import lru_cache
-
-from sentence_transformers import SentenceTransformer
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from src.config import settings
+from src.rag.embedding_cache import EmbeddingCache, embedding_cache_key
+from src.rag.embedding_client import EmbeddingServerClient
+from src.utils.exceptions import RAGError
 from src.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
 logger = get_logger(__name__)
 
 
+def onnx_file_name(quantization: str | None = None) -> str:
+    """Шлях до int8 ONNX файлу всередині експортованої директорії."""
+    return f"onnx/model_qint8_{quantization or settings.embedding_onnx_quantization}.onnx"
+
+
+def _load_torch(model_name: str) -> "SentenceTransformer":
+    """fp32 модель через PyTorch."""
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+
+def _load_onnx(model_name: str) -> "SentenceTransformer":
+    """
+    int8-квантизована модель через ONNX Runtime.
+
+    Модель попередньо експортується командою
+    ``python scripts/export_onnx_embeddings.py``.
+
+    Raises:
+        RAGError: Якщо експортовану модель не знайдено.
+    """
+    model_dir = Path(settings.embedding_onnx_dir)
+    file_name = onnx_file_name()
+    if not (model_dir / file_name).exists():
+        raise RAGError(
+            f"ONNX модель {model_dir / file_name} не знайдена для {model_name}. "
+            "Запустіть: python scripts/export_onnx_embeddings.py"
+        )
+
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(
+        str(model_dir),
+        backend="onnx",
+        model_kwargs={"file_name": file_name},
+    )
+
+
+# Бекенди завантаження моделі (settings.embedding_backend)
+EMBEDDING_BACKENDS: dict[str, Callable[[str], "SentenceTransformer"]] = {
+    "torch": _load_torch,
+    "onnx": _load_onnx,
+}
+
+
 class EmbeddingService:
     """
     Сервіс для створення векторних представлень тексту.
 
-    Використовує in-memory кешування для оптимізації.
+    Ембедінги кешуються за хешем тексту (``EmbeddingCache``), спільно
+    для ``embed`` та ``embed_batch``. Якщо задано ``server_socket``,
+    сервіс працює в клієнтському режимі: модель не завантажується,
+    а ембедінги рахує спільний сервер (``src.rag.embedding_server``).
     """
 
-    def __init__(self, model_name: str | None = None) -> None:
+    def __init__(
+        self,
+        model_name: str | None = None,
+        cache: EmbeddingCache | None = None,
+        backend: str | None = None,
+        server_socket: str | None = None,
+    ) -> None:
         self.model_name = model_name or settings.embedding_model
-        self._model: SentenceTransformer | None = None
+        self.backend = backend or settings.embedding_backend
+        if self.backend not in EMBEDDING_BACKENDS:
+            raise RAGError(
+                f"Невідомий бекенд ембедінгів '{self.backend}', "
+                f"доступні: {', '.join(EMBEDDING_BACKENDS)}"
+            )
+        self._model: "SentenceTransformer | None" = None
+        if cache is None and settings.embedding_cache_enabled:
+            # int8 вектори відрізняються від fp32 — окремий простір кешу
+            cache = EmbeddingCache(f"{self.model_name}@{self.backend}")
+        self.cache = cache
+
+        socket_path = settings.embedding_server_socket if server_socket is None else server_socket
+        self.server = EmbeddingServerClient(socket_path) if socket_path else None
 
     @property
-    def model(self) -> SentenceTransformer:
+    def model(self) -> "SentenceTransformer":
         """Ліниве завантаження моделі ембедінгів."""
         if self._model is None:
-            logger.info("loading_embedding_model", model=self.model_name)
-            self._model = SentenceTransformer(self.model_name)
-            logger.info("embedding_model_loaded", model=self.model_name)
+            logger.info("loading_embedding_model", model=self.model_name, backend=self.backend)
+            self._model = EMBEDDING_BACKENDS[self.backend](self.model_name)
+            logger.info("embedding_model_loaded", model=self.model_name, backend=self.backend)
         return self._model
 
+    def warm_up(self) -> None:
+        """
+        Завантаження моделі та пробний encode в обхід кешу.
+
+        У клієнтському режимі перевіряє доступність сервера ембедінгів.
+        """
+        if self.server is not None:
+            self.server.dimension()
+            return
+        self.model.encode(["query: прогрів моделі"], show_progress_bar=False)
+
     def embed(self, text: str) -> list[float]:
         """
         Створення ембедінгу для тексту.
@@ -45,8 +131,7 @@ class EmbeddingService:
         Returns:
             Вектор ембедінгу як список float.
         """
-        cache_key = self._cache_key(text)
-        return self._embed_cached(cache_key, text)
+        return self._embed_cached([text])[0]
 
     def embed_batch(self, texts: list[str]) -> list[list[float]]:
         """
@@ -58,30 +143,46 @@ class EmbeddingService:
         Returns:
             Список векторів ембедінгів.
         """
-        embeddings = self.model.encode(texts, show_progress_bar=False)
+        embeddings = self._embed_cached(texts)
         logger.info("batch_embedding_complete", count=len(texts))
-        return [emb.tolist() for emb in embeddings]
+        return embeddings
 
-    @lru_cache(maxsize=1000)
-    def _embed_cached(self, cache_key: str, text: str) -> list[float]:
+    def _embed_cached(self, texts: list[str]) -> list[list[float]]:
         """
-        Кешована генерація ембедінгу.
+        Кешована генерація ембедінгів.
+
+        Модель викликається лише для унікальних текстів, яких немає в кеші.
 
         Args:
-            cache_key: Ключ кешу (MD5 хеш тексту).
-            text: Вхідний текст.
+            texts: Список текстів.
 
         Returns:
-            Вектор ембедінгу.
+            Вектори ембедінгів у порядку ``texts``.
         """
-        return self.model.encode(text, show_progress_bar=False).tolist()
+        if self.cache is None:
+            return self._encode(texts)
+
+        keys = [embedding_cache_key(text) for text in texts]
+        cached = self.cache.get_many(keys)
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in cached}
+        if missing:
+            computed = dict(zip(missing, self._encode(list(missing.values()))))
+            self.cache.set_many(computed)
+            cached.update(computed)
 
-    @staticmethod
-    def _cache_key(text: str) -> str:
-        """Генерація ключа кешу з тексту."""
-        return hashlib.md5(text.encode()).hexdigest()[:16]
+        return [cached[key] for key in keys]
+
+    def _encode(self, texts: list[str]) -> list[list[float]]:
+        """Прямий прохід моделі (або запит до сервера ембедінгів)."""
+        if self.server is not None:
+            return self.server.embed_batch(texts)
+        embeddings = self.model.encode(texts, show_progress_bar=False)
+        return [emb.tolist() for emb in embeddings]
 
     @property
     def embedding_dimension(self) -> int:
         """Розмірність вектора ембедінгів."""
+        if self.server is not None:
+            return self.server.dimension()
         return self.model.get_sentence_embedding_dimension()
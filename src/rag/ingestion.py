@@ -1,24 +1,345 @@
 """
 Пайплайн інгестії документів: DOCX → чанки → Qdrant.
 
-Обробляє зразки ТЗ для побудови бази знань RAG.
+Обробляє зразки ТЗ для побудови бази знань RAG. Інгестія ідемпотентна
+та інкрементальна: ID точок детерміновані (хеш файлу + номер чанка),
+незмінені файли пропускаються за маніфестом, а чанки попередньої
+версії зміненого файлу видаляються.
+
+``ingest_directory`` працює конвеєром: DOCX парсяться та чанкуються
+у пулі процесів, ембедінги рахуються великими пакетами з чанків
+кількох файлів, а upsert до Qdrant іде пакетами з ``wait=False``
+та обмеженою кількістю запитів у польоті.
+
+Обробка потокова: абзаци DOCX читаються через iterparse, чанкер
+віддає чанки по мірі надходження абзаців, а ембедінги рахуються
+мікропакетами — пам'ять не залежить від розміру документа.
 """
 
+import hashlib
+import json
+import os
+import time
+import uuid
+import zipfile
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
-
-from docx import Document
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, PointStruct, VectorParams
+from typing import TYPE_CHECKING, Any, Protocol
+from xml.etree import ElementTree
 
 from src.config import settings
-from src.rag.chunker import DocumentChunker
+from src.rag.chunker import DocumentChunker, TextChunk
+from src.rag.collection import (
+    SPARSE_VECTOR,
+    bump_collection_version,
+    create_collection,
+    ensure_payload_indexes,
+    has_sparse_vectors,
+)
 from src.rag.embeddings import EmbeddingService
+from src.rag.lexical import sparse_document
 from src.utils.exceptions import RAGError
 from src.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from qdrant_client import QdrantClient
+    from qdrant_client.models import PointStruct
+
+    from src.rag.vector_index import VectorIndex
+
 logger = get_logger(__name__)
 
+# Простір імен для uuid5 ID точок
+POINT_ID_NAMESPACE = uuid.UUID("6f1c1b1e-3c57-4f0e-9a8f-2d0b5c7e4a10")
+
+# Простір імен WordprocessingML
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# Елементи run, що дають текст (як Run.text у python-docx)
+RUN_TEXT: dict[str, Callable[[ElementTree.Element], str]] = {
+    f"{W_NS}t": lambda elem: elem.text or "",
+    f"{W_NS}tab": lambda elem: "\t",
+    f"{W_NS}ptab": lambda elem: "\t",
+    f"{W_NS}cr": lambda elem: "\n",
+    f"{W_NS}noBreakHyphen": lambda elem: "-",
+    f"{W_NS}br": lambda elem: (
+        "\n" if elem.get(f"{W_NS}type", "textWrapping") == "textWrapping" else ""
+    ),
+}
+
+
+def file_hash(file_path: Path) -> str:
+    """SHA-256 вмісту файлу."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def point_id(content_hash: str, chunk_index: int) -> str:
+    """Детермінований UUID точки з хешу файлу та номера чанка в документі."""
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{content_hash}:{chunk_index}"))
+
+
+def iter_docx_paragraphs(file_path: Path) -> Iterator[str]:
+    """
+    Потокове читання непорожніх абзаців DOCX.
+
+    ``word/document.xml`` розбирається через ``iterparse`` з очищенням
+    оброблених елементів, тож пам'ять не залежить від розміру документу.
+    Як і ``python-docx`` ``Document.paragraphs``, віддаються лише абзаци
+    верхнього рівня тіла (без таблиць та текстових блоків).
+
+    Args:
+        file_path: Шлях до DOCX файлу.
+
+    Yields:
+        Текст абзацу.
+
+    Raises:
+        RAGError: Якщо файл не знайдено або пошкоджено.
+    """
+    body, paragraph, run, hyperlink = (f"{W_NS}{tag}" for tag in ("body", "p", "r", "hyperlink"))
+    stack: list[str] = []
+    parts: list[str] = []
+    paragraphs = chars = 0
+
+    try:
+        with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as xml:
+            for event, elem in ElementTree.iterparse(xml, events=("start", "end")):
+                if event == "start":
+                    stack.append(elem.tag)
+                    continue
+                stack.pop()
+
+                if elem.tag == paragraph and stack[-1:] == [body]:
+                    text = "".join(parts)
+                    parts = []
+                    # Звільнення вже оброблених елементів тіла
+                    elem.clear()
+                    if text.strip():
+                        paragraphs += 1
+                        chars += len(text)
+                        yield text
+                elif elem.tag in RUN_TEXT and stack[-1:] == [run]:
+                    # Run абзацу тіла (безпосередньо або всередині гіперпосилання)
+                    in_body_paragraph = (
+                        stack[-3:-1] == [body, paragraph]
+                        or stack[-4:-1] == [body, paragraph, hyperlink]
+                    )
+                    if in_body_paragraph:
+                        parts.append(RUN_TEXT[elem.tag](elem))
+                elif len(stack) == 2 and stack[-1] == body:
+                    elem.clear()
+    except (OSError, KeyError, zipfile.BadZipFile, ElementTree.ParseError) as e:
+        raise RAGError(f"Помилка читання DOCX {file_path}: {e}") from e
+
+    logger.info("docx_read", file=file_path.name, paragraphs=paragraphs, chars=chars)
+
+
+def read_docx_text(file_path: Path) -> str:
+    """
+    Читання тексту з DOCX файлу.
+
+    Args:
+        file_path: Шлях до DOCX файлу.
+
+    Returns:
+        Повний текст документу.
+
+    Raises:
+        RAGError: Якщо файл не знайдено або пошкоджено.
+    """
+    return "\n".join(iter_docx_paragraphs(file_path))
+
+
+def iter_file_chunks(file_path: Path, chunker: DocumentChunker) -> Iterator[TextChunk]:
+    """
+    Потік чанків DOCX файлу: абзаци → секції → чанки.
+
+    Args:
+        file_path: Шлях до DOCX файлу.
+        chunker: Чанкер (серіалізується в процес пулу; токенізатор
+            завантажується в процесі один раз).
+
+    Yields:
+        Чанки документу.
+    """
+    yield from chunker.iter_chunks(iter_docx_paragraphs(file_path), source_file=file_path.name)
+
+
+def parse_and_chunk(file_path: Path, chunker: DocumentChunker) -> list[TextChunk]:
+    """
+    Читання та розбиття DOCX на чанки (виконується у процесі пулу).
+
+    Args:
+        file_path: Шлях до DOCX файлу.
+        chunker: Чанкер.
+
+    Returns:
+        Список чанків документу.
+    """
+    return list(iter_file_chunks(file_path, chunker))
+
+
+def _future_chunks(future: Future[list[TextChunk]]) -> Iterator[TextChunk]:
+    """Чанки з результату пулу; помилка читання виникає при ітерації."""
+    yield from future.result()
+
+
+@dataclass
+class IngestionStats:
+    """Статистика останнього запуску ``ingest_directory``."""
+
+    files_ingested: int = 0
+    files_skipped: int = 0
+    files_failed: int = 0
+    chunks: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def docs_per_second(self) -> float:
+        """Пропускна здатність за проіндексованими файлами."""
+        return self.files_ingested / self.elapsed_s if self.elapsed_s else 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        """Пропускна здатність за чанками."""
+        return self.chunks / self.elapsed_s if self.elapsed_s else 0.0
+
+
+class _Upserter(Protocol):
+    """Приймач точок інгестії (Qdrant або вбудований індекс)."""
+
+    requests: int
+
+    def add(self, points: list["PointStruct"]) -> None:
+        """Додавання точок."""
+
+    def close(self) -> None:
+        """Завершення запису всіх доданих точок."""
+
+
+class _BatchUpserter:
+    """
+    Upsert точок у Qdrant пакетами фіксованого розміру.
+
+    Запити йдуть з ``wait=False`` у пулі потоків; кількість запитів
+    у польоті обмежена — при досягненні ліміту чекаємо найстаріший.
+    """
+
+    def __init__(
+        self,
+        client: "QdrantClient",
+        collection_name: str,
+        batch_size: int,
+        max_in_flight: int,
+    ) -> None:
+        self.client = client
+        self.collection_name = collection_name
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight)
+        self._in_flight: deque[Future[Any]] = deque()
+        self._buffer: list["PointStruct"] = []
+        self.requests = 0
+
+    def add(self, points: list["PointStruct"]) -> None:
+        """Додавання точок; повні пакети надсилаються одразу."""
+        self._buffer.extend(points)
+        while len(self._buffer) >= self.batch_size:
+            self._send(self._buffer[: self.batch_size])
+            del self._buffer[: self.batch_size]
+
+    def close(self) -> None:
+        """Надсилання залишку та очікування всіх запитів."""
+        try:
+            if self._buffer:
+                self._send(self._buffer)
+                self._buffer = []
+            while self._in_flight:
+                self._in_flight.popleft().result()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def _send(self, points: list["PointStruct"]) -> None:
+        """Надсилання пакета з обмеженням запитів у польоті."""
+        if len(self._in_flight) >= self.max_in_flight:
+            self._in_flight.popleft().result()
+        self._in_flight.append(
+            self._executor.submit(
+                self.client.upsert,
+                collection_name=self.collection_name,
+                points=list(points),
+                wait=False,
+            )
+        )
+        self.requests += 1
+
+
+class _IndexUpserter:
+    """Запис точок у вбудований VectorIndex (інтерфейс ``_Upserter``)."""
+
+    def __init__(self, index: "VectorIndex") -> None:
+        self.index = index
+        self.requests = 0
+
+    def add(self, points: list["PointStruct"]) -> None:
+        """Додавання точок в індекс у пам'яті (на диск — після інгестії)."""
+        self.index.upsert(points)
+        self.requests += 1
+
+    def close(self) -> None:
+        """Нічого не очікує — запис синхронний."""
+
+
+class IngestionManifest:
+    """
+    Маніфест проіндексованих файлів: {колекція: {файл: {hash, chunks}}}.
+
+    Зберігається JSON файлом з атомарним записом.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = Path(path or settings.ingestion_manifest_path)
+        self._data: dict[str, dict[str, dict[str, Any]]] = {}
+        if self.path.exists():
+            self._data = json.loads(self.path.read_text(encoding="utf-8"))
+
+    def get(self, collection: str, file_name: str) -> dict[str, Any] | None:
+        """Запис про файл або None."""
+        return self._data.get(collection, {}).get(file_name)
+
+    def set(self, collection: str, file_name: str, content_hash: str, chunks: int) -> None:
+        """Оновлення запису про файл та збереження маніфесту."""
+        self._data.setdefault(collection, {})[file_name] = {
+            "hash": content_hash,
+            "chunks": chunks,
+        }
+        self.save()
+
+    def reset(self, collection: str) -> None:
+        """Очищення записів колекції (колекцію створено заново)."""
+        if self._data.pop(collection, None) is not None:
+            self.save()
+
+    def save(self) -> None:
+        """Атомарний запис маніфесту на диск."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._data, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
 
 class DocumentIngestionPipeline:
     """
@@ -37,35 +358,73 @@ class DocumentIngestionPipeline:
         chunker: DocumentChunker | None = None,
         qdrant_url: str | None = None,
         collection_name: str | None = None,
+        qdrant_client: "QdrantClient | None" = None,
+        manifest: IngestionManifest | None = None,
+        vector_index: "VectorIndex | None" = None,
     ) -> None:
         self.embedding_service = embedding_service or EmbeddingService()
-        self.chunker = chunker or DocumentChunker()
+        self.chunker = chunker or DocumentChunker.from_settings()
         self.qdrant_url = qdrant_url or settings.qdrant_url
         self.collection_name = collection_name or settings.qdrant_collection
-        self.qdrant_client = QdrantClient(url=self.qdrant_url)
+        # RAG_BACKEND=numpy: запис у вбудований індекс замість Qdrant
+        if vector_index is None and qdrant_client is None and settings.rag_backend == "numpy":
+            from src.rag.vector_index import VectorIndex
+
+            vector_index = VectorIndex.load()
+        self.vector_index = vector_index
+        if qdrant_client is None and vector_index is None:
+            from qdrant_client import QdrantClient
+
+            qdrant_client = QdrantClient(url=self.qdrant_url)
+        self.qdrant_client = qdrant_client
+        self.manifest = manifest or IngestionManifest()
+        self.stats = IngestionStats()
+        self._collection_ready = False
+        # Чи зберігати sparse-вектори BM25 (колекція до гібридного пошуку їх не має)
+        self._sparse_enabled = True
+
+    @property
+    def _qdrant(self) -> "QdrantClient":
+        """Клієнт Qdrant (шляхи без вбудованого індексу)."""
+        assert self.qdrant_client is not None
+        return self.qdrant_client
 
     def ensure_collection(self) -> None:
         """
         Створення колекції у Qdrant якщо не існує.
 
-        Налаштовує векторні параметри під multilingual-e5-large.
+        Нова колекція створюється з налаштуваннями QDRANT_* та payload
+        індексами, а її записи маніфесту скидаються, щоб файли
+        проіндексувались заново. Існуючій колекції додаються відсутні
+        payload індекси; якщо вона створена без sparse-вектора BM25, точки
+        пишуться лише зі щільним вектором (гібридний пошук потребує
+        перестворення колекції). Перевірка виконується один раз на пайплайн.
+        Для вбудованого індексу маніфест скидається, якщо індекс ще не
+        збережено на диск.
         """
-        collections = self.qdrant_client.get_collections().collections
-        existing_names = [c.name for c in collections]
-
-        if self.collection_name not in existing_names:
-            self.qdrant_client.create_collection(
-                collection_name=self.collection_name,
-                vectors_config=VectorParams(
-                    size=self.embedding_service.embedding_dimension,
-                    distance=Distance.COSINE,
-                ),
-            )
-            logger.info(
-                "qdrant_collection_created",
-                collection=self.collection_name,
-                dimension=self.embedding_service.embedding_dimension,
+        if self._collection_ready:
+            return
+
+        if self.vector_index is not None:
+            if not self.vector_index.exists():
+                self.manifest.reset(self.collection_name)
+            self._collection_ready = True
+            return
+
+        if not self._qdrant.collection_exists(self.collection_name):
+            create_collection(
+                self._qdrant,
+                self.collection_name,
+                self.embedding_service.embedding_dimension,
             )
+            self.manifest.reset(self.collection_name)
+        else:
+            ensure_payload_indexes(self._qdrant, self.collection_name)
+            self._sparse_enabled = has_sparse_vectors(self._qdrant, self.collection_name)
+            if not self._sparse_enabled:
+                logger.warning("qdrant_sparse_vectors_missing", collection=self.collection_name)
+
+        self._collection_ready = True
 
     def read_docx(self, file_path: Path) -> str:
         """
@@ -80,113 +439,328 @@ class DocumentIngestionPipeline:
         Raises:
             RAGError: Якщо файл не знайдено або пошкоджено.
         """
-        try:
-            doc = Document(str(file_path))
-            paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
-            text = "\n".join(paragraphs)
-            logger.info(
-                "docx_read",
-                file=file_path.name,
-                paragraphs=len(paragraphs),
-                chars=len(text),
-            )
-            return text
-        except Exception as e:
-            raise RAGError(f"Помилка читання DOCX {file_path}: {e}") from e
+        return read_docx_text(file_path)
 
-    def ingest_file(self, file_path: Path) -> int:
+    def ingest_file(self, file_path: Path, force: bool = False) -> int:
         """
-        Інгестія одного DOCX файлу в Qdrant.
+        Потокова інгестія одного DOCX файлу в Qdrant.
+
+        Незмінений файл (той самий хеш у маніфесті) пропускається.
+        Абзаци, чанки, ембедінги та точки обробляються мікропакетами,
+        тож пам'ять обмежена розміром пакета, а не документу.
 
         Args:
             file_path: Шлях до DOCX файлу.
+            force: Проіндексувати навіть незмінений файл.
 
         Returns:
-            Кількість створених чанків.
+            Кількість чанків файлу в колекції.
+
+        Raises:
+            RAGError: Якщо файл не вдалося прочитати.
         """
         self.ensure_collection()
 
-        # 1. Читання DOCX
-        text = self.read_docx(file_path)
-
-        # 2. Розбиття на чанки
-        chunks = self.chunker.chunk_document(text, source_file=file_path.name)
-
-        if not chunks:
-            logger.warning("no_chunks_produced", file=file_path.name)
-            return 0
-
-        # 3. Генерація ембедінгів
-        texts = [chunk.text for chunk in chunks]
-        embeddings = self.embedding_service.embed_batch(texts)
-
-        # 4. Завантаження у Qdrant
-        points = []
-        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            payload: dict[str, Any] = {
-                "text": chunk.text,
-                "source_file": chunk.source_file,
-                "section_id": chunk.section_id,
-                "section_title": chunk.section_title,
-                "chunk_index": chunk.chunk_index,
-            }
-            points.append(
-                PointStruct(
-                    id=i + self._get_collection_count(),
-                    vector=embedding,
-                    payload=payload,
-                )
-            )
+        content_hash = file_hash(file_path)
+        entry = self.manifest.get(self.collection_name, file_path.name)
+        if not force and entry is not None and entry["hash"] == content_hash:
+            logger.info("file_unchanged_skipped", file=file_path.name, chunks=entry["chunks"])
+            return int(entry["chunks"])
 
-        self.qdrant_client.upsert(
-            collection_name=self.collection_name,
-            points=points,
-        )
+        chunks = iter_file_chunks(file_path, self.chunker)
+        results = self._ingest_stream([(file_path, content_hash, chunks)], raise_errors=True)
 
         logger.info(
             "file_ingested",
             file=file_path.name,
-            chunks=len(points),
+            chunks=results[file_path.name],
         )
 
-        return len(points)
+        return results[file_path.name]
 
-    def ingest_directory(self, directory: Path) -> dict[str, int]:
+    def ingest_directory(
+        self,
+        directory: Path,
+        force: bool = False,
+        workers: int | None = None,
+    ) -> dict[str, int]:
         """
-        Інгестія всіх DOCX файлів з директорії.
+        Конвеєрна інгестія всіх DOCX файлів з директорії.
+
+        Незмінені файли пропускаються; решта парситься у пулі процесів,
+        ембедінги рахуються пакетами з чанків кількох файлів, upsert
+        іде пакетами з обмеженою кількістю запитів у польоті.
+        Статистика запуску доступна в ``self.stats``.
 
         Args:
             directory: Шлях до директорії з DOCX файлами.
+            force: Проіндексувати навіть незмінені файли.
+            workers: Кількість процесів парсингу (1 — потоково без пулу).
 
         Returns:
             Словник {назва_файлу: кількість_чанків}.
         """
-        results: dict[str, int] = {}
+        start = time.perf_counter()
+        self.stats = IngestionStats()
 
         docx_files = sorted(directory.glob("*.docx"))
         logger.info("starting_ingestion", files_found=len(docx_files))
+        self.ensure_collection()
 
+        # Файли, що змінились з минулої інгестії
+        skipped: dict[str, int] = {}
+        pending: list[tuple[Path, str]] = []
         for file_path in docx_files:
-            try:
-                count = self.ingest_file(file_path)
-                results[file_path.name] = count
-            except RAGError as e:
-                logger.error("ingestion_error", file=file_path.name, error=str(e))
-                results[file_path.name] = 0
+            content_hash = file_hash(file_path)
+            entry = self.manifest.get(self.collection_name, file_path.name)
+            if not force and entry is not None and entry["hash"] == content_hash:
+                skipped[file_path.name] = entry["chunks"]
+            else:
+                pending.append((file_path, content_hash))
+
+        results = self._ingest_stream(self._parse_files(pending, workers), raise_errors=False)
+        results.update(skipped)
+
+        self.stats.files_skipped = len(skipped)
+        self.stats.elapsed_s = time.perf_counter() - start
 
-        total_chunks = sum(results.values())
         logger.info(
             "ingestion_complete",
             files_processed=len(results),
-            total_chunks=total_chunks,
+            files_skipped=self.stats.files_skipped,
+            total_chunks=sum(results.values()),
+            docs_per_s=round(self.stats.docs_per_second, 2),
+            chunks_per_s=round(self.stats.chunks_per_second, 2),
         )
 
-        return results
+        return dict(sorted(results.items()))
+
+    def _ingest_stream(
+        self,
+        files: Iterable[tuple[Path, str, Iterable[TextChunk]]],
+        raise_errors: bool,
+    ) -> dict[str, int]:
+        """
+        Потік чанків файлів → мікропакети ембедінгів → пакетний upsert.
+
+        У пам'яті одночасно не більше ``ingestion_embed_batch_size`` чанків
+        та ``ingestion_max_in_flight`` пакетів upsert. Після підтвердження
+        всіх upsert видаляються чанки попередніх версій файлів і
+        оновлюється маніфест. Файл, читання якого обірвалося посередині,
+        не лишає частини нової версії: його чанки прибираються з
+        мікропакета, а вже записані точки видаляються.
+
+        Args:
+            files: (шлях, хеш, потік чанків) для кожного файлу.
+            raise_errors: Прокидати RAGError читання (інакше файл отримує 0).
+
+        Returns:
+            Словник {назва_файлу: кількість_чанків}.
+        """
+        upserter: _Upserter
+        if self.vector_index is not None:
+            upserter = _IndexUpserter(self.vector_index)
+        else:
+            upserter = _BatchUpserter(
+                self._qdrant,
+                self.collection_name,
+                batch_size=settings.ingestion_upsert_batch_size,
+                max_in_flight=settings.ingestion_max_in_flight,
+            )
+        batch_size = settings.ingestion_embed_batch_size
+        # Мікропакет ембедінгу: (хеш файлу, номер чанка в документі, чанк)
+        buffer: list[tuple[str, int, TextChunk]] = []
+        results: dict[str, int] = {}
+        ingested: list[tuple[str, str]] = []
+        # Файли з помилкою читання після частини чанків
+        partial: list[tuple[str, str]] = []
 
-    def _get_collection_count(self) -> int:
-        """Отримання поточної кількості точок у колекції."""
         try:
-            info = self.qdrant_client.get_collection(self.collection_name)
-            return info.points_count or 0
-        except Exception:
-            return 0
+            for file_path, content_hash, chunks in files:
+                count = 0
+                try:
+                    for chunk in chunks:
+                        buffer.append((content_hash, count, chunk))
+                        count += 1
+                        if len(buffer) >= batch_size:
+                            self._embed_and_upsert(buffer, upserter)
+                            buffer = []
+                except RAGError as e:
+                    buffer = [
+                        item
+                        for item in buffer
+                        if item[0] != content_hash or item[2].source_file != file_path.name
+                    ]
+                    if count:
+                        partial.append((file_path.name, content_hash))
+                    if raise_errors:
+                        raise
+                    logger.error("ingestion_error", file=file_path.name, error=str(e))
+                    results[file_path.name] = 0
+                    self.stats.files_failed += 1
+                    continue
+
+                results[file_path.name] = count
+                if count:
+                    ingested.append((file_path.name, content_hash))
+                else:
+                    logger.warning("no_chunks_produced", file=file_path.name)
+
+            if buffer:
+                self._embed_and_upsert(buffer, upserter)
+        finally:
+            upserter.close()
+            for file_name, content_hash in partial:
+                self._delete_partial_chunks(file_name, content_hash)
+
+        # Заміна попередніх версій (після upsert — без "дірки") та маніфест
+        for file_name, content_hash in ingested:
+            self._delete_stale_chunks(file_name, content_hash)
+        # Нова версія даних інвалідує кеш пошуку RAGRetriever
+        if ingested or partial:
+            if self.vector_index is not None:
+                self.vector_index.save()
+            else:
+                bump_collection_version(self._qdrant, self.collection_name)
+        for file_name, content_hash in ingested:
+            self.manifest.set(self.collection_name, file_name, content_hash, results[file_name])
+
+        self.stats.files_ingested += len(ingested)
+        self.stats.chunks += sum(results[name] for name, _ in ingested)
+        return results
+
+    def _parse_files(
+        self,
+        files: list[tuple[Path, str]],
+        workers: int | None,
+    ) -> Iterator[tuple[Path, str, Iterable[TextChunk]]]:
+        """
+        Потоки чанків файлів.
+
+        З одним воркером файли читаються потоково в поточному процесі.
+        Інакше парсинг іде в пулі процесів з вікном ``2 × workers``
+        завдань, щоб готові, але ще не спожиті результати не накопичувались.
+
+        Yields:
+            (шлях, хеш, чанки) у порядку завершення парсингу.
+        """
+        workers = workers or settings.ingestion_workers or os.cpu_count() or 1
+
+        if workers <= 1 or len(files) <= 1:
+            for file_path, content_hash in files:
+                yield file_path, content_hash, iter_file_chunks(file_path, self.chunker)
+            return
+
+        queue = iter(files)
+        with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+            futures: dict[Future[list[TextChunk]], tuple[Path, str]] = {}
+
+            def submit_next() -> None:
+                item = next(queue, None)
+                if item is not None:
+                    futures[pool.submit(parse_and_chunk, item[0], self.chunker)] = item
+
+            for _ in range(2 * workers):
+                submit_next()
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path, content_hash = futures.pop(future)
+                    submit_next()
+                    yield file_path, content_hash, _future_chunks(future)
+
+    def _embed_and_upsert(
+        self,
+        buffer: list[tuple[str, int, TextChunk]],
+        upserter: _Upserter,
+    ) -> None:
+        """Один виклик ембедінгу на мікропакет чанків та передача в upserter."""
+        embeddings = self.embedding_service.embed_batch([chunk.text for _, _, chunk in buffer])
+        upserter.add(self._build_points(buffer, embeddings))
+
+    def _build_points(
+        self,
+        chunks: list[tuple[str, int, TextChunk]],
+        embeddings: list[list[float]],
+    ) -> list["PointStruct"]:
+        """
+        Точки Qdrant з детермінованими ID (хеш файлу + номер чанка).
+
+        Поруч зі щільним вектором (без імені) — sparse-вектор BM25 тексту.
+        """
+        from qdrant_client.models import PointStruct, SparseVector
+
+        points = []
+        for (content_hash, index, chunk), embedding in zip(chunks, embeddings):
+            payload: dict[str, Any] = {
+                "text": chunk.text,
+                "source_file": chunk.source_file,
+                "section_id": chunk.section_id,
+                "section_title": chunk.section_title,
+                "chunk_index": chunk.chunk_index,
+                "file_hash": content_hash,
+            }
+            vector: Any = embedding
+            if self._sparse_enabled:
+                indices, values = sparse_document(chunk.text)
+                sparse = SparseVector(indices=indices, values=values)
+                vector = {"": embedding, SPARSE_VECTOR: sparse}
+            points.append(
+                PointStruct(
+                    id=point_id(content_hash, index),
+                    vector=vector,
+                    payload=payload,
+                )
+            )
+        return points
+
+    def _delete_stale_chunks(self, file_name: str, content_hash: str) -> None:
+        """Видалення точок файлу з хешем, відмінним від поточного."""
+        if self.vector_index is not None:
+            self.vector_index.delete_stale(file_name, content_hash)
+            return
+
+        from qdrant_client.models import FieldCondition, Filter, FilterSelector, MatchValue
+
+        self._qdrant.delete(
+            collection_name=self.collection_name,
+            points_selector=FilterSelector(
+                filter=Filter(
+                    must=[FieldCondition(key="source_file", match=MatchValue(value=file_name))],
+                    must_not=[
+                        FieldCondition(key="file_hash", match=MatchValue(value=content_hash))
+                    ],
+                )
+            ),
+        )
+
+    def _delete_partial_chunks(self, file_name: str, content_hash: str) -> None:
+        """
+        Видалення точок версії файлу, читання якої обірвалося.
+
+        Якщо ця ж версія вже повністю проіндексована (примусова
+        інгестія), її точки лишаються — ID детерміновані, тож частковий
+        upsert лише перезаписав їх тими самими даними.
+        """
+        entry = self.manifest.get(self.collection_name, file_name)
+        if entry is not None and entry["hash"] == content_hash:
+            return
+        logger.warning("partial_file_chunks_deleted", file=file_name)
+        if self.vector_index is not None:
+            self.vector_index.delete_version(file_name, content_hash)
+            return
+
+        from qdrant_client.models import FieldCondition, Filter, FilterSelector, MatchValue
+
+        self._qdrant.delete(
+            collection_name=self.collection_name,
+            points_selector=FilterSelector(
+                filter=Filter(
+                    must=[
+                        FieldCondition(key="source_file", match=MatchValue(value=file_name)),
+                        FieldCondition(key="file_hash", match=MatchValue(value=content_hash)),
+                    ]
+                )
+            ),
+        )
@@ -0,0 +1,145 @@
+"""
+Лексичне (BM25) представлення тексту для гібридного пошуку.
+
+Щільні ембедінги e5 погано знаходять точні нормативні посилання
+("ДСТУ 3008:2015", "НД ТЗІ 2.5-004-99", номери законів). Чанки та
+запити додатково кодуються sparse-векторами BM25:
+- токенізація зберігає коди й номери документів цілими
+  (``2.5-004-99``, ``3008:2015``), абревіатури не стемляться;
+- решта слів проходить легкий стемер української мови (відсікання
+  флексій) та фільтр стоп-слів;
+- індекс терміна — CRC32 токена (uint32 індекс sparse-вектора Qdrant);
+- вага документа — TF-частина BM25, IDF рахує сховище
+  (``Modifier.IDF`` у Qdrant, ``VectorIndex`` для NumPy).
+"""
+
+import math
+import re
+import zlib
+from collections import Counter
+
+# Слово, код або номер: літери/цифри, з'єднані . - / : або апострофом
+TOKEN = re.compile(r"\w+(?:[.\-/:'’ʼ]\w+)*")
+APOSTROPHES = str.maketrans({"’": "'", "ʼ": "'"})
+
+# Параметри BM25; середня довжина чанка в лексичних токенах
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_AVG_DOC_LENGTH = 250
+
+# Мінімальна довжина основи після відсікання флексії
+MIN_STEM_LENGTH = 3
+
+STOP_WORDS = frozenset(
+    """
+    і й та або але а в у на з із зі до від по за для при про під над між через
+    що як це цей ця ці той ті який яка яке які його її їх він вона воно вони
+    не ні так також чи би б же ж вже ще є бути може має мають повинен повинна
+    повинні якщо коли де тому тощо інші інших всі всіх кожен кожна
+    """.split()
+)
+
+# Флексії української мови (довші перевіряються першими)
+SUFFIXES = tuple(
+    sorted(
+        """
+        ування ювання ання яння ення іння ість ості істю
+        ськими цькими ського цького ському цькому ській цькій ських цьких
+        ський цький ська цька ське цьке ські цькі
+        ими іми ого ому ій ий ої ою ую юю ім их іх ем єм ами ями ах ях
+        ові еві єві ом ів їв ей ям ам ати яти ити іти ють ують юють ать ять
+        ить іть ив ила ило или ла ло ли
+        а я о е є и і ї у ю ь
+        """.split(),
+        key=len,
+        reverse=True,
+    )
+)
+REFLEXIVE = ("ся", "сь")
+
+
+def stem(word: str) -> str:
+    """
+    Легкий стемер: відсікання зворотної частки та однієї флексії.
+
+    Args:
+        word: Слово в нижньому регістрі.
+
+    Returns:
+        Основа слова (не коротша за MIN_STEM_LENGTH).
+    """
+    for particle in REFLEXIVE:
+        if word.endswith(particle) and len(word) - len(particle) > MIN_STEM_LENGTH:
+            word = word[: -len(particle)]
+            break
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            return word[: -len(suffix)]
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Лексичні токени тексту.
+
+    Args:
+        text: Текст чанка або запиту.
+
+    Returns:
+        Токени: коди/номери та абревіатури без змін (у нижньому регістрі),
+        решта слів — основи без стоп-слів.
+    """
+    tokens = []
+    for match in TOKEN.finditer(text.translate(APOSTROPHES)):
+        raw = match.group()
+        token = raw.lower()
+        if not raw.replace("'", "").isalpha():
+            # Код, номер або слово з дефісом — без стемінгу
+            if len(token) > 1:
+                tokens.append(token)
+        elif raw.isupper() and len(raw) > 1:
+            tokens.append(token)
+        elif token not in STOP_WORDS and len(token) > 1:
+            tokens.append(stem(token))
+    return tokens
+
+
+def term_id(token: str) -> int:
+    """Індекс терміна в sparse-векторі (uint32)."""
+    return zlib.crc32(token.encode())
+
+
+def sparse_document(text: str) -> tuple[list[int], list[float]]:
+    """
+    Sparse-вектор чанка: TF-частина BM25 з нормалізацією на довжину.
+
+    Args:
+        text: Текст чанка.
+
+    Returns:
+        (індекси термінів, ваги).
+    """
+    counts = Counter(term_id(token) for token in tokenize(text))
+    length = sum(counts.values())
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / BM25_AVG_DOC_LENGTH)
+    indices = sorted(counts)
+    return indices, [counts[i] * (BM25_K1 + 1) / (counts[i] + norm) for i in indices]
+
+
+def sparse_query(text: str) -> tuple[list[int], list[float]]:
+    """
+    Sparse-вектор запиту: унікальні терміни з вагою 1 (IDF додає сховище).
+
+    Args:
+        text: Пошуковий запит.
+
+    Returns:
+        (індекси термінів, ваги).
+    """
+    indices = sorted({term_id(token) for token in tokenize(text)})
+    return indices, [1.0] * len(indices)
+
+
+def bm25_idf(document_frequency: int, documents: int) -> float:
+    """IDF BM25 (формула Qdrant ``Modifier.IDF``)."""
+    return math.log(1 + (documents - document_frequency + 0.5) / (document_frequency + 0.5))
@@ -0,0 +1,145 @@
+"""
+Переранжування кандидатів пошуку cross-encoder моделлю.
+
+Щільний top-k по секції нерідко повертає чанки з іншої секції зразка
+ТЗ. Cross-encoder оцінює пару (запит, чанк) повністю, тож точніше
+відбирає контекст. Пари всіх секцій генерації оцінюються одним
+прямим проходом в окремому потоці з жорстким бюджетом часу
+(RAG_RERANK_TIMEOUT): якщо модель не встигла (або ще
+завантажується, або попередній прохід ще триває), залишається порядок
+векторного пошуку. sentence-transformers імпортується лише при
+завантаженні моделі.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from src.config import settings
+from src.utils.exceptions import RAGError
+from src.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from sentence_transformers import CrossEncoder
+
+logger = get_logger(__name__)
+
+
+class CrossEncoderReranker:
+    """Пакетне переранжування результатів пошуку з бюджетом часу."""
+
+    def __init__(
+        self,
+        model_name: str | None = None,
+        timeout: float | None = None,
+        max_length: int | None = None,
+    ) -> None:
+        self.model_name = model_name or settings.rag_rerank_model
+        self.timeout = settings.rag_rerank_timeout if timeout is None else timeout
+        self.max_length = max_length or settings.rag_rerank_max_length
+        self._model: "CrossEncoder | None" = None
+        self._load_lock = threading.Lock()
+        # Прохід моделі, що ще триває у потоці (після таймауту теж)
+        self._running = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reranker")
+
+    @property
+    def model(self) -> "CrossEncoder":
+        """
+        Ліниве завантаження cross-encoder моделі.
+
+        Raises:
+            RAGError: Якщо модель не вдалося завантажити.
+        """
+        with self._load_lock:
+            if self._model is None:
+                from sentence_transformers import CrossEncoder
+
+                logger.info("loading_reranker_model", model=self.model_name)
+                try:
+                    self._model = CrossEncoder(self.model_name, max_length=self.max_length)
+                except Exception as e:
+                    raise RAGError(
+                        f"Не вдалося завантажити модель переранжування {self.model_name}: {e}"
+                    ) from e
+                logger.info("reranker_model_loaded", model=self.model_name)
+        return self._model
+
+    def warm_up(self) -> None:
+        """Завантаження моделі та пробний прохід."""
+        self.model.predict([("прогрів", "моделі переранжування")], show_progress_bar=False)
+
+    def _score(self, pairs: list[tuple[str, str]]) -> list[float]:
+        """
+        Оцінки релевантності пар одним прямим проходом.
+
+        Args:
+            pairs: Пари (запит, текст чанка).
+
+        Returns:
+            Оцінки в порядку ``pairs`` (вища — релевантніша).
+        """
+        scores = self.model.predict(pairs, batch_size=len(pairs), show_progress_bar=False)
+        return [float(score) for score in scores]
+
+    async def rerank_batch(
+        self,
+        queries: list[str],
+        candidates: list[list[dict[str, Any]]],
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Переранжування кандидатів кількох запитів (секцій).
+
+        Args:
+            queries: Запити.
+            candidates: Результати векторного пошуку для кожного запиту.
+
+        Returns:
+            Кандидати, впорядковані за оцінкою cross-encoder (``score``,
+            початкова оцінка — у ``vector_score``), або вхідний порядок,
+            якщо бюджет часу вичерпано чи модель недоступна.
+        """
+        pairs = [
+            (query, result["text"])
+            for query, results in zip(queries, candidates)
+            for result in results
+        ]
+        if not pairs:
+            return candidates
+        if self._running.is_set():
+            logger.warning("rag_rerank_skipped_busy", pairs=len(pairs))
+            return candidates
+
+        start = time.perf_counter()
+        self._running.set()
+        job = self._executor.submit(self._score, pairs)
+        # Знімається, коли прохід завершився або скасований ще в черзі потоку
+        job.add_done_callback(lambda _: self._running.clear())
+        try:
+            scores = await asyncio.wait_for(asyncio.wrap_future(job), self.timeout)
+        except TimeoutError:
+            logger.warning("rag_rerank_timeout", pairs=len(pairs), timeout=self.timeout)
+            return candidates
+        except Exception as e:
+            logger.warning("rag_rerank_failed", pairs=len(pairs), error=str(e))
+            return candidates
+
+        reranked = []
+        position = 0
+        for results in candidates:
+            group = [
+                {**result, "score": score, "vector_score": result["score"]}
+                for result, score in zip(results, scores[position : position + len(results)])
+            ]
+            position += len(results)
+            reranked.append(sorted(group, key=lambda r: r["score"], reverse=True))
+
+        logger.info(
+            "rag_rerank_complete",
+            queries=len(queries),
+            pairs=len(pairs),
+            duration_ms=round((time.perf_counter() - start) * 1000, 1),
+        )
+        return reranked
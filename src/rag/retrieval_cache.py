@@ -0,0 +1,100 @@
+"""
+Кеш результатів пошуку RAG.
+
+Під час рев'ю проєкт перегенеровують кілька разів, і кожна генерація
+шукає ті самі запити по секціях. Кеш адресується SHA-256 від запиту,
+фільтра по секції, top_k та режиму пошуку в межах версії даних
+колекції: інгестія змінює версію (metadata колекції Qdrant або
+``VectorIndex.version``), і попередні записи більше не
+використовуються. In-memory LRU у межах процесу.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any
+
+from src.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def retrieval_cache_key(query: str, section_filter: str | None, top_k: int, mode: str) -> str:
+    """
+    Ключ кешу — SHA-256 від усіх параметрів, що впливають на результат.
+
+    Returns:
+        Hex-дайджест ключа.
+    """
+    raw = json.dumps([query, section_filter, top_k, mode], ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class RetrievalCache:
+    """LRU кеш результатів пошуку, прив'язаний до версії даних колекції."""
+
+    def __init__(self, max_items: int | None = None) -> None:
+        self.max_items = settings.rag_cache_size if max_items is None else max_items
+        self._items: OrderedDict[str, list[dict[str, Any]]] = OrderedDict()
+        self._version: str | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version: str, key: str) -> list[dict[str, Any]] | None:
+        """
+        Результати з кешу.
+
+        Args:
+            version: Поточна версія даних колекції.
+            key: Ключ ``retrieval_cache_key``.
+
+        Returns:
+            Копія результатів або None.
+        """
+        self._check_version(version)
+        results = self._items.get(key)
+        if results is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return [dict(result) for result in results]
+
+    def put(self, version: str, key: str, results: list[dict[str, Any]]) -> None:
+        """
+        Збереження результатів з витісненням найдавніших.
+
+        Args:
+            version: Версія даних, для якої виконано пошук.
+            key: Ключ ``retrieval_cache_key``.
+            results: Результати пошуку.
+        """
+        self._check_version(version)
+        if self.max_items <= 0:
+            return
+        self._items[key] = [dict(result) for result in results]
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        """Очищення кешу."""
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _check_version(self, version: str) -> None:
+        """Інвалідація всіх записів при зміні версії даних."""
+        if version == self._version:
+            return
+        if self._items:
+            logger.info(
+                "rag_cache_invalidated",
+                previous_version=self._version,
+                version=version,
+                entries=len(self._items),
+            )
+        self._items.clear()
+        self._version = version
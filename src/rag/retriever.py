@@ -1,21 +1,71 @@
 """
 Семантичний пошук по базі знань ТЗ.
 
-Використовує Qdrant для пошуку релевантних чанків.
-"""
+Використовує Qdrant (або вбудований NumPy індекс, RAG_BACKEND=numpy)
+для пошуку релевантних чанків. Усі звернення неблокуючі: AsyncQdrantClient
+для Qdrant та пул потоків для CPU-навантаженого ембедінгу та NumPy,
+щоб не зупиняти event loop uvicorn. qdrant-client та NumPy імпортуються
+при створенні retriever, а не при старті API.
+
+Гібридний режим (RAG_SEARCH_MODE=hybrid): щільний пошук та BM25 по
+sparse-векторах виконуються одним пакетним запитом, ранжування
+об'єднуються Reciprocal Rank Fusion. Якщо індекс не містить
+sparse-векторів, пошук лишається щільним.
 
-from typing import Any
+Контекст секції збирає ContextBuilder: MMR відбір, зшивання сусідніх
+чанків та бюджет RAG_CONTEXT_MAX_TOKENS. Результати пошуку кешуються
+(RetrievalCache) до зміни версії даних колекції інгестією, тож повторна
+генерація проєкту не рахує ембедінги та не шукає заново. Опційно
+(RAG_RERANK_ENABLED) кандидати всіх секцій переранжовуються
+cross-encoder моделлю одним проходом з бюджетом часу.
+"""
 
-from qdrant_client import QdrantClient
-from qdrant_client.models import Filter, FieldCondition, MatchValue
+import asyncio
+from typing import TYPE_CHECKING, Any
 
 from src.config import settings
+from src.rag.context import BuiltContext, ContextBuilder
 from src.rag.embeddings import EmbeddingService
+from src.rag.lexical import sparse_query
+from src.rag.reranker import CrossEncoderReranker
+from src.rag.retrieval_cache import RetrievalCache, retrieval_cache_key
+from src.rag.search_backend import QdrantSearchBackend, SearchBackend, create_search_backend
 from src.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from qdrant_client import AsyncQdrantClient
+
 logger = get_logger(__name__)
 
 
+def reciprocal_rank_fusion(
+    rankings: list[list[dict[str, Any]]],
+    top_k: int,
+    k: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Reciprocal Rank Fusion: сума ``1 / (k + rank)`` по ранжуваннях.
+
+    Не залежить від шкал оцінок (косинус та BM25 непорівнянні), тому
+    ваги не потрібні.
+
+    Args:
+        rankings: Результати кожного пошуку, відсортовані за релевантністю.
+        top_k: Кількість результатів після злиття.
+        k: Константа згладжування (за замовчуванням RAG_RRF_K).
+
+    Returns:
+        Результати з оцінкою RRF у полі ``score``.
+    """
+    k = settings.rag_rrf_k if k is None else k
+    fused: dict[str, dict[str, Any]] = {}
+    for ranking in rankings:
+        for rank, result in enumerate(ranking, start=1):
+            entry = fused.setdefault(result["id"], {**result, "score": 0.0})
+            entry["score"] += 1.0 / (k + rank)
+    return sorted(fused.values(), key=lambda r: r["score"], reverse=True)[:top_k]
+
+
 class RAGRetriever:
     """
     Семантичний пошук по індексованих документах ТЗ.
@@ -29,11 +79,31 @@ class RAGRetriever:
         embedding_service: EmbeddingService | None = None,
         qdrant_url: str | None = None,
         collection_name: str | None = None,
+        qdrant_client: "AsyncQdrantClient | None" = None,
+        backend: SearchBackend | None = None,
+        context_builder: ContextBuilder | None = None,
+        cache: RetrievalCache | None = None,
+        reranker: CrossEncoderReranker | None = None,
     ) -> None:
         self.embedding_service = embedding_service or EmbeddingService()
+        self.context_builder = context_builder or ContextBuilder()
+        self.cache = cache
+        if cache is None and settings.rag_cache_enabled:
+            self.cache = RetrievalCache()
+        self.reranker = reranker
+        if reranker is None and settings.rag_rerank_enabled:
+            self.reranker = CrossEncoderReranker()
         self.qdrant_url = qdrant_url or settings.qdrant_url
         self.collection_name = collection_name or settings.qdrant_collection
-        self.qdrant_client = QdrantClient(url=self.qdrant_url)
+        if backend is None:
+            if qdrant_client is not None:
+                backend = QdrantSearchBackend(qdrant_client, self.collection_name)
+            else:
+                backend = create_search_backend(
+                    collection_name=self.collection_name,
+                    qdrant_url=self.qdrant_url,
+                )
+        self.backend = backend
 
     async def search(
         self,
@@ -52,49 +122,153 @@ class RAGRetriever:
         Returns:
             Список результатів з текстом та метаданими.
         """
-        # Генерація ембедінгу для запиту
-        query_embedding = self.embedding_service.embed(query)
-
-        # Побудова фільтра
-        qdrant_filter = None
-        if section_filter:
-            qdrant_filter = Filter(
-                must=[
-                    FieldCondition(
-                        key="section_id",
-                        match=MatchValue(value=section_filter),
-                    )
-                ]
+        version = await self._cache_version()
+        key = retrieval_cache_key(query, section_filter, top_k, settings.rag_search_mode)
+        cached = None
+        if version is not None and self.cache is not None:
+            cached = self.cache.get(version, key)
+        if cached is not None:
+            logger.info(
+                "rag_search_cache_hit",
+                backend=self.backend.name,
+                results_count=len(cached),
             )
+            return cached
 
-        # Пошук у Qdrant
-        results = self.qdrant_client.search(
-            collection_name=self.collection_name,
-            query_vector=query_embedding,
-            query_filter=qdrant_filter,
-            limit=top_k,
-        )
+        # Генерація ембедінгу для запиту (у потоці — encode блокує CPU)
+        query_embedding = await asyncio.to_thread(self.embedding_service.embed, query)
 
-        # Форматування результатів
-        search_results = []
-        for point in results:
-            search_results.append({
-                "text": point.payload.get("text", ""),
-                "score": point.score,
-                "section_id": point.payload.get("section_id"),
-                "section_title": point.payload.get("section_title"),
-                "source_file": point.payload.get("source_file"),
-            })
+        hybrid = await self._hybrid_enabled()
+        if hybrid:
+            search_results = (
+                await self._search_hybrid([query], [query_embedding], [section_filter], top_k)
+            )[0]
+        else:
+            search_results = await self.backend.search(query_embedding, section_filter, top_k)
 
         logger.info(
             "rag_search_complete",
+            backend=self.backend.name,
+            hybrid=hybrid,
             query_length=len(query),
             results_count=len(search_results),
             top_score=search_results[0]["score"] if search_results else 0,
         )
 
+        if version is not None and self.cache is not None:
+            self.cache.put(version, key, search_results)
         return search_results
 
+    async def search_batch(
+        self,
+        queries: list[tuple[str, str | None]],
+        top_k: int = 5,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Пакетний семантичний пошук: один encode та один запит до бекенду.
+
+        Запити, результати яких є в кеші для поточної версії даних,
+        не ембедяться і не надсилаються до бекенду.
+
+        Args:
+            queries: Список пар (запит, фільтр по секції або None).
+            top_k: Кількість результатів на запит.
+
+        Returns:
+            Результати для кожного запиту у тому ж порядку.
+        """
+        if not queries:
+            return []
+
+        version = await self._cache_version()
+        keys = [
+            retrieval_cache_key(query, section_filter, top_k, settings.rag_search_mode)
+            for query, section_filter in queries
+        ]
+        results: list[list[dict[str, Any]] | None] = [None] * len(queries)
+        if version is not None and self.cache is not None:
+            results = [self.cache.get(version, key) for key in keys]
+        missing = [i for i, cached in enumerate(results) if cached is None]
+
+        hybrid = False
+        if missing:
+            texts = [queries[i][0] for i in missing]
+            section_filters = [queries[i][1] for i in missing]
+            embeddings = await asyncio.to_thread(self.embedding_service.embed_batch, texts)
+
+            hybrid = await self._hybrid_enabled()
+            if hybrid:
+                found = await self._search_hybrid(texts, embeddings, section_filters, top_k)
+            else:
+                found = await self.backend.search_batch(embeddings, section_filters, top_k)
+
+            for i, hits in zip(missing, found):
+                results[i] = hits
+                if version is not None and self.cache is not None:
+                    self.cache.put(version, keys[i], hits)
+
+        logger.info(
+            "rag_batch_search_complete",
+            backend=self.backend.name,
+            hybrid=hybrid,
+            queries=len(queries),
+            cache_hits=len(queries) - len(missing),
+            empty=sum(1 for r in results if not r),
+        )
+
+        return [r or [] for r in results]
+
+    async def search_for_sections(
+        self,
+        section_ids: list[str],
+        project_description: str,
+        top_k: int = 3,
+    ) -> dict[str, str]:
+        """
+        Пошук контексту для кількох секцій ТЗ за один-два запити.
+
+        Спочатку пакетний пошук з фільтром по кожній секції; пошук без
+        фільтра виконується лише для секцій з порожнім результатом.
+        Кандидати всіх секцій переранжовуються одним проходом (якщо
+        увімкнено), контекст кожної секції збирає ContextBuilder.
+
+        Args:
+            section_ids: Номери секцій КМУ №205.
+            project_description: Опис проєкту для контексту.
+            top_k: Максимальна кількість чанків на секцію.
+
+        Returns:
+            Словник {section_id: контекст секції}.
+        """
+        queries = {sid: self._section_query(sid, project_description) for sid in section_ids}
+        candidates = self._candidates(top_k)
+
+        filtered = await self.search_batch(
+            [(queries[sid], sid) for sid in section_ids],
+            top_k=candidates,
+        )
+        results = dict(zip(section_ids, filtered))
+
+        # Fallback без фільтра лише для порожніх секцій
+        empty = [sid for sid in section_ids if not results[sid]]
+        if empty:
+            unfiltered = await self.search_batch(
+                [(queries[sid], None) for sid in empty],
+                top_k=candidates,
+            )
+            results.update(zip(empty, unfiltered))
+
+        if self.reranker is not None:
+            reranked = await self.reranker.rerank_batch(
+                [queries[sid] for sid in section_ids],
+                [results[sid] for sid in section_ids],
+            )
+            results = dict(zip(section_ids, reranked))
+
+        contexts = {sid: self.context_builder.build(results[sid], top_k) for sid in section_ids}
+        self._log_contexts(contexts)
+        return {sid: context.text for sid, context in contexts.items()}
+
     async def search_for_section(
         self,
         section_id: str,
@@ -107,30 +281,146 @@ class RAGRetriever:
         Args:
             section_id: Номер секції КМУ №205 (напр. "2").
             project_description: Опис проєкту для контексту.
-            top_k: Кількість результатів.
+            top_k: Максимальна кількість чанків.
 
         Returns:
-            Об'єднаний текст релевантних чанків.
+            Контекст секції.
         """
-        query = f"Секція {section_id} технічного завдання: {project_description}"
+        query = self._section_query(section_id, project_description)
+        candidates = self._candidates(top_k)
 
         results = await self.search(
             query=query,
-            top_k=top_k,
+            top_k=candidates,
             section_filter=section_id,
         )
 
         # Якщо фільтр по секції не дав результатів — шукаємо без фільтра
         if not results:
-            results = await self.search(query=query, top_k=top_k)
+            results = await self.search(query=query, top_k=candidates)
+
+        if self.reranker is not None:
+            results = (await self.reranker.rerank_batch([query], [results]))[0]
+
+        context = self.context_builder.build(results, top_k)
+        self._log_contexts({section_id: context})
+        return context.text
+
+    def _candidates(self, top_k: int) -> int:
+        """Кількість кандидатів пошуку для відбору контексту (та переранжування)."""
+        candidates = max(top_k, settings.rag_context_candidates)
+        if self.reranker is not None:
+            candidates = max(candidates, settings.rag_rerank_candidates)
+        return candidates
+
+    async def _cache_version(self) -> str | None:
+        """Версія даних для ключа кешу (None — кеш вимкнено або версії ще немає)."""
+        if self.cache is None:
+            return None
+        return await self.backend.data_version()
+
+    async def _hybrid_enabled(self) -> bool:
+        """Гібридний режим увімкнено і бекенд має sparse-вектори BM25."""
+        return settings.rag_search_mode == "hybrid" and await self.backend.supports_sparse()
+
+    async def _search_hybrid(
+        self,
+        texts: list[str],
+        embeddings: list[list[float]],
+        section_filters: list[str | None],
+        top_k: int,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Щільні та BM25 кандидати одним запитом і злиття RRF.
+
+        Args:
+            texts: Тексти запитів (для sparse-векторів).
+            embeddings: Ембедінги запитів.
+            section_filters: Фільтр по секції для кожного запиту (або None).
+            top_k: Кількість результатів на запит після злиття.
+
+        Returns:
+            Результати для кожного запиту у тому ж порядку.
+        """
+        candidates = max(top_k, settings.rag_hybrid_candidates)
+        dense, lexical = await self.backend.search_hybrid_batch(
+            embeddings,
+            [sparse_query(text) for text in texts],
+            section_filters,
+            candidates,
+        )
+        return [
+            reciprocal_rank_fusion([dense_hits, lexical_hits], top_k)
+            for dense_hits, lexical_hits in zip(dense, lexical)
+        ]
+
+    @staticmethod
+    def _section_query(section_id: str, project_description: str) -> str:
+        """Пошуковий запит для секції ТЗ."""
+        return f"Секція {section_id} технічного завдання: {project_description}"
+
+    @staticmethod
+    def _log_contexts(contexts: dict[str, BuiltContext]) -> None:
+        """Розмір зібраного контексту та економія токенів."""
+        logger.info(
+            "rag_contexts_built",
+            sections=len(contexts),
+            chunks=sum(c.chunks for c in contexts.values()),
+            context_tokens=sum(c.tokens for c in contexts.values()),
+            tokens_saved=sum(c.tokens_saved for c in contexts.values()),
+        )
 
-        context_texts = [r["text"] for r in results]
-        return "\n\n---\n\n".join(context_texts)
+    async def warm_up(self) -> None:
+        """
+        Прогрів перед першим запитом: модель ембедінгів, бекенд пошуку та
+        модель переранжування (якщо увімкнено).
+
+        Raises:
+            Exception: Якщо модель не завантажилась або бекенд недоступний.
+        """
+        await asyncio.to_thread(self.embedding_service.warm_up)
+        await self.backend.warm_up()
+        if self.reranker is not None:
+            await asyncio.to_thread(self.reranker.warm_up)
+        logger.info(
+            "rag_retriever_warmed_up",
+            backend=self.backend.name,
+            collection=self.collection_name,
+        )
 
     async def health_check(self) -> bool:
-        """Перевірка доступності Qdrant."""
-        try:
-            self.qdrant_client.get_collections()
-            return True
-        except Exception:
-            return False
+        """Перевірка доступності бекенду пошуку."""
+        return await self.backend.health_check()
+
+    async def close(self) -> None:
+        """Закриття з'єднань бекенду пошуку."""
+        await self.backend.close()
+
+
+_shared_retriever: RAGRetriever | None = None
+
+
+def get_shared_retriever() -> RAGRetriever:
+    """
+    Отримання спільного для процесу RAGRetriever.
+
+    Одна модель ембедінгів та один пул з'єднань з Qdrant на процес,
+    щоб прогрів при старті діяв для всіх генерацій.
+
+    Returns:
+        Екземпляр RAGRetriever.
+    """
+    global _shared_retriever
+    if _shared_retriever is None:
+        _shared_retriever = RAGRetriever()
+        logger.info("rag_retriever_created")
+    return _shared_retriever
+
+
+async def close_shared_retriever() -> None:
+    """Закриття спільного RAGRetriever."""
+    global _shared_retriever
+    if _shared_retriever is not None:
+        await _shared_retriever.close()
+        _shared_retriever = None
+        logger.info("rag_retriever_closed")
@@ -0,0 +1,423 @@
+"""
+Бекенди векторного пошуку для RAGRetriever.
+
+- ``qdrant`` — AsyncQdrantClient (основне розгортання);
+- ``numpy`` — вбудований ``VectorIndex`` без окремого сервісу
+  (невеликі розгортання та тести).
+
+Бекенд отримує готові ембедінги (та sparse-вектори BM25 для
+гібридного режиму) запитів і повертає результати у форматі
+RAGRetriever: id, text, score, section_id, section_title, source_file,
+chunk_index.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any
+
+from src.config import settings
+from src.rag.collection import SPARSE_VECTOR, VERSION_KEY, search_params
+from src.utils.exceptions import RAGError
+from src.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from qdrant_client import AsyncQdrantClient
+    from qdrant_client.models import Filter
+
+    from src.rag.vector_index import VectorIndex
+
+logger = get_logger(__name__)
+
+
+# Sparse-вектор запиту: (індекси термінів, ваги)
+SparseQuery = tuple[list[int], list[float]]
+
+
+def format_result(point_id: Any, score: float, payload: dict[str, Any] | None) -> dict[str, Any]:
+    """Результат пошуку з payload чанка."""
+    payload = payload or {}
+    return {
+        "id": str(point_id),
+        "text": payload.get("text", ""),
+        "score": score,
+        "section_id": payload.get("section_id"),
+        "section_title": payload.get("section_title"),
+        "source_file": payload.get("source_file"),
+        "chunk_index": payload.get("chunk_index"),
+    }
+
+
+class SearchBackend(ABC):
+    """Базовий бекенд векторного пошуку."""
+
+    name: str = "base"
+
+    @abstractmethod
+    async def search_batch(
+        self,
+        embeddings: list[list[float]],
+        section_filters: list[str | None],
+        top_k: int,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Пакетний пошук за ембедінгами.
+
+        Args:
+            embeddings: Ембедінги запитів.
+            section_filters: Фільтр по секції для кожного запиту (або None).
+            top_k: Кількість результатів на запит.
+
+        Returns:
+            Результати для кожного запиту у тому ж порядку.
+        """
+
+    async def search(
+        self,
+        embedding: list[float],
+        section_filter: str | None,
+        top_k: int,
+    ) -> list[dict[str, Any]]:
+        """Пошук для одного ембедінгу."""
+        return (await self.search_batch([embedding], [section_filter], top_k))[0]
+
+    @abstractmethod
+    async def search_sparse_batch(
+        self,
+        sparse_queries: list[SparseQuery],
+        section_filters: list[str | None],
+        top_k: int,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Пакетний лексичний (BM25) пошук.
+
+        Args:
+            sparse_queries: Sparse-вектори запитів.
+            section_filters: Фільтр по секції для кожного запиту (або None).
+            top_k: Кількість результатів на запит.
+
+        Returns:
+            Результати для кожного запиту у тому ж порядку.
+        """
+
+    async def search_hybrid_batch(
+        self,
+        embeddings: list[list[float]],
+        sparse_queries: list[SparseQuery],
+        section_filters: list[str | None],
+        top_k: int,
+    ) -> tuple[list[list[dict[str, Any]]], list[list[dict[str, Any]]]]:
+        """
+        Щільні та лексичні кандидати для пакета запитів.
+
+        Returns:
+            (щільні результати, BM25 результати) для кожного запиту.
+        """
+        return await asyncio.gather(
+            self.search_batch(embeddings, section_filters, top_k),
+            self.search_sparse_batch(sparse_queries, section_filters, top_k),
+        )
+
+    @abstractmethod
+    async def supports_sparse(self) -> bool:
+        """Чи проіндексовано sparse-вектори BM25."""
+
+    @abstractmethod
+    async def data_version(self) -> str | None:
+        """Версія даних (змінюється інгестією; None — ще не встановлена)."""
+
+    @abstractmethod
+    async def health_check(self) -> bool:
+        """Перевірка доступності сховища."""
+
+    async def warm_up(self) -> None:
+        """
+        Підготовка сховища до першого запиту.
+
+        Raises:
+            RAGError: Якщо сховище недоступне.
+        """
+        if not await self.health_check():
+            raise RAGError(f"Бекенд пошуку {self.name} недоступний")
+
+    async def close(self) -> None:
+        """Звільнення ресурсів."""
+
+
+class QdrantSearchBackend(SearchBackend):
+    """Пошук у колекції Qdrant."""
+
+    name = "qdrant"
+
+    def __init__(
+        self,
+        qdrant_client: "AsyncQdrantClient | None" = None,
+        collection_name: str | None = None,
+        qdrant_url: str | None = None,
+    ) -> None:
+        self.collection_name = collection_name or settings.qdrant_collection
+        if qdrant_client is None:
+            from qdrant_client import AsyncQdrantClient
+
+            qdrant_client = AsyncQdrantClient(url=qdrant_url or settings.qdrant_url)
+        self.qdrant_client = qdrant_client
+        self.search_params = search_params()
+        self._sparse: bool | None = None
+
+    async def search(
+        self,
+        embedding: list[float],
+        section_filter: str | None,
+        top_k: int,
+    ) -> list[dict[str, Any]]:
+        """Один запит ``query_points``."""
+        response = await self.qdrant_client.query_points(
+            collection_name=self.collection_name,
+            query=embedding,
+            query_filter=self._section_filter(section_filter),
+            search_params=self.search_params,
+            limit=top_k,
+            with_payload=True,
+        )
+        return [format_result(point.id, point.score, point.payload) for point in response.points]
+
+    async def search_batch(
+        self,
+        embeddings: list[list[float]],
+        section_filters: list[str | None],
+        top_k: int,
+    ) -> list[list[dict[str, Any]]]:
+        """Один запит ``query_batch_points`` для всього пакета."""
+        return await self._query_batch(self._dense_requests(embeddings, section_filters, top_k))
+
+    async def search_sparse_batch(
+        self,
+        sparse_queries: list[SparseQuery],
+        section_filters: list[str | None],
+        top_k: int,
+    ) -> list[list[dict[str, Any]]]:
+        """Запити до іменованого sparse-вектора BM25 (IDF рахує Qdrant)."""
+        requests = self._sparse_requests(sparse_queries, section_filters, top_k)
+        results = iter(await self._query_batch([r for r in requests if r is not None]))
+        return [next(results) if r is not None else [] for r in requests]
+
+    async def search_hybrid_batch(
+        self,
+        embeddings: list[list[float]],
+        sparse_queries: list[SparseQuery],
+        section_filters: list[str | None],
+        top_k: int,
+    ) -> tuple[list[list[dict[str, Any]]], list[list[dict[str, Any]]]]:
+        """Щільні та BM25 запити одним ``query_batch_points``."""
+        dense = self._dense_requests(embeddings, section_filters, top_k)
+        sparse = self._sparse_requests(sparse_queries, section_filters, top_k)
+        results = await self._query_batch(dense + [r for r in sparse if r is not None])
+
+        lexical = iter(results[len(dense) :])
+        return results[: len(dense)], [next(lexical) if r is not None else [] for r in sparse]
+
+    async def supports_sparse(self) -> bool:
+        """Колекція має sparse-вектор BM25 (перевіряється один раз)."""
+        if self._sparse is None:
+            info = await self.qdrant_client.get_collection(self.collection_name)
+            self._sparse = SPARSE_VECTOR in (info.config.params.sparse_vectors or {})
+            if not self._sparse:
+                logger.warning("qdrant_sparse_vectors_missing", collection=self.collection_name)
+        return self._sparse
+
+    async def data_version(self) -> str | None:
+        """Версія з metadata колекції (Qdrant 1.16+; None — ще не встановлена)."""
+        info = await self.qdrant_client.get_collection(self.collection_name)
+        return (info.config.metadata or {}).get(VERSION_KEY)
+
+    def _dense_requests(
+        self,
+        embeddings: list[list[float]],
+        section_filters: list[str | None],
+        top_k: int,
+    ) -> list[Any]:
+        """Запити до щільного вектора."""
+        from qdrant_client.models import QueryRequest
+
+        return [
+            QueryRequest(
+                query=embedding,
+                filter=self._section_filter(section_filter),
+                params=self.search_params,
+                limit=top_k,
+                with_payload=True,
+            )
+            for embedding, section_filter in zip(embeddings, section_filters)
+        ]
+
+    def _sparse_requests(
+        self,
+        sparse_queries: list[SparseQuery],
+        section_filters: list[str | None],
+        top_k: int,
+    ) -> list[Any]:
+        """Запити до sparse-вектора (None для запиту без лексичних термінів)."""
+        from qdrant_client.models import QueryRequest, SparseVector
+
+        return [
+            QueryRequest(
+                query=SparseVector(indices=indices, values=values),
+                using=SPARSE_VECTOR,
+                filter=self._section_filter(section_filter),
+                limit=top_k,
+                with_payload=True,
+            )
+            if indices
+            else None
+            for (indices, values), section_filter in zip(sparse_queries, section_filters)
+        ]
+
+    async def _query_batch(self, requests: list[Any]) -> list[list[dict[str, Any]]]:
+        """Виконання пакета запитів та форматування результатів."""
+        if not requests:
+            return []
+        responses = await self.qdrant_client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=requests,
+        )
+        return [
+            [format_result(point.id, point.score, point.payload) for point in response.points]
+            for response in responses
+        ]
+
+    @staticmethod
+    def _section_filter(section_id: str | None) -> "Filter | None":
+        """Фільтр Qdrant по секції КМУ."""
+        if not section_id:
+            return None
+
+        from qdrant_client.models import FieldCondition, Filter, MatchValue
+
+        return Filter(
+            must=[
+                FieldCondition(
+                    key="section_id",
+                    match=MatchValue(value=section_id),
+                )
+            ]
+        )
+
+    async def warm_up(self) -> None:
+        """Встановлення з'єднання з Qdrant."""
+        await self.qdrant_client.get_collections()
+
+    async def health_check(self) -> bool:
+        """Перевірка доступності Qdrant."""
+        try:
+            await self.qdrant_client.get_collections()
+            return True
+        except Exception:
+            return False
+
+    async def close(self) -> None:
+        """Закриття з'єднань з Qdrant."""
+        await self.qdrant_client.close()
+
+
+class NumpySearchBackend(SearchBackend):
+    """Пошук у вбудованому ``VectorIndex`` (без Qdrant)."""
+
+    name = "numpy"
+
+    def __init__(self, index: "VectorIndex | None" = None, path: str | None = None) -> None:
+        self.path = path or settings.vector_index_path
+        self._index = index
+
+    @property
+    def index(self) -> "VectorIndex":
+        """
+        Ліниве відкриття індексу з диска.
+
+        Інгестія в іншому процесі перезаписує файли індексу — тоді він
+        перевідкривається, і пошук та ``data_version`` бачать нові дані.
+        """
+        if self._index is None or self._index.changed_on_disk():
+            from src.rag.vector_index import VectorIndex
+
+            path = self.path if self._index is None else self._index.path
+            if self._index is not None:
+                logger.info("vector_index_reloading", path=str(path))
+            self._index = VectorIndex.load(path)
+        return self._index
+
+    async def search_batch(
+        self,
+        embeddings: list[list[float]],
+        section_filters: list[str | None],
+        top_k: int,
+    ) -> list[list[dict[str, Any]]]:
+        """Повний перебір NumPy у пулі потоків."""
+        hits = await asyncio.to_thread(
+            lambda: self.index.search(embeddings, section_filters, top_k)
+        )
+        return [[format_result(p["id"], score, p) for score, p in row] for row in hits]
+
+    async def search_sparse_batch(
+        self,
+        sparse_queries: list[SparseQuery],
+        section_filters: list[str | None],
+        top_k: int,
+    ) -> list[list[dict[str, Any]]]:
+        """BM25 по posting-списках індексу у пулі потоків."""
+        hits = await asyncio.to_thread(
+            lambda: self.index.search_sparse(sparse_queries, section_filters, top_k)
+        )
+        return [[format_result(p["id"], score, p) for score, p in row] for row in hits]
+
+    async def supports_sparse(self) -> bool:
+        """Індекс містить sparse-вектори BM25."""
+        return await asyncio.to_thread(lambda: self.index.has_sparse)
+
+    async def data_version(self) -> str | None:
+        """Версія збереженого індексу (з перевідкриттям після інгестії)."""
+        return await asyncio.to_thread(lambda: self.index.version)
+
+    async def warm_up(self) -> None:
+        """
+        Відкриття індексу та завантаження сторінок mmap.
+
+        Raises:
+            RAGError: Якщо індекс не створено інгестією.
+        """
+        index = await asyncio.to_thread(lambda: self.index)
+        if not len(index):
+            raise RAGError(f"Векторний індекс {self.path} порожній — запустіть інгестію")
+        await asyncio.to_thread(index.search, [[1.0] * index.dimension], [None], 1)
+
+    async def health_check(self) -> bool:
+        """Індекс відкривається та не порожній."""
+        try:
+            return len(await asyncio.to_thread(lambda: self.index)) > 0
+        except RAGError:
+            return False
+
+
+SEARCH_BACKENDS: dict[str, type[SearchBackend]] = {
+    QdrantSearchBackend.name: QdrantSearchBackend,
+    NumpySearchBackend.name: NumpySearchBackend,
+}
+
+
+def create_search_backend(
+    name: str | None = None,
+    collection_name: str | None = None,
+    qdrant_url: str | None = None,
+) -> SearchBackend:
+    """
+    Бекенд пошуку за назвою (за замовчуванням RAG_BACKEND).
+
+    Raises:
+        RAGError: Невідомий бекенд.
+    """
+    name = name or settings.rag_backend
+    if name not in SEARCH_BACKENDS:
+        raise RAGError(
+            f"Невідомий бекенд пошуку: {name} (доступні: {', '.join(SEARCH_BACKENDS)})"
+        )
+    if name == QdrantSearchBackend.name:
+        return QdrantSearchBackend(collection_name=collection_name, qdrant_url=qdrant_url)
+    return NumpySearchBackend()
@@ -0,0 +1,449 @@
+"""
+Вбудований векторний індекс на NumPy.
+
+Для невеликих розгортань (кілька тисяч чанків з 13 зразків ТЗ) та
+тестів Qdrant не потрібен: нормалізовані вектори зберігаються в
+``vectors.npy`` (float32 або float16), що відкривається через mmap,
+а payload — колонками в ``payload.json``. Пошук — повний перебір
+скалярним добутком, векторизований NumPy, фільтр по секції — через
+інвертований індекс ``section_id → рядки``. Sparse-вектори BM25
+(CSR у ``sparse.npz``) дають лексичний пошук для гібридного режиму.
+"""
+
+import json
+import os
+import uuid
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.config import settings
+from src.rag.collection import SPARSE_VECTOR
+from src.rag.lexical import bm25_idf
+from src.utils.exceptions import RAGError
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+VECTORS_FILE = "vectors.npy"
+PAYLOAD_FILE = "payload.json"
+SPARSE_FILE = "sparse.npz"
+
+# Колонки payload, що зберігаються в індексі
+PAYLOAD_FIELDS = ("text", "source_file", "section_id", "section_title", "chunk_index", "file_hash")
+
+
+class VectorIndex:
+    """
+    Векторний індекс у пам'яті з персистентністю в директорії.
+
+    Після ``load`` вектори лише читаються з mmap; перша зміна копіює їх
+    у пам'ять. ``save`` атомарно замінює файли індексу. Методи синхронні —
+    RAGRetriever викликає пошук з ``asyncio.to_thread``.
+    """
+
+    def __init__(self, path: str | Path | None = None, dtype: str | None = None) -> None:
+        self.path = Path(path or settings.vector_index_path)
+        self.dtype = np.dtype(dtype or settings.vector_index_dtype)
+        self._vectors = np.empty((0, 0), dtype=self.dtype)
+        self._ids: list[str] = []
+        self._columns: dict[str, list[Any]] = {field: [] for field in PAYLOAD_FIELDS}
+        self._rows: dict[str, int] = {}
+        self._sections: dict[str, np.ndarray] = {}
+        self._stale_sections = False
+        # Версія даних (нова при кожному save) для кешу пошуку
+        self.version: str | None = None
+        # Стан payload.json на диску при load/save (запис іншим процесом)
+        self._disk_state: tuple[int, int] | None = None
+        # Sparse-вектори BM25 рядків та ліниво побудовані posting-списки
+        self._sparse: list[tuple[np.ndarray, np.ndarray]] = []
+        self._postings: tuple[np.ndarray, ...] | None = None
+        # Нові рядки до злиття з матрицею (уникаємо O(n²) конкатенацій)
+        self._pending: list[np.ndarray] = []
+
+    @classmethod
+    def load(cls, path: str | Path | None = None, dtype: str | None = None) -> "VectorIndex":
+        """
+        Відкриття індексу з диска (порожній індекс, якщо файлів немає).
+
+        Args:
+            path: Директорія індексу.
+            dtype: Тип векторів для нового індексу (float32 або float16).
+
+        Returns:
+            Екземпляр VectorIndex.
+
+        Raises:
+            RAGError: Якщо файли індексу пошкоджені або не узгоджені.
+        """
+        index = cls(path, dtype)
+        if not index.exists():
+            return index
+
+        # До читання: запис, що стався під час load, виявить changed_on_disk
+        index._disk_state = index._payload_state()
+        try:
+            vectors = np.load(index.path / VECTORS_FILE, mmap_mode="r")
+            data = json.loads((index.path / PAYLOAD_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            raise RAGError(f"Не вдалося відкрити векторний індекс {index.path}: {e}") from e
+
+        if len(data["ids"]) != len(vectors):
+            raise RAGError(
+                f"Векторний індекс {index.path} пошкоджено: "
+                f"{len(vectors)} векторів, {len(data['ids'])} записів payload"
+            )
+
+        index.dtype = vectors.dtype
+        index._vectors = vectors
+        index._ids = data["ids"]
+        index._columns = {
+            field: data["columns"].get(field, [None] * len(vectors)) for field in PAYLOAD_FIELDS
+        }
+        index._sparse = index._load_sparse(len(vectors))
+        index.version = data.get("version")
+        index._reindex()
+        logger.info(
+            "vector_index_loaded",
+            path=str(index.path),
+            vectors=len(vectors),
+            dtype=str(vectors.dtype),
+        )
+        return index
+
+    def exists(self) -> bool:
+        """Чи збережено індекс на диску."""
+        return (self.path / VECTORS_FILE).exists() and (self.path / PAYLOAD_FILE).exists()
+
+    def changed_on_disk(self) -> bool:
+        """Чи перезаписано індекс на диску після ``load``/``save`` цього екземпляра."""
+        return self._payload_state() != self._disk_state
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def has_sparse(self) -> bool:
+        """Чи є в індексі sparse-вектори BM25."""
+        return any(len(indices) for indices, _ in self._sparse)
+
+    @property
+    def dimension(self) -> int:
+        """Розмірність векторів (0 для порожнього індексу)."""
+        self._merge_pending()
+        return self._vectors.shape[1] if len(self) else 0
+
+    def search(
+        self,
+        queries: list[list[float]],
+        section_ids: list[str | None],
+        top_k: int,
+    ) -> list[list[tuple[float, dict[str, Any]]]]:
+        """
+        Top-k за косинусною подібністю для пакета запитів.
+
+        Запити без фільтра рахуються одним матричним множенням, запити з
+        фільтром — лише по рядках секції з інвертованого індексу.
+
+        Args:
+            queries: Вектори запитів.
+            section_ids: Фільтр по секції для кожного запиту (або None).
+            top_k: Кількість результатів на запит.
+
+        Returns:
+            Для кожного запиту — список (score, payload) за спаданням score.
+        """
+        self._merge_pending()
+        results: list[list[tuple[float, dict[str, Any]]]] = [[] for _ in queries]
+        if not len(self) or not queries:
+            return results
+
+        matrix = _normalize(np.asarray(queries, dtype=np.float32))
+        unfiltered = [i for i, section_id in enumerate(section_ids) if not section_id]
+        if unfiltered:
+            scores = matrix[unfiltered] @ self._vectors.T
+            for i, row_scores in zip(unfiltered, scores):
+                results[i] = self._top_k(row_scores, None, top_k)
+
+        for i, section_id in enumerate(section_ids):
+            rows = self._sections.get(section_id) if section_id else None
+            if rows is not None:
+                results[i] = self._top_k(self._vectors[rows] @ matrix[i], rows, top_k)
+
+        return results
+
+    def search_sparse(
+        self,
+        queries: list[tuple[list[int], list[float]]],
+        section_ids: list[str | None],
+        top_k: int,
+    ) -> list[list[tuple[float, dict[str, Any]]]]:
+        """
+        Top-k за BM25 для пакета sparse-запитів.
+
+        Score — сума ``IDF × вага терміна`` по posting-списках термінів
+        запиту; документи без спільних термінів не повертаються.
+
+        Args:
+            queries: Sparse-вектори запитів (індекси, ваги).
+            section_ids: Фільтр по секції для кожного запиту (або None).
+            top_k: Кількість результатів на запит.
+
+        Returns:
+            Для кожного запиту — список (score, payload) за спаданням score.
+        """
+        self._merge_pending()
+        results: list[list[tuple[float, dict[str, Any]]]] = [[] for _ in queries]
+        if not len(self):
+            return results
+
+        terms, starts, ends, rows, weights = self._build_postings()
+        for i, ((indices, values), section_id) in enumerate(zip(queries, section_ids)):
+            scores = np.zeros(len(self), dtype=np.float32)
+            positions = np.searchsorted(terms, indices)
+            for position, term, value in zip(positions, indices, values):
+                if position >= len(terms) or terms[position] != term:
+                    continue
+                start, end = starts[position], ends[position]
+                idf = bm25_idf(int(end - start), len(self))
+                scores[rows[start:end]] += idf * value * weights[start:end]
+
+            candidates = self._sections.get(section_id) if section_id else None
+            if section_id and candidates is None:
+                continue
+            if candidates is None:
+                candidates = np.flatnonzero(scores)
+            else:
+                candidates = candidates[scores[candidates] > 0]
+            results[i] = self._top_k(scores[candidates], candidates, top_k)
+
+        return results
+
+    def upsert(self, points: Iterable[Any]) -> None:
+        """
+        Додавання або заміна точок (об'єкти з ``id``, ``vector``, ``payload``).
+
+        Args:
+            points: Точки (напр. ``PointStruct`` з інгестії).
+        """
+        new_vectors = []
+        for point in points:
+            point_id = str(point.id)
+            dense, sparse = point.vector, None
+            if isinstance(dense, dict):
+                dense, sparse = dense[""], dense.get(SPARSE_VECTOR)
+            vector = _normalize(np.asarray(dense, dtype=np.float32)[None, :])[0]
+            sparse_row = (
+                np.asarray(sparse.indices if sparse else [], dtype=np.uint32),
+                np.asarray(sparse.values if sparse else [], dtype=np.float32),
+            )
+            payload = point.payload or {}
+
+            row = self._rows.get(point_id)
+            if row is None:
+                self._rows[point_id] = len(self._ids)
+                self._ids.append(point_id)
+                for field in PAYLOAD_FIELDS:
+                    self._columns[field].append(payload.get(field))
+                self._sparse.append(sparse_row)
+                new_vectors.append(vector)
+                continue
+
+            if new_vectors:
+                self._pending.append(np.stack(new_vectors).astype(self.dtype))
+                new_vectors = []
+            self._merge_pending()
+            self._writable()[row] = vector
+            self._sparse[row] = sparse_row
+            for field in PAYLOAD_FIELDS:
+                self._columns[field][row] = payload.get(field)
+
+        if new_vectors:
+            self._pending.append(np.stack(new_vectors).astype(self.dtype))
+        self._stale_sections = True
+        self._postings = None
+
+    def delete_stale(self, source_file: str, file_hash: str) -> int:
+        """
+        Видалення точок файлу з хешем, відмінним від поточного.
+
+        Returns:
+            Кількість видалених точок.
+        """
+        keep = [
+            i
+            for i, (name, content_hash) in enumerate(
+                zip(self._columns["source_file"], self._columns["file_hash"])
+            )
+            if name != source_file or content_hash == file_hash
+        ]
+        return self._keep_rows(keep)
+
+    def delete_version(self, source_file: str, file_hash: str) -> int:
+        """
+        Видалення точок файлу з заданим хешем (частково записана версія).
+
+        Returns:
+            Кількість видалених точок.
+        """
+        keep = [
+            i
+            for i, (name, content_hash) in enumerate(
+                zip(self._columns["source_file"], self._columns["file_hash"])
+            )
+            if name != source_file or content_hash != file_hash
+        ]
+        return self._keep_rows(keep)
+
+    def _keep_rows(self, keep: list[int]) -> int:
+        """Залишення лише рядків ``keep``; повертає кількість видалених."""
+        deleted = len(self) - len(keep)
+        if deleted:
+            self._merge_pending()
+            self._vectors = np.ascontiguousarray(self._vectors[keep])
+            self._ids = [self._ids[i] for i in keep]
+            self._sparse = [self._sparse[i] for i in keep]
+            self._postings = None
+            self._columns = {
+                field: [values[i] for i in keep] for field, values in self._columns.items()
+            }
+            self._reindex()
+        return deleted
+
+    def save(self) -> None:
+        """Атомарний запис індексу (нова версія): вектори, sparse CSR, потім payload."""
+        self._merge_pending()
+        self.version = uuid.uuid4().hex
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        vectors_tmp = self.path / f"{VECTORS_FILE}.tmp"
+        with open(vectors_tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(self._vectors, dtype=self.dtype))
+        sparse_tmp = self.path / f"{SPARSE_FILE}.tmp"
+        lengths = [len(indices) for indices, _ in self._sparse]
+        with open(sparse_tmp, "wb") as f:
+            np.savez(
+                f,
+                indptr=np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]),
+                indices=_concat([indices for indices, _ in self._sparse], np.uint32),
+                values=_concat([values for _, values in self._sparse], np.float32),
+            )
+        payload_tmp = self.path / f"{PAYLOAD_FILE}.tmp"
+        payload_tmp.write_text(
+            json.dumps(
+                {"version": self.version, "ids": self._ids, "columns": self._columns},
+                ensure_ascii=False,
+            ),
+            encoding="utf-8",
+        )
+        os.replace(vectors_tmp, self.path / VECTORS_FILE)
+        os.replace(sparse_tmp, self.path / SPARSE_FILE)
+        os.replace(payload_tmp, self.path / PAYLOAD_FILE)
+        self._disk_state = self._payload_state()
+        logger.info("vector_index_saved", path=str(self.path), vectors=len(self))
+
+    def _payload_state(self) -> tuple[int, int] | None:
+        """mtime та розмір ``payload.json`` (записується останнім у ``save``)."""
+        try:
+            stat = (self.path / PAYLOAD_FILE).stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _top_k(
+        self,
+        scores: np.ndarray,
+        rows: np.ndarray | None,
+        top_k: int,
+    ) -> list[tuple[float, dict[str, Any]]]:
+        """Top-k рядків за score (argpartition + сортування лише top-k)."""
+        k = min(top_k, len(scores))
+        if k <= 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [
+            (float(scores[i]), self._payload(int(rows[i]) if rows is not None else int(i)))
+            for i in best
+        ]
+
+    def _payload(self, row: int) -> dict[str, Any]:
+        """Payload рядка з колонок (з ID точки)."""
+        payload = {field: self._columns[field][row] for field in PAYLOAD_FIELDS}
+        payload["id"] = self._ids[row]
+        return payload
+
+    def _load_sparse(self, rows: int) -> list[tuple[np.ndarray, np.ndarray]]:
+        """Sparse-вектори з CSR файлу (порожні для індексу без них)."""
+        empty = (np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.float32))
+        if not (self.path / SPARSE_FILE).exists():
+            return [empty] * rows
+
+        with np.load(self.path / SPARSE_FILE) as data:
+            indptr, indices, values = data["indptr"], data["indices"], data["values"]
+        if len(indptr) != rows + 1:
+            raise RAGError(
+                f"Векторний індекс {self.path} пошкоджено: sparse не відповідає векторам"
+            )
+        bounds = indptr[1:-1]
+        return list(zip(np.split(indices, bounds), np.split(values, bounds)))
+
+    def _build_postings(self) -> tuple[np.ndarray, ...]:
+        """
+        Posting-списки термінів (будуються при першому лексичному пошуку).
+
+        Returns:
+            (унікальні терміни, початки, кінці, рядки, ваги) — рядки та
+            ваги відсортовані за терміном.
+        """
+        if self._postings is None:
+            lengths = np.fromiter(
+                (len(indices) for indices, _ in self._sparse), dtype=np.int64, count=len(self)
+            )
+            all_terms = _concat([indices for indices, _ in self._sparse], np.uint32)
+            all_rows = np.repeat(np.arange(len(self), dtype=np.int64), lengths)
+            all_weights = _concat([values for _, values in self._sparse], np.float32)
+
+            order = np.argsort(all_terms, kind="stable")
+            all_terms, all_rows, all_weights = all_terms[order], all_rows[order], all_weights[order]
+            terms, starts, counts = np.unique(all_terms, return_index=True, return_counts=True)
+            self._postings = (terms, starts, starts + counts, all_rows, all_weights)
+        return self._postings
+
+    def _merge_pending(self) -> None:
+        """Злиття нових рядків з матрицею та перебудова інвертованого індексу."""
+        if self._pending:
+            parts = [self._vectors] if len(self._vectors) else []
+            self._vectors = np.concatenate(parts + self._pending).astype(self.dtype, copy=False)
+            self._pending = []
+        if self._stale_sections:
+            self._reindex()
+
+    def _writable(self) -> np.ndarray:
+        """Копія mmap у пам'ять перед першою зміною."""
+        if not self._vectors.flags.writeable:
+            self._vectors = np.array(self._vectors)
+        return self._vectors
+
+    def _reindex(self) -> None:
+        """Перебудова ID → рядок та section_id → рядки."""
+        self._rows = {point_id: row for row, point_id in enumerate(self._ids)}
+        sections: dict[str, list[int]] = {}
+        for row, section_id in enumerate(self._columns["section_id"]):
+            if section_id:
+                sections.setdefault(section_id, []).append(row)
+        self._sections = {sid: np.asarray(rows, dtype=np.int64) for sid, rows in sections.items()}
+        self._stale_sections = False
+
+
+def _concat(arrays: list[np.ndarray], dtype: type) -> np.ndarray:
+    """Конкатенація (порожній масив для порожнього списку)."""
+    return np.concatenate(arrays).astype(dtype, copy=False) if arrays else np.empty(0, dtype=dtype)
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    """L2-нормалізація рядків (косинусна подібність як скалярний добуток)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
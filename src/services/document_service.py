@@ -74,6 +74,7 @@ class DocumentService:
             select(DocumentModel)
             .where(DocumentModel.project_id == project_id)
             .order_by(DocumentModel.created_at.desc())
+            .limit(1)
         )
         return result.scalar_one_or_none()
 
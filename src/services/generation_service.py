@@ -5,8 +5,10 @@
 """
 
 import asyncio
+import copy
+from collections.abc import AsyncIterator, Awaitable
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, TypeVar
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -17,13 +19,21 @@ from src.agents.requirements_analyst import RequirementsAnalystAgent
 from src.agents.section_generator import SectionGeneratorAgent
 from src.config import settings
 from src.db.models import GenerationTaskModel
+from src.db.session import async_session_factory
+from src.llm.router import LLMRouter, get_shared_router
 from src.services.document_service import DocumentService
 from src.services.project_service import ProjectService
-from src.utils.exceptions import GenerationError
+from src.utils.deadline import Deadline, current_deadline
+from src.utils.exceptions import GenerationError, GenerationTimeoutError
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+# Фонові задачі генерації по project_id (для скасування)
+_running_generations: dict[str, asyncio.Task[None]] = {}
+
 
 class GenerationService:
     """
@@ -37,17 +47,22 @@ class GenerationService:
     5. Збірка документу (DocumentAssembler)
     """
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        llm_router: LLMRouter | None = None,
+    ) -> None:
         self.session = session
         self.project_service = ProjectService(session)
         self.document_service = DocumentService(session)
+        self.llm_router = llm_router or get_shared_router()
 
-        # Ініціалізація агентів
-        self.requirements_analyst = RequirementsAnalystAgent()
-        self.rag_retriever = RAGRetrieverAgent()
-        self.section_generator = SectionGeneratorAgent()
-        self.compliance_checker = ComplianceCheckerAgent()
-        self.document_assembler = DocumentAssemblerAgent()
+        # Ініціалізація агентів (спільний роутер і HTTP пули)
+        self.requirements_analyst = RequirementsAnalystAgent(llm_router=self.llm_router)
+        self.rag_retriever = RAGRetrieverAgent(llm_router=self.llm_router)
+        self.section_generator = SectionGeneratorAgent(llm_router=self.llm_router)
+        self.compliance_checker = ComplianceCheckerAgent(llm_router=self.llm_router)
+        self.document_assembler = DocumentAssemblerAgent(llm_router=self.llm_router)
 
     async def start_generation(
         self,
@@ -57,7 +72,7 @@ class GenerationService:
         """
         Початок генерації ТЗ.
 
-        Створює task і запускає генерацію у фоні.
+        Створює task і запускає генерацію у фоні з власною сесією БД.
 
         Args:
             project_id: ID проєкту.
@@ -65,9 +80,15 @@ class GenerationService:
 
         Returns:
             Модель завдання генерації.
+
+        Raises:
+            GenerationError: Якщо генерація для проєкту вже виконується.
         """
         project = await self.project_service.get_by_id(project_id)
 
+        if self.is_generation_running(project_id):
+            raise GenerationError(f"Генерація для проєкту {project_id} вже виконується")
+
         # Створення завдання генерації
         task = GenerationTaskModel(
             project_id=project_id,
@@ -83,9 +104,12 @@ class GenerationService:
         # Оновлення статусу проєкту
         await self.project_service.update_status(project_id, "generating")
 
+        # Фіксуємо task до старту фонової задачі з окремою сесією
+        await self.session.commit()
+
         # Запуск генерації у фоновій задачі
-        asyncio.create_task(
-            self._run_generation(
+        background = asyncio.create_task(
+            self._run_in_background(
                 task_id=task.id,
                 project_id=project.id,
                 project_name=project.name,
@@ -93,15 +117,63 @@ class GenerationService:
                 additional_requirements=additional_requirements or {},
             )
         )
+        _running_generations[project_id] = background
+        background.add_done_callback(
+            lambda t: _running_generations.pop(project_id, None)
+            if _running_generations.get(project_id) is t
+            else None
+        )
 
         logger.info(
             "generation_started",
             task_id=task.id,
             project_id=project_id,
+            deadline_s=settings.max_generation_time,
         )
 
         return task
 
+    @staticmethod
+    def is_generation_running(project_id: str) -> bool:
+        """Чи виконується зараз генерація для проєкту в цьому процесі."""
+        running = _running_generations.get(project_id)
+        return running is not None and not running.done()
+
+    @staticmethod
+    def cancel_generation(project_id: str) -> bool:
+        """
+        Скасування генерації, що виконується.
+
+        In-flight HTTP запити до LLM переривуються через asyncio cancellation.
+
+        Args:
+            project_id: ID проєкту.
+
+        Returns:
+            True якщо генерацію було скасовано.
+        """
+        running = _running_generations.get(project_id)
+        if running is None or running.done():
+            return False
+
+        running.cancel()
+        logger.info("generation_cancel_requested", project_id=project_id)
+        return True
+
+    async def _run_in_background(self, **kwargs: Any) -> None:
+        """Виконання генерації з окремою сесією БД (сесія запиту вже закрита)."""
+        async with async_session_factory() as session:
+            service = self._bind_session(session)
+            await service._run_generation(**kwargs)
+
+    def _bind_session(self, session: AsyncSession) -> "GenerationService":
+        """Копія сервісу з тими ж агентами, але іншою сесією БД."""
+        service = copy.copy(self)
+        service.session = session
+        service.project_service = ProjectService(session)
+        service.document_service = DocumentService(session)
+        return service
+
     async def _run_generation(
         self,
         task_id: str,
@@ -113,6 +185,10 @@ class GenerationService:
         """
         Повний пайплайн генерації ТЗ.
 
+        Весь пайплайн обмежений ``settings.max_generation_time``; кожен етап
+        має власний бюджет. Дедлайн доступний агентам і LLM викликам через
+        ``current_deadline``.
+
         Args:
             task_id: ID завдання генерації.
             project_id: ID проєкту.
@@ -120,24 +196,36 @@ class GenerationService:
             project_description: Опис проєкту.
             additional_requirements: Додаткові вимоги.
         """
+        deadline = Deadline(settings.max_generation_time)
+        token = current_deadline.set(deadline)
+
         try:
             # Крок 1: Аналіз вимог (10%)
             await self._update_task(task_id, 0.1, "Аналіз вимог проєкту")
-            requirements = await self.requirements_analyst.execute(
-                project_name=project_name,
-                project_description=project_description,
-                additional_requirements=additional_requirements,
+            requirements = await self._run_stage(
+                "analysis",
+                settings.generation_budget_analysis,
+                self.requirements_analyst.execute(
+                    project_name=project_name,
+                    project_description=project_description,
+                    additional_requirements=additional_requirements,
+                ),
             )
 
             # Крок 2: RAG пошук контексту (20%)
             await self._update_task(task_id, 0.2, "Пошук релевантного контексту")
-            rag_result = await self.rag_retriever.execute(
-                project_description=project_description,
-                requirements=requirements,
+            rag_result = await self._run_stage(
+                "rag",
+                settings.generation_budget_rag,
+                self.rag_retriever.execute(
+                    project_description=project_description,
+                    requirements=requirements,
+                ),
             )
             contexts = rag_result.get("contexts", {})
 
             # Крок 3: Генерація секцій (20-80%)
+            sections_budget = deadline.budget(settings.generation_budget_sections)
             if settings.enable_parallel_generation:
                 sections = await self._generate_sections_parallel(
                     task_id=task_id,
@@ -145,6 +233,7 @@ class GenerationService:
                     project_description=project_description,
                     requirements=requirements,
                     contexts=contexts,
+                    budget=sections_budget,
                 )
             else:
                 sections = await self._generate_sections_sequential(
@@ -153,13 +242,18 @@ class GenerationService:
                     project_description=project_description,
                     requirements=requirements,
                     contexts=contexts,
+                    budget=sections_budget,
                 )
 
             # Крок 4: Перевірка відповідності (90%)
             await self._update_task(task_id, 0.9, "Перевірка відповідності КМУ №205")
-            compliance_result = await self.compliance_checker.execute(
-                project_name=project_name,
-                sections=sections,
+            compliance_result = await self._run_stage(
+                "compliance",
+                settings.generation_budget_compliance,
+                self.compliance_checker.execute(
+                    project_name=project_name,
+                    sections=sections,
+                ),
             )
 
             # Крок 5: Збірка документу (95%)
@@ -183,13 +277,25 @@ class GenerationService:
             # Завершення
             await self._update_task(task_id, 1.0, "Генерація завершена", status="completed")
             await self.project_service.update_status(project_id, "completed")
+            await self.session.commit()
 
             logger.info(
                 "generation_complete",
                 task_id=task_id,
                 project_id=project_id,
                 compliance_score=document.get("compliance_score"),
+                elapsed_s=round(deadline.total - deadline.remaining(), 1),
+            )
+
+        except asyncio.CancelledError:
+            logger.warning("generation_cancelled", task_id=task_id, project_id=project_id)
+            await self.session.rollback()
+            await self._update_task(
+                task_id, 0.0, "Генерацію скасовано", status="cancelled", error="cancelled"
             )
+            await self.project_service.update_status(project_id, "cancelled")
+            await self.session.commit()
+            raise
 
         except Exception as e:
             logger.error(
@@ -198,10 +304,36 @@ class GenerationService:
                 project_id=project_id,
                 error=str(e),
             )
+            await self.session.rollback()
             await self._update_task(
                 task_id, 0.0, f"Помилка: {str(e)}", status="failed", error=str(e)
             )
             await self.project_service.update_status(project_id, "failed")
+            await self.session.commit()
+
+        finally:
+            current_deadline.reset(token)
+
+    async def _run_stage(self, stage: str, budget: float, coro: Awaitable[T]) -> T:
+        """
+        Виконання етапу з бюджетом часу.
+
+        При перевищенні бюджету in-flight запити скасовуються.
+
+        Raises:
+            GenerationTimeoutError: Якщо етап не вклався у бюджет.
+        """
+        deadline = current_deadline.get()
+        timeout = deadline.budget(budget) if deadline is not None else budget
+
+        try:
+            async with asyncio.timeout(timeout):
+                return await coro
+        except TimeoutError as e:
+            logger.error("generation_stage_timeout", stage=stage, budget_s=round(timeout, 1))
+            raise GenerationTimeoutError(
+                f"Етап '{stage}' перевищив бюджет часу ({timeout:.0f} с)"
+            ) from e
 
     async def _generate_sections_parallel(
         self,
@@ -210,35 +342,52 @@ class GenerationService:
         project_description: str,
         requirements: dict[str, Any],
         contexts: dict[str, str],
+        budget: float | None = None,
     ) -> list[dict[str, Any]]:
-        """Паралельна генерація всіх секцій."""
+        """
+        Паралельна генерація всіх секцій.
+
+        Секції, що не встигли за бюджет, скасовуються і позначаються
+        як незгенеровані; готові секції зберігаються.
+        """
         await self._update_task(task_id, 0.3, "Паралельна генерація секцій")
 
         tasks = []
         for section_id in [str(i) for i in range(1, 11)]:
-            task = self.section_generator.execute(
-                section_id=section_id,
-                project_name=project_name,
-                project_description=project_description,
-                requirements=requirements,
-                rag_context=contexts.get(section_id, ""),
+            task = asyncio.create_task(
+                self.section_generator.execute(
+                    section_id=section_id,
+                    project_name=project_name,
+                    project_description=project_description,
+                    requirements=requirements,
+                    rag_context=contexts.get(section_id, ""),
+                )
             )
             tasks.append(task)
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=budget)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.warning("sections_timed_out", count=len(pending), budget_s=budget)
 
         sections = []
-        for i, result in enumerate(results, 1):
-            if isinstance(result, Exception):
+        for i, task in enumerate(tasks, 1):
+            if task.cancelled():
+                sections.append(self._failed_section(i, "перевищено час генерації"))
+            elif task.exception() is not None:
+                result = task.exception()
                 logger.error(f"section_{i}_generation_failed", error=str(result))
-                sections.append({
-                    "id": str(i),
-                    "title": f"Секція {i}",
-                    "content": f"[Помилка генерації: {result}]",
-                    "subsections": [],
-                })
+                sections.append(self._failed_section(i, str(result)))
             else:
-                sections.append(result)
+                sections.append(task.result())
 
         return sections
 
@@ -249,9 +398,19 @@ class GenerationService:
         project_description: str,
         requirements: dict[str, Any],
         contexts: dict[str, str],
+        budget: float | None = None,
     ) -> list[dict[str, Any]]:
-        """Послідовна генерація секцій з прогресом."""
+        """
+        Послідовна генерація секцій з прогресом у межах бюджету.
+
+        Кожна секція отримує залишок бюджету етапу; секція, що не
+        встигла, і всі наступні позначаються як незгенеровані, готові
+        секції зберігаються.
+        """
         sections = []
+        stage_deadline = Deadline(
+            budget if budget is not None else settings.generation_budget_sections
+        )
 
         for i in range(1, 11):
             section_id = str(i)
@@ -260,17 +419,83 @@ class GenerationService:
                 task_id, progress, f"Генерація секції {section_id}"
             )
 
-            result = await self.section_generator.execute(
-                section_id=section_id,
-                project_name=project_name,
-                project_description=project_description,
-                requirements=requirements,
-                rag_context=contexts.get(section_id, ""),
-            )
+            if stage_deadline.expired:
+                sections.append(self._failed_section(i, "перевищено час генерації"))
+                continue
+
+            try:
+                result = await self._run_stage(
+                    f"section_{section_id}",
+                    stage_deadline.remaining(),
+                    self.section_generator.execute(
+                        section_id=section_id,
+                        project_name=project_name,
+                        project_description=project_description,
+                        requirements=requirements,
+                        rag_context=contexts.get(section_id, ""),
+                    ),
+                )
+            except GenerationTimeoutError:
+                sections.append(self._failed_section(i, "перевищено час генерації"))
+                continue
             sections.append(result)
 
         return sections
 
+    @staticmethod
+    def _failed_section(index: int, reason: str) -> dict[str, Any]:
+        """Заглушка для секції, яку не вдалося згенерувати."""
+        return {
+            "id": str(index),
+            "title": f"Секція {index}",
+            "content": f"[Помилка генерації: {reason}]",
+            "subsections": [],
+        }
+
+    async def stream_section(
+        self,
+        project_id: str,
+        section_id: str,
+    ) -> AsyncIterator[str]:
+        """
+        Підготовка потокової (пере)генерації однієї секції.
+
+        Дані проєкту, вимоги з останнього документу та RAG контекст
+        завантажуються одразу (поки сесія БД активна); повернений
+        ітератор лише транслює фрагменти від LLM.
+
+        Args:
+            project_id: ID проєкту.
+            section_id: Номер секції (1-10).
+
+        Returns:
+            Асинхронний ітератор фрагментів тексту секції.
+        """
+        project = await self.project_service.get_by_id(project_id)
+
+        requirements: dict[str, Any] = {}
+        document = await self.document_service.get_by_project_id(project_id)
+        if document and document.metadata_json:
+            requirements["summary"] = document.metadata_json.get("requirements_summary", "")
+
+        try:
+            rag_context = await self.rag_retriever.retriever.search_for_section(
+                section_id=section_id,
+                project_description=project.description or "",
+                top_k=settings.rag_top_k,
+            )
+        except Exception as e:
+            logger.warning("stream_rag_context_failed", section_id=section_id, error=str(e))
+            rag_context = ""
+
+        return self.section_generator.stream(
+            section_id=section_id,
+            project_name=project.name,
+            project_description=project.description or "",
+            requirements=requirements,
+            rag_context=rag_context,
+        )
+
     async def _update_task(
         self,
         task_id: str,
@@ -279,7 +504,7 @@ class GenerationService:
         status: str = "processing",
         error: str | None = None,
     ) -> None:
-        """Оновлення прогресу задачі генерації."""
+        """Оновлення прогресу задачі генерації (з комітом, щоб був видимий polling)."""
         from sqlalchemy import select
 
         result = await self.session.execute(
@@ -293,9 +518,9 @@ class GenerationService:
             task.status = status
             if error:
                 task.error_message = error
-            if status in ("completed", "failed"):
+            if status in ("completed", "failed", "cancelled"):
                 task.completed_at = datetime.now(timezone.utc)
-            await self.session.flush()
+            await self.session.commit()
 
     async def get_task_status(self, task_id: str) -> GenerationTaskModel | None:
         """Отримання статусу завдання генерації."""
@@ -132,7 +132,7 @@ class ProjectService:
 
         Args:
             project_id: ID проєкту.
-            status: Новий статус (draft, generating, completed, failed).
+            status: Новий статус (draft, generating, completed, failed, cancelled).
 
         Returns:
             Оновлений проєкт.
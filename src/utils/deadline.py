@@ -0,0 +1,34 @@
+"""
+Дедлайни генерації.
+
+Дедлайн задається в ``GenerationService._run_generation`` і через
+contextvar доступний усім агентам та LLM викликам у тій самій asyncio
+задачі (включно з дочірніми задачами паралельної генерації секцій).
+"""
+
+import time
+from contextvars import ContextVar
+
+
+class Deadline:
+    """Абсолютний дедлайн на монотонному годиннику."""
+
+    def __init__(self, seconds: float) -> None:
+        self.total = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Залишок часу в секундах (не менше 0)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Чи минув дедлайн."""
+        return self.remaining() <= 0.0
+
+    def budget(self, seconds: float) -> float:
+        """Бюджет етапу, обмежений залишком загального дедлайну."""
+        return min(seconds, self.remaining())
+
+
+current_deadline: ContextVar[Deadline | None] = ContextVar("current_deadline", default=None)
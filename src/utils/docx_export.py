@@ -2,21 +2,22 @@
 Експорт ТЗ у формат DOCX.
 
 Генерація Word документу згідно структури КМУ №205.
+
+python-docx (lxml) імпортується при першому експорті, а не при старті API.
 """
 
 from pathlib import Path
-from typing import Any
-
-from docx import Document
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.shared import Cm, Pt
+from typing import TYPE_CHECKING, Any
 
 from src.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from docx.document import Document
+
 logger = get_logger(__name__)
 
 
-def create_tz_document(sections: list[dict[str, Any]], metadata: dict[str, Any]) -> Document:
+def create_tz_document(sections: list[dict[str, Any]], metadata: dict[str, Any]) -> "Document":
     """
     Створення DOCX документу ТЗ.
 
@@ -27,6 +28,9 @@ def create_tz_document(sections: list[dict[str, Any]], metadata: dict[str, Any])
     Returns:
         python-docx Document об'єкт.
     """
+    from docx import Document
+    from docx.shared import Cm, Pt
+
     doc = Document()
 
     # Налаштування стилів документу
@@ -58,8 +62,11 @@ def create_tz_document(sections: list[dict[str, Any]], metadata: dict[str, Any])
     return doc
 
 
-def _add_title_page(doc: Document, metadata: dict[str, Any]) -> None:
+def _add_title_page(doc: "Document", metadata: dict[str, Any]) -> None:
     """Додавання титульної сторінки."""
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Pt
+
     doc.add_paragraph("")
     doc.add_paragraph("")
 
@@ -87,8 +94,10 @@ def _add_title_page(doc: Document, metadata: dict[str, Any]) -> None:
     doc.add_page_break()
 
 
-def _add_section(doc: Document, section_data: dict[str, Any]) -> None:
+def _add_section(doc: "Document", section_data: dict[str, Any]) -> None:
     """Додавання секції ТЗ до документу."""
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+
     section_id = section_data.get("id", "")
     title = section_data.get("title", "")
 
@@ -114,7 +123,7 @@ def _add_section(doc: Document, section_data: dict[str, Any]) -> None:
             paragraph.style = doc.styles["Normal"]
 
 
-def save_document(doc: Document, output_path: Path) -> Path:
+def save_document(doc: "Document", output_path: Path) -> Path:
     """
     Збереження DOCX документу на диск.
 
@@ -12,10 +12,25 @@ class EnforenceException(Exception):
 
 
 class LLMError(EnforenceException):
-    """Помилка LLM API (MamayLM або Claude)."""
-
-    def __init__(self, message: str = "Помилка LLM провайдера", provider: str = "unknown") -> None:
+    """
+    Помилка LLM API (MamayLM або Claude).
+
+    ``retryable`` позначає транзитні помилки (429/5xx, розрив з'єднання),
+    ``retry_after`` — затримку із заголовка Retry-After у секундах.
+    """
+
+    def __init__(
+        self,
+        message: str = "Помилка LLM провайдера",
+        provider: str = "unknown",
+        status_code: int | None = None,
+        retryable: bool = False,
+        retry_after: float | None = None,
+    ) -> None:
         self.provider = provider
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
         super().__init__(f"[{provider}] {message}")
 
 
@@ -33,6 +48,13 @@ class GenerationError(EnforenceException):
         super().__init__(message)
 
 
+class GenerationTimeoutError(GenerationError):
+    """Перевищено бюджет часу генерації (max_generation_time або етапу)."""
+
+    def __init__(self, message: str = "Перевищено час генерації документу") -> None:
+        super().__init__(message)
+
+
 class ComplianceError(EnforenceException):
     """Помилка валідації відповідності КМУ №205."""
 
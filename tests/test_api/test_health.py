@@ -6,6 +6,7 @@ import pytest
 from fastapi.testclient import TestClient
 
 from src.api.app import create_app
+from src.api.warmup import WarmupState, run_warmup
 
 
 @pytest.fixture
@@ -39,3 +40,40 @@ def test_openapi_schema(client):
     schema = response.json()
     assert schema["info"]["title"] == "ENFORENCE API"
     assert "/health" in schema["paths"]
+
+
+def test_ready_before_warmup(client):
+    """До завершення прогріву /ready повертає 503."""
+    response = client.get("/ready")
+    assert response.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_warmup_retries_rag_and_marks_ready():
+    """Прогрів повторює недоступний RAG і завершується станом ready."""
+
+    class FlakyRetriever:
+        attempts = 0
+
+        async def warm_up(self) -> None:
+            self.attempts += 1
+            if self.attempts == 1:
+                raise ConnectionError("qdrant down")
+
+    class FakeRouter:
+        async def warm_up(self) -> dict[str, bool]:
+            return {"mamay": True, "claude": False}
+
+    state = WarmupState()
+    retriever = FlakyRetriever()
+    await run_warmup(state, retriever, FakeRouter(), retry_interval=0)
+
+    assert state.ready
+    assert retriever.attempts == 2
+    assert state.checks == {"rag": "ok", "llm": {"mamay": True, "claude": False}}
+
+    app = create_app()
+    app.state.warmup = state
+    response = TestClient(app).get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
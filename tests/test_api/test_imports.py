@@ -0,0 +1,12 @@
+"""
+Тест холодного старту: важкі залежності не імпортуються разом з API.
+"""
+
+from scripts.benchmark_imports import imported_heavy_modules, measure
+
+
+def test_api_import_skips_heavy_dependencies():
+    """torch, sentence-transformers, qdrant-client та python-docx завантажуються ліниво."""
+    rows = measure("src.api.app")
+
+    assert imported_heavy_modules(rows) == []
@@ -0,0 +1,113 @@
+"""
+Тести для кешу відповідей LLM.
+"""
+
+import time
+
+import httpx
+import pytest
+
+from src.llm.base import LLMResponse
+from src.llm.cache import ResponseCache, make_cache_key
+from src.llm.claude_client import ClaudeClient
+from src.llm.mamay_client import MamayLMClient
+from src.llm.router import LLMRouter
+
+real_time = time.time
+
+
+def test_cache_key_depends_on_parameters():
+    """Ключ змінюється при зміні будь-якого параметра запиту."""
+    base = make_cache_key("claude", "model", "system", "prompt", 0.2, 2048)
+
+    assert base == make_cache_key("claude", "model", "system", "prompt", 0.2, 2048)
+    assert base != make_cache_key("claude", "model", "system", "prompt", 0.3, 2048)
+    assert base != make_cache_key("mamay", "model", "system", "prompt", 0.2, 2048)
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_survives_new_instance(tmp_path):
+    """Відповідь з SQLite доступна новому екземпляру кешу."""
+    db_path = str(tmp_path / "llm_cache.sqlite")
+    response = LLMResponse(text="{}", provider="claude", model="m", tokens_used=7)
+
+    first = ResponseCache(db_path=db_path)
+    await first.set("key", response)
+    first.close()
+
+    second = ResponseCache(db_path=db_path)
+    cached = await second.get("key")
+    second.close()
+
+    assert cached == response
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_bounded_by_last_access(tmp_path):
+    """SQLite рівень тримає не більше max_disk_items, витісняючи найдавніше використані."""
+    db_path = str(tmp_path / "llm_cache.sqlite")
+    cache = ResponseCache(db_path=db_path, max_memory_items=1, max_disk_items=2)
+    await cache.set("a", LLMResponse(text="a", provider="p", model="m"))
+    await cache.set("b", LLMResponse(text="b", provider="p", model="m"))
+    assert (await cache.get("a")).text == "a"
+    await cache.set("c", LLMResponse(text="c", provider="p", model="m"))
+    cache.close()
+
+    reopened = ResponseCache(db_path=db_path, max_memory_items=1)
+    assert (await reopened.get("a")).text == "a"
+    assert await reopened.get("b") is None
+    assert (await reopened.get("c")).text == "c"
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_purges_expired_entries(tmp_path, monkeypatch):
+    """Прострочені записи видаляються під час запису, без повторного читання."""
+    cache = ResponseCache(db_path=str(tmp_path / "llm_cache.sqlite"), ttl_seconds=60)
+    await cache.set("old", LLMResponse(text="old", provider="p", model="m"))
+
+    monkeypatch.setattr(time, "time", lambda: real_time() + 3600)
+    await cache.set("new", LLMResponse(text="new", provider="p", model="m"))
+
+    keys = [row[0] for row in cache._conn.execute("SELECT key FROM llm_cache")]
+    cache.close()
+    assert keys == ["new"]
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_oldest():
+    """In-memory рівень витісняє найстаріші записи."""
+    cache = ResponseCache(db_path="", max_memory_items=2)
+    for key in ("a", "b", "c"):
+        await cache.set(key, LLMResponse(text=key, provider="p", model="m"))
+
+    assert await cache.get("a") is None
+    assert (await cache.get("c")).text == "c"
+
+
+@pytest.mark.asyncio
+async def test_router_caches_low_temperature_calls():
+    """Повторний низькотемпературний запит не йде в мережу."""
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(200, json={"content": [{"text": "ok"}], "usage": {}})
+
+    router = LLMRouter(
+        mamay_client=MamayLMClient(base_url="http://mamay"),
+        claude_client=ClaudeClient(
+            api_key="test",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        ),
+        cache=ResponseCache(db_path=""),
+    )
+
+    await router.route("compliance_check", "промпт", temperature=0.2)
+    await router.route("compliance_check", "промпт", temperature=0.2)
+    await router.route("compliance_check", "промпт", temperature=0.2, use_cache=False)
+    await router.route("compliance_check", "промпт", temperature=0.7)
+
+    assert calls == 3
+    await router.close()
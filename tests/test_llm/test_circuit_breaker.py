@@ -0,0 +1,70 @@
+"""
+Тести для CircuitBreaker та його використання в LLMRouter.
+"""
+
+import httpx
+import pytest
+
+from src.llm.circuit_breaker import CircuitBreaker, CircuitState
+from src.llm.claude_client import ClaudeClient
+from src.llm.mamay_client import MamayLMClient
+from src.llm.router import LLMRouter
+
+
+def test_breaker_opens_after_threshold():
+    """Після серії помилок breaker відкривається."""
+    breaker = CircuitBreaker("mamay", failure_threshold=2, recovery_timeout=60)
+    breaker.record_failure()
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+
+def test_breaker_half_open_allows_single_trial():
+    """Після recovery_timeout пропускається лише один пробний запит."""
+    breaker = CircuitBreaker("mamay", failure_threshold=1, recovery_timeout=0)
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_router_skips_open_provider():
+    """Відкритий breaker MamayLM — запит одразу йде до Claude."""
+    mamay_calls = 0
+
+    def mamay_handler(request: httpx.Request) -> httpx.Response:
+        nonlocal mamay_calls
+        mamay_calls += 1
+        return httpx.Response(503)
+
+    def claude_handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"content": [{"text": "ok"}], "usage": {}})
+
+    router = LLMRouter(
+        mamay_client=MamayLMClient(
+            base_url="http://mamay",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(mamay_handler)),
+        ),
+        claude_client=ClaudeClient(
+            api_key="test",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(claude_handler)),
+        ),
+    )
+    router.breakers["mamay"] = CircuitBreaker("mamay", failure_threshold=1, recovery_timeout=60)
+    router.mamay_client.retry_policy.max_attempts = 1
+
+    first = await router.route("section_generation", "промпт")
+    second = await router.route("section_generation", "промпт")
+
+    assert first.provider == second.provider == "claude"
+    assert mamay_calls == 1
+    assert router.circuit_states()["mamay"] == "open"
+    await router.close()
@@ -0,0 +1,120 @@
+"""
+Тести для hedged requests у LLMRouter.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.config import settings
+from src.llm.claude_client import ClaudeClient
+from src.llm.hedging import LatencyTracker
+from src.llm.mamay_client import MamayLMClient
+from src.llm.router import LLMRouter
+
+
+def _router(mamay_delay: float) -> LLMRouter:
+    async def mamay_handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(mamay_delay)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "mamay"}}]})
+
+    async def claude_handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"content": [{"text": "claude"}], "usage": {}})
+
+    return LLMRouter(
+        mamay_client=MamayLMClient(
+            base_url="http://mamay",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(mamay_handler)),
+        ),
+        claude_client=ClaudeClient(
+            api_key="test",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(claude_handler)),
+        ),
+    )
+
+
+@pytest.fixture
+def hedging(monkeypatch):
+    """Увімкнений hedging з короткою затримкою."""
+    monkeypatch.setattr(settings, "llm_hedging_enabled", True)
+    monkeypatch.setattr(settings, "llm_hedge_default_delay", 0.05)
+
+
+def test_latency_percentile_requires_samples(monkeypatch):
+    """Перцентиль недоступний, поки вимірів замало."""
+    monkeypatch.setattr(settings, "llm_hedge_min_samples", 5)
+    tracker = LatencyTracker()
+    for value in (1.0, 2.0, 3.0, 4.0):
+        tracker.record(value)
+    assert tracker.percentile(0.9) is None
+
+    tracker.record(5.0)
+    assert tracker.percentile(0.9) == 5.0
+
+
+@pytest.mark.asyncio
+async def test_hedge_wins_when_mamay_is_slow(hedging):
+    """Повільний MamayLM — перемагає hedge запит до Claude."""
+    router = _router(mamay_delay=1.0)
+
+    response = await router.route("section_generation", "промпт")
+
+    assert response.provider == "claude"
+    assert router.hedge_stats.hedges_launched == 1
+    assert router.hedge_stats.hedge_wins == 1
+    await router.close()
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_when_mamay_is_fast(hedging):
+    """Швидкий MamayLM — hedge не запускається."""
+    router = _router(mamay_delay=0.0)
+
+    response = await router.route("section_generation", "промпт")
+
+    assert response.provider == "mamay"
+    assert router.hedge_stats.hedges_launched == 0
+    assert router.hedge_stats.primary_wins == 1
+    await router.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_primary_recorded_as_latency_lower_bound(hedging, monkeypatch):
+    """Скасована спроба MamayLM потрапляє у вікно латентності."""
+    monkeypatch.setattr(settings, "llm_hedge_min_samples", 1)
+    router = _router(mamay_delay=1.0)
+
+    response = await router.route("section_generation", "промпт")
+
+    assert response.provider == "claude"
+    assert len(router.latency["mamay"]) == 1
+    assert router.latency["mamay"].percentile(1.0) >= settings.llm_hedge_default_delay
+    await router.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_hedged_call_cancels_primary(hedging):
+    """Скасування виклику до запуску hedge скасовує MamayLM і звільняє слот."""
+    router = _router(mamay_delay=1.0)
+
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(router.route("section_generation", "промпт"), 0.02)
+
+    assert router.limiters["mamay"].stats.in_flight == 0
+    await router.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_hedged_stream_closes_primary(hedging):
+    """Скасування потоку до першого токена закриває потік MamayLM."""
+    router = _router(mamay_delay=1.0)
+
+    async def consume() -> list[str]:
+        return [chunk async for chunk in router.route_stream("section_generation", "промпт")]
+
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(consume(), 0.02)
+
+    assert router.limiters["mamay"].stats.in_flight == 0
+    await router.close()
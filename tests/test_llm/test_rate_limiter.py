@@ -0,0 +1,42 @@
+"""
+Тести для лімітерів LLM провайдерів.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.llm.rate_limiter import ProviderLimiter, TokenBucket
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_waits_when_empty():
+    """Після вичерпання ємності запит чекає на поповнення."""
+    bucket = TokenBucket(rate_per_minute=600)  # 10 одиниць/с
+    await bucket.acquire(600)
+
+    start = time.monotonic()
+    await bucket.acquire(1)
+
+    assert time.monotonic() - start >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_provider_limiter_bounds_concurrency():
+    """Одночасно виконується не більше max_concurrency запитів."""
+    limiter = ProviderLimiter("mamay", max_concurrency=2)
+    peak = 0
+
+    async def call() -> None:
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.stats.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(call() for _ in range(6)))
+
+    assert peak == 2
+    assert limiter.stats.requests == 6
+    assert limiter.stats.waited_requests >= 1
+    assert limiter.stats.in_flight == 0
@@ -0,0 +1,127 @@
+"""
+Тести для повторних спроб LLM клієнтів.
+"""
+
+import httpx
+import pytest
+
+from src.llm.claude_client import ClaudeClient
+from src.llm.mamay_client import MamayLMClient
+from src.llm.retry import RetryPolicy, parse_retry_after
+from src.llm.router import LLMRouter
+from src.utils.exceptions import LLMError
+
+
+def _claude(handler, max_attempts: int = 3, deadline: float = 10.0) -> ClaudeClient:
+    client = ClaudeClient(
+        api_key="test",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    client.retry_policy = RetryPolicy(
+        provider="claude",
+        max_attempts=max_attempts,
+        base_delay=0.01,
+        max_delay=0.05,
+        deadline=deadline,
+    )
+    return client
+
+
+def test_parse_retry_after_seconds():
+    """Retry-After у секундах."""
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("не число") is None
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_status():
+    """429 повторюється з урахуванням Retry-After до успіху."""
+    statuses = [429, 503]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if statuses:
+            return httpx.Response(statuses.pop(0), headers={"retry-after": "0"})
+        return httpx.Response(200, json={"content": [{"text": "ok"}], "usage": {}})
+
+    response = await _claude(handler).generate("промпт")
+
+    assert response.text == "ok"
+    assert statuses == []
+
+
+@pytest.mark.asyncio
+async def test_fatal_status_not_retried():
+    """400 — фатальна помилка без повторів."""
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(400, text="bad request")
+
+    with pytest.raises(LLMError) as exc_info:
+        await _claude(handler).generate("промпт")
+
+    assert calls == 1
+    assert exc_info.value.status_code == 400
+    assert not exc_info.value.retryable
+
+
+@pytest.mark.asyncio
+async def test_retry_stops_at_deadline():
+    """Retry-After довший за залишок дедлайну — без повторної спроби."""
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(429, headers={"retry-after": "30"})
+
+    with pytest.raises(LLMError):
+        await _claude(handler, max_attempts=5, deadline=0.05).generate("промпт")
+
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_mamay_read_timeout_not_retried():
+    """Завислий pod (таймаут читання) — одна спроба, без повторів."""
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    client = MamayLMClient(
+        base_url="http://mamay",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    client.retry_policy.base_delay = 0.01
+
+    with pytest.raises(LLMError) as exc_info:
+        await client.generate("промпт")
+
+    assert calls == 1
+    assert not exc_info.value.retryable
+
+
+@pytest.mark.asyncio
+async def test_router_takes_limiter_slot_per_attempt():
+    """Повтор у роутері займає слот на кожну спробу, а не на весь цикл з паузами."""
+    statuses = [503]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if statuses:
+            return httpx.Response(statuses.pop(0), headers={"retry-after": "0"})
+        return httpx.Response(200, json={"content": [{"text": "ok"}], "usage": {}})
+
+    router = LLMRouter(claude_client=_claude(handler))
+
+    response = await router.route("compliance_check", "промпт", use_cache=False)
+
+    assert response.text == "ok"
+    assert router.limiters["claude"].stats.requests == 2
+    assert router.limiters["claude"].stats.in_flight == 0
+    await router.close()
@@ -0,0 +1,34 @@
+"""
+Тести для LLMRouter.
+"""
+
+import pytest
+
+from src.agents.compliance_checker import ComplianceCheckerAgent
+from src.agents.section_generator import SectionGeneratorAgent
+from src.llm.router import close_shared_router, get_shared_router
+
+
+@pytest.mark.asyncio
+async def test_shared_router_is_singleton():
+    """Агенти без явного роутера використовують спільний екземпляр."""
+    router = get_shared_router()
+
+    assert get_shared_router() is router
+    assert SectionGeneratorAgent().llm_router is router
+    assert ComplianceCheckerAgent().llm_router is router
+
+    await close_shared_router()
+
+
+@pytest.mark.asyncio
+async def test_close_shared_router_releases_pools():
+    """Після закриття створюється новий роутер з новими HTTP пулами."""
+    router = get_shared_router()
+    await close_shared_router()
+
+    assert router.mamay_client.client.is_closed
+    assert router.claude_client.client.is_closed
+    assert get_shared_router() is not router
+
+    await close_shared_router()
@@ -0,0 +1,83 @@
+"""
+Тести для потокової генерації (SSE) LLM клієнтів.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from src.llm.claude_client import ClaudeClient
+from src.llm.mamay_client import MamayLMClient
+from src.llm.router import LLMRouter
+
+
+def _sse(events: list[str]) -> bytes:
+    """Формування тіла SSE відповіді."""
+    return "".join(f"data: {event}\n\n" for event in events).encode()
+
+
+def _mamay_stream(texts: list[str]) -> bytes:
+    events = [json.dumps({"choices": [{"delta": {"content": t}}]}) for t in texts]
+    return _sse(events + ["[DONE]"])
+
+
+def _claude_stream(texts: list[str]) -> bytes:
+    events = [json.dumps({"type": "message_start", "message": {"usage": {"input_tokens": 5}}})]
+    events += [
+        json.dumps({"type": "content_block_delta", "delta": {"type": "text_delta", "text": t}})
+        for t in texts
+    ]
+    events.append(json.dumps({"type": "message_stop"}))
+    return _sse(events)
+
+
+def _client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_mamay_stream_parses_deltas():
+    """MamayLM повертає delta.content кожної SSE події."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, content=_mamay_stream(["Розділ ", "перший"]))
+
+    client = MamayLMClient(base_url="http://mamay", http_client=_client(handler))
+    chunks = [c async for c in client.generate_stream("промпт")]
+
+    assert chunks == ["Розділ ", "перший"]
+
+
+@pytest.mark.asyncio
+async def test_claude_stream_parses_text_deltas():
+    """Claude повертає text_delta з content_block_delta подій."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=_claude_stream(["Текст", " ТЗ"]))
+
+    client = ClaudeClient(api_key="test", http_client=_client(handler))
+    chunks = [c async for c in client.generate_stream("промпт")]
+
+    assert chunks == ["Текст", " ТЗ"]
+
+
+@pytest.mark.asyncio
+async def test_router_stream_falls_back_before_first_token():
+    """Якщо MamayLM впав до першого фрагмента — потік іде від Claude."""
+
+    def mamay_handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503, text="pod is cold")
+
+    def claude_handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=_claude_stream(["fallback"]))
+
+    router = LLMRouter(
+        mamay_client=MamayLMClient(base_url="http://mamay", http_client=_client(mamay_handler)),
+        claude_client=ClaudeClient(api_key="test", http_client=_client(claude_handler)),
+    )
+    chunks = [c async for c in router.route_stream("section_generation", "промпт")]
+
+    assert chunks == ["fallback"]
+    await router.close()
@@ -54,3 +54,52 @@ def test_chunk_metadata(chunker):
     for chunk in chunks:
         assert chunk.source_file == "sample.docx"
         assert chunk.text
+
+
+def test_iter_chunks_streams_lines(chunker):
+    """Потоковий чанкер дає ті самі чанки, що й chunk_document, по мірі надходження рядків."""
+    lines = ["1.", "Загальні відомості"] + ["Це тестове речення. " * 5] * 20 + ["2. Мета", "Облік."]
+    consumed = []
+
+    def source():
+        for line in lines:
+            consumed.append(line)
+            yield line
+
+    stream = chunker.iter_chunks(source(), source_file="test.docx")
+    first = next(stream)
+
+    assert first.section_title == "Загальні відомості"
+    assert len(consumed) < len(lines)
+    assert [first, *stream] == chunker.chunk_document("\n".join(lines), source_file="test.docx")
+
+
+def test_chunk_size_in_tokens(tmp_path):
+    """Розмір чанка рахується в токенах токенізатора, перекриття — цілими реченнями."""
+    from tokenizers import Tokenizer
+    from tokenizers.models import WordLevel
+    from tokenizers.pre_tokenizers import Whitespace
+
+    tokenizer = Tokenizer(WordLevel({"[UNK]": 0}, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = Whitespace()
+    tokenizer.save(str(tmp_path / "tokenizer.json"))
+
+    chunker = DocumentChunker(chunk_size=15, chunk_overlap=5, tokenizer=str(tmp_path))
+    text = "1. Вимоги\n" + " ".join(f"Речення номер {i} тут." for i in range(20))
+    chunks = chunker.chunk_document(text)
+
+    assert len(chunks) > 1
+    assert all(chunker.measure([c.text])[0] <= 15 for c in chunks)
+    # Речення — 5 токенів: останнє речення чанка повторюється на початку наступного
+    assert chunks[1].text.startswith(chunks[0].text.split(". ")[-1])
+
+
+def test_chunking_always_progresses():
+    """Роздільник біля початку вікна та задовгі слова не зациклюють розбиття."""
+    chunker = DocumentChunker(chunk_size=50, chunk_overlap=40)
+    text = ("А. " + "б" * 45 + ". ") * 10 + "в" * 500
+    chunks = chunker.chunk_document(text)
+
+    assert all(len(c.text) <= 50 for c in chunks)
+    assert len(chunks) < 40
+    assert "".join(c.text for c in chunks).count("в") >= 500
@@ -0,0 +1,49 @@
+"""
+Тести для схеми колекції Qdrant.
+"""
+
+from unittest.mock import MagicMock
+
+from src.config import settings
+from src.rag.collection import (
+    PAYLOAD_INDEXES,
+    create_collection,
+    ensure_payload_indexes,
+    search_params,
+)
+
+
+def test_create_collection_applies_tuning(monkeypatch):
+    """HNSW, on-disk, int8 квантизація та keyword індекси з налаштувань."""
+    monkeypatch.setattr(settings, "qdrant_hnsw_m", 32)
+    monkeypatch.setattr(settings, "qdrant_on_disk_vectors", True)
+    monkeypatch.setattr(settings, "qdrant_quantization_enabled", True)
+    client = MagicMock()
+    client.get_collection.return_value.payload_schema = {}
+
+    create_collection(client, "tz", 1024)
+
+    kwargs = client.create_collection.call_args.kwargs
+    assert kwargs["hnsw_config"].m == 32
+    assert kwargs["vectors_config"].on_disk is True
+    assert kwargs["quantization_config"].scalar.type == "int8"
+    indexed = [c.kwargs["field_name"] for c in client.create_payload_index.call_args_list]
+    assert indexed == list(PAYLOAD_INDEXES)
+
+
+def test_ensure_payload_indexes_adds_only_missing():
+    """Існуючій колекції додаються лише відсутні індекси."""
+    client = MagicMock()
+    client.get_collection.return_value.payload_schema = {"section_id": object()}
+
+    assert ensure_payload_indexes(client, "tz") == ["source_file"]
+
+
+def test_search_params_rescore_with_quantization(monkeypatch):
+    """З квантизацією пошук переранжує кандидатів за оригінальними векторами."""
+    monkeypatch.setattr(settings, "qdrant_quantization_enabled", True)
+
+    params = search_params()
+    assert params.hnsw_ef == settings.qdrant_hnsw_ef
+    assert params.quantization.rescore is True
+    assert search_params(exact=True).exact is True
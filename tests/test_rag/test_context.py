@@ -0,0 +1,64 @@
+"""
+Тести для побудови RAG контексту секції.
+"""
+
+from src.llm.rate_limiter import estimate_tokens
+from src.rag.context import ContextBuilder
+
+
+def result(text: str, score: float, chunk_index: int | None = None, source: str = "a.docx"):
+    return {
+        "text": text,
+        "score": score,
+        "source_file": source,
+        "section_id": "7",
+        "chunk_index": chunk_index,
+    }
+
+
+BOILERPLATE = "Система повинна забезпечувати захист інформації від несанкціонованого доступу."
+
+
+def test_mmr_drops_near_duplicates():
+    """Типове формулювання з різних зразків потрапляє в контекст один раз."""
+    results = [
+        result(BOILERPLATE, 0.95, source="a.docx"),
+        result(BOILERPLATE + " Зразок.", 0.94, source="b.docx"),
+        result("Резервне копіювання бази даних виконується щодоби.", 0.80, source="c.docx"),
+    ]
+
+    context = ContextBuilder(max_tokens=1000).build(results, top_k=3)
+
+    assert context.chunks == 2
+    assert context.text.count("несанкціонованого") == 1
+    assert "Резервне копіювання" in context.text
+    assert context.tokens_saved > 0
+
+
+def test_adjacent_chunks_are_stitched_without_overlap():
+    """Сусідні чанки одного файлу зшиваються, перекриття не повторюється."""
+    first = "Перше речення про архітектуру. Друге речення про інтеграцію з ЄДР."
+    second = "Друге речення про інтеграцію з ЄДР. Третє речення про журналювання."
+    results = [result(second, 0.9, chunk_index=4), result(first, 0.8, chunk_index=3)]
+
+    context = ContextBuilder(max_tokens=1000, duplicate_threshold=1.0).build(results, top_k=2)
+
+    assert context.text == (
+        "Перше речення про архітектуру. Друге речення про інтеграцію з ЄДР. "
+        "Третє речення про журналювання."
+    )
+
+
+def test_context_fits_token_budget():
+    """Фрагменти понад бюджет відкидаються, перший обрізається по межі слова."""
+    long_text = " ".join(f"слово{i}" for i in range(300))
+    results = [
+        result(long_text, 0.9, chunk_index=0),
+        result("Короткий фрагмент про моніторинг.", 0.5, chunk_index=5),
+    ]
+
+    context = ContextBuilder(max_tokens=100).build(results, top_k=2)
+
+    assert context.tokens <= 100
+    assert context.text.startswith("слово0 слово1")
+    assert estimate_tokens(context.text) == context.tokens
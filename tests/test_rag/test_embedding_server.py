@@ -0,0 +1,75 @@
+"""
+Тести для сервера ембедінгів з динамічним батчингом.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.rag.embedding_cache import EmbeddingCache
+from src.rag.embedding_server import EmbeddingServer
+from src.rag.embeddings import EmbeddingService
+from src.utils.exceptions import RAGError
+
+
+class CountingModel:
+    """Модель, що рахує виклики encode."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def encode(self, texts, show_progress_bar=False):
+        self.calls += 1
+        return np.array([[float(len(t)), 1.0] for t in texts], dtype=np.float32)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_clients_share_one_batch(tmp_path):
+    """Одночасні запити воркерів об'єднуються в один виклик моделі."""
+    model = CountingModel()
+    backend = EmbeddingService(
+        model_name="fake", cache=EmbeddingCache("fake", db_path=""), server_socket=""
+    )
+    backend._model = model
+
+    socket_path = str(tmp_path / "emb.sock")
+    server = EmbeddingServer(socket_path, embedding_service=backend, batch_window_ms=100)
+    await server.start()
+    try:
+        clients = [
+            EmbeddingService(
+                model_name="fake",
+                cache=EmbeddingCache("fake", db_path=""),
+                server_socket=socket_path,
+            )
+            for _ in range(3)
+        ]
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(client.embed, text)
+                for client, text in zip(clients, ["а", "бб", "ввв"])
+            )
+        )
+
+        assert results == [[1.0, 1.0], [2.0, 1.0], [3.0, 1.0]]
+        assert model.calls == 1
+        assert await asyncio.to_thread(lambda: clients[0].embedding_dimension) == 2
+        assert clients[0]._model is None
+    finally:
+        await server.stop()
+
+
+def test_client_without_server_raises(tmp_path):
+    """Недоступний сервер — RAGError, а не зависання."""
+    client = EmbeddingService(
+        model_name="fake",
+        cache=EmbeddingCache("fake", db_path=""),
+        server_socket=str(tmp_path / "missing.sock"),
+    )
+
+    with pytest.raises(RAGError):
+        client.embed("текст")
@@ -0,0 +1,73 @@
+"""
+Тести для кешу ембедінгів.
+"""
+
+import numpy as np
+import pytest
+
+from src.config import settings
+from src.rag.embedding_cache import EmbeddingCache
+from src.rag.embeddings import EmbeddingService
+from src.utils.exceptions import RAGError
+
+
+class FakeModel:
+    """Модель, що рахує кількість закодованих текстів."""
+
+    def __init__(self) -> None:
+        self.encoded: list[str] = []
+
+    def encode(self, texts, show_progress_bar=False):
+        self.encoded.extend(texts)
+        return np.array([[float(len(t)), 1.0] for t in texts], dtype=np.float32)
+
+
+def make_service(cache: EmbeddingCache) -> tuple[EmbeddingService, FakeModel]:
+    service = EmbeddingService(model_name="fake", cache=cache)
+    model = FakeModel()
+    service._model = model
+    return service, model
+
+
+def test_embed_and_batch_share_cache(tmp_path):
+    """embed та embed_batch не кодують повторно вже відомі тексти."""
+    service, model = make_service(EmbeddingCache("fake", db_path=str(tmp_path / "emb.sqlite")))
+
+    first = service.embed("захист")
+    batch = service.embed_batch(["захист", "вимоги", "вимоги"])
+
+    assert batch[0] == first
+    assert batch[1] == batch[2]
+    assert model.encoded == ["захист", "вимоги"]
+
+
+def test_disk_tier_survives_restart_and_is_scoped_by_model(tmp_path):
+    """Новий сервіс читає ембедінги з SQLite лише для тієї ж моделі."""
+    db_path = str(tmp_path / "emb.sqlite")
+    service, _ = make_service(EmbeddingCache("fake", db_path=db_path))
+    expected = service.embed_batch(["секція 7"])
+
+    restarted, model = make_service(EmbeddingCache("fake", db_path=db_path))
+    assert restarted.embed_batch(["секція 7"]) == expected
+    assert model.encoded == []
+
+    other, other_model = make_service(EmbeddingCache("other", db_path=db_path))
+    other.embed("секція 7")
+    assert other_model.encoded == ["секція 7"]
+
+
+def test_unknown_backend_rejected():
+    """Невідомий бекенд ембедінгів — RAGError при створенні сервісу."""
+    with pytest.raises(RAGError):
+        EmbeddingService(model_name="fake", backend="tensorrt")
+
+
+def test_onnx_backend_requires_export(tmp_path, monkeypatch):
+    """ONNX бекенд без експортованої моделі підказує команду експорту."""
+    monkeypatch.setattr(settings, "embedding_onnx_dir", str(tmp_path))
+    service = EmbeddingService(
+        model_name="fake", backend="onnx", cache=EmbeddingCache("fake", db_path="")
+    )
+
+    with pytest.raises(RAGError, match="export_onnx_embeddings"):
+        service.model
@@ -0,0 +1,236 @@
+"""
+Тести для інкрементальної інгестії (in-memory Qdrant).
+"""
+
+import zipfile
+
+import pytest
+from docx import Document
+from qdrant_client import QdrantClient
+
+from src.config import settings
+from src.rag.chunker import DocumentChunker
+from src.rag.ingestion import DocumentIngestionPipeline, IngestionManifest, iter_docx_paragraphs
+from src.rag.vector_index import VectorIndex
+from src.utils.exceptions import RAGError
+
+COLLECTION = "test_ingest"
+
+
+class FakeEmbeddingService:
+    """Детермінований ембедінг, що рахує закодовані тексти."""
+
+    embedding_dimension = 3
+
+    def __init__(self) -> None:
+        self.encoded = 0
+        self.batches: list[int] = []
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        self.encoded += len(texts)
+        self.batches.append(len(texts))
+        return [[float(len(t)), 1.0, 0.0] for t in texts]
+
+
+def write_docx(path, paragraphs: list[str]) -> None:
+    doc = Document()
+    for text in paragraphs:
+        doc.add_paragraph(text)
+    doc.save(str(path))
+
+
+def truncate_docx(path, fraction: float) -> None:
+    """Обрізання word/document.xml (DOCX, пошкоджений посередині)."""
+    with zipfile.ZipFile(path) as archive:
+        entries = {name: archive.read(name) for name in archive.namelist()}
+    xml = entries["word/document.xml"]
+    entries["word/document.xml"] = xml[: int(len(xml) * fraction)]
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+
+
+def sections(prefix: str, count: int) -> list[str]:
+    paragraphs = []
+    for number in range(1, count + 1):
+        paragraphs += [f"{number}. Розділ {number}", f"{prefix} вимоги розділу {number}."]
+    return paragraphs
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    """Пайплайн з in-memory Qdrant, символьним чанкером та маніфестом у tmp."""
+    return DocumentIngestionPipeline(
+        embedding_service=FakeEmbeddingService(),
+        chunker=DocumentChunker(),
+        collection_name=COLLECTION,
+        qdrant_client=QdrantClient(location=":memory:"),
+        manifest=IngestionManifest(str(tmp_path / "manifest.json")),
+    )
+
+
+def test_reingestion_skips_unchanged_and_replaces_changed(pipeline, tmp_path):
+    """Незмінений файл пропускається, змінений замінює свої чанки."""
+    docx_path = tmp_path / "tz.docx"
+    write_docx(
+        docx_path,
+        ["1. Загальні відомості", "Портал е-послуг.", "7. Безпека", "Шифрування."],
+    )
+
+    def version():
+        return pipeline.qdrant_client.get_collection(COLLECTION).config.metadata["data_version"]
+
+    assert pipeline.ingest_file(docx_path) == 2
+    first_version = version()
+    assert pipeline.ingest_file(docx_path) == 2
+    assert pipeline.embedding_service.encoded == 2
+    assert pipeline.qdrant_client.count(COLLECTION).count == 2
+    assert version() == first_version
+
+    write_docx(docx_path, ["1. Загальні відомості", "Оновлений портал."])
+    assert pipeline.ingest_file(docx_path) == 1
+
+    points, _ = pipeline.qdrant_client.scroll(COLLECTION, with_payload=True)
+    assert [p.payload["text"] for p in points] == ["Оновлений портал."]
+    assert version() != first_version
+
+
+def test_point_ids_are_deterministic(pipeline, tmp_path):
+    """Примусова повторна інгестія перезаписує ті самі точки."""
+    docx_path = tmp_path / "tz.docx"
+    write_docx(docx_path, ["1. Загальні відомості", "Портал е-послуг."])
+
+    pipeline.ingest_file(docx_path)
+    first_ids = {p.id for p in pipeline.qdrant_client.scroll(COLLECTION)[0]}
+    pipeline.ingest_file(docx_path, force=True)
+
+    assert {p.id for p in pipeline.qdrant_client.scroll(COLLECTION)[0]} == first_ids
+
+
+def test_ingest_directory_pipelined(pipeline, tmp_path, monkeypatch):
+    """Конвеєр: пул процесів, спільні пакети ембедінгів, пакетний upsert."""
+    monkeypatch.setattr(settings, "ingestion_upsert_batch_size", 2)
+    monkeypatch.setattr(settings, "ingestion_max_in_flight", 1)
+    samples = tmp_path / "samples"
+    samples.mkdir()
+    write_docx(
+        samples / "a.docx",
+        ["1. Загальні відомості", "Портал.", "7. Безпека", "Шифрування."],
+    )
+    write_docx(
+        samples / "b.docx",
+        ["1. Загальні відомості", "Реєстр.", "2. Мета", "Облік.", "3. Вимоги", "SLA."],
+    )
+
+    results = pipeline.ingest_directory(samples, workers=2)
+
+    assert results == {"a.docx": 2, "b.docx": 3}
+    assert pipeline.qdrant_client.count(COLLECTION).count == 5
+    assert pipeline.stats.files_ingested == 2
+    assert pipeline.stats.chunks_per_second > 0
+
+    again = pipeline.ingest_directory(samples, workers=2)
+    assert again == results
+    assert pipeline.stats.files_skipped == 2
+    assert pipeline.embedding_service.encoded == 5
+
+
+def test_iter_docx_paragraphs_matches_python_docx(tmp_path):
+    """Потоковий reader дає ті самі непорожні абзаци тіла документа, що й python-docx."""
+    docx_path = tmp_path / "tz.docx"
+    doc = Document()
+    doc.add_paragraph("1. Загальні відомості")
+    run = doc.add_paragraph("Портал").add_run("\tе-послуг")
+    run.add_break()
+    run.add_text("друга лінія")
+    doc.add_table(rows=1, cols=1).cell(0, 0).text = "Клітинка таблиці"
+    doc.add_paragraph("")
+    doc.add_paragraph("7. Безпека")
+    doc.save(str(docx_path))
+
+    expected = [p.text for p in Document(str(docx_path)).paragraphs if p.text.strip()]
+    assert list(iter_docx_paragraphs(docx_path)) == expected
+
+
+def test_ingest_file_streams_embedding_micro_batches(pipeline, tmp_path, monkeypatch):
+    """Ембедінги рахуються мікропакетами, а не для всього документа одразу."""
+    monkeypatch.setattr(settings, "ingestion_embed_batch_size", 2)
+    docx_path = tmp_path / "tz.docx"
+    paragraphs = []
+    for number in range(1, 6):
+        paragraphs += [f"{number}. Розділ {number}", f"Вимоги розділу {number}."]
+    write_docx(docx_path, paragraphs)
+
+    assert pipeline.ingest_file(docx_path) == 5
+    assert pipeline.embedding_service.batches == [2, 2, 1]
+    assert pipeline.qdrant_client.count(COLLECTION).count == 5
+
+
+def test_ingest_into_vector_index_without_qdrant(tmp_path):
+    """RAG_BACKEND=numpy: інгестія пише у вбудований індекс і замінює стару версію файлу."""
+    index_path = tmp_path / "index"
+    pipeline = DocumentIngestionPipeline(
+        embedding_service=FakeEmbeddingService(),
+        chunker=DocumentChunker(),
+        manifest=IngestionManifest(str(tmp_path / "manifest.json")),
+        vector_index=VectorIndex(index_path),
+    )
+    docx_path = tmp_path / "tz.docx"
+    write_docx(
+        docx_path,
+        ["1. Загальні відомості", "Портал е-послуг.", "7. Безпека", "Шифрування."],
+    )
+    assert pipeline.ingest_file(docx_path) == 2
+
+    write_docx(docx_path, ["7. Безпека", "Оновлене шифрування."])
+    assert pipeline.ingest_file(docx_path) == 1
+
+    loaded = VectorIndex.load(index_path)
+    assert pipeline.qdrant_client is None
+    assert [p["text"] for _, p in loaded.search([[1.0, 1.0, 0.0]], ["7"], top_k=5)[0]] == [
+        "Оновлене шифрування."
+    ]
+
+
+def test_truncated_docx_leaves_previous_version_intact(pipeline, tmp_path, monkeypatch):
+    """Обірване читання нової версії не лишає її чанків поруч зі старою."""
+    monkeypatch.setattr(settings, "ingestion_embed_batch_size", 1)
+    monkeypatch.setattr(settings, "ingestion_upsert_batch_size", 1)
+    samples = tmp_path / "samples"
+    samples.mkdir()
+    write_docx(samples / "tz.docx", sections("Стара", 3))
+    assert pipeline.ingest_directory(samples) == {"tz.docx": 3}
+    old_entry = pipeline.manifest.get(COLLECTION, "tz.docx")
+
+    write_docx(samples / "tz.docx", sections("Нова", 12))
+    truncate_docx(samples / "tz.docx", 0.8)
+    encoded = pipeline.embedding_service.encoded
+
+    assert pipeline.ingest_directory(samples) == {"tz.docx": 0}
+    assert pipeline.embedding_service.encoded > encoded
+    points, _ = pipeline.qdrant_client.scroll(COLLECTION, with_payload=True)
+    assert sorted(p.payload["text"] for p in points) == [
+        f"Стара вимоги розділу {number}." for number in range(1, 4)
+    ]
+    assert pipeline.manifest.get(COLLECTION, "tz.docx") == old_entry
+    assert pipeline.stats.files_failed == 1
+
+
+def test_truncated_docx_removed_from_vector_index(tmp_path, monkeypatch):
+    """Вбудований індекс: частково записана версія видаляється, помилка прокидається."""
+    monkeypatch.setattr(settings, "ingestion_embed_batch_size", 1)
+    pipeline = DocumentIngestionPipeline(
+        embedding_service=FakeEmbeddingService(),
+        chunker=DocumentChunker(),
+        manifest=IngestionManifest(str(tmp_path / "manifest.json")),
+        vector_index=VectorIndex(tmp_path / "index"),
+    )
+    docx_path = tmp_path / "tz.docx"
+    write_docx(docx_path, sections("Нова", 12))
+    truncate_docx(docx_path, 0.8)
+
+    with pytest.raises(RAGError):
+        pipeline.ingest_file(docx_path)
+
+    assert pipeline.embedding_service.encoded > 0
+    assert len(pipeline.vector_index) == 0
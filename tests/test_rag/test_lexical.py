@@ -0,0 +1,31 @@
+"""
+Тести для лексичного (BM25) представлення тексту.
+"""
+
+from src.rag.lexical import sparse_document, sparse_query, term_id, tokenize
+
+
+def test_tokenize_keeps_codes_and_stems_words():
+    """Коди документів цілі, абревіатури без стемінгу, словоформи зводяться."""
+    tokens = tokenize("Вимоги НД ТЗІ 2.5-004-99 та ДСТУ 3008:2015 до захисту")
+
+    assert "2.5-004-99" in tokens
+    assert "3008:2015" in tokens
+    assert {"нд", "тзі", "дсту"} <= set(tokens)
+    assert "та" not in tokens
+    assert tokenize("захисту") == tokenize("захист")
+    assert tokenize("інформації") == tokenize("інформація")
+
+
+def test_sparse_vectors_share_term_ids():
+    """Запит і документ кодують терміни однаковими індексами."""
+    doc_indices, doc_values = sparse_document("Відповідність ДСТУ 3008:2015 та ДСТУ 3008:2015")
+    query_indices, query_values = sparse_query("ДСТУ 3008:2015")
+
+    assert set(query_indices) <= set(doc_indices)
+    assert query_values == [1.0, 1.0]
+    assert doc_indices == sorted(doc_indices)
+    # Повторення терміна підвищує вагу, але з насиченням BM25
+    weights = dict(zip(doc_indices, doc_values))
+    assert weights[term_id("дсту")] > weights[term_id(tokenize("Відповідність")[0])]
+    assert weights[term_id("дсту")] < 2.2
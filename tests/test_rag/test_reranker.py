@@ -0,0 +1,87 @@
+"""
+Тести для переранжування cross-encoder.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.rag.reranker import CrossEncoderReranker
+
+
+class FakeCrossEncoder:
+    """Оцінка — довжина тексту чанка; фіксує кількість проходів."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls: list[int] = []
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False):
+        time.sleep(self.delay)
+        self.calls.append(len(pairs))
+        return [len(text) / 100 for _, text in pairs]
+
+
+def make_reranker(model: FakeCrossEncoder, timeout: float = 5.0) -> CrossEncoderReranker:
+    reranker = CrossEncoderReranker(model_name="fake", timeout=timeout)
+    reranker._model = model
+    return reranker
+
+
+def hits(*texts: str) -> list[dict]:
+    return [{"id": t, "text": t, "score": 1.0 - i / 10} for i, t in enumerate(texts)]
+
+
+@pytest.mark.asyncio
+async def test_rerank_batch_scores_all_sections_in_one_pass():
+    """Пари всіх секцій оцінюються одним викликом моделі."""
+    model = FakeCrossEncoder()
+    reranker = make_reranker(model)
+
+    reranked = await reranker.rerank_batch(
+        ["секція 1", "секція 7"],
+        [hits("коротко", "довший фрагмент"), hits("а", "бб", "ввв")],
+    )
+
+    assert model.calls == [5]
+    assert [r["text"] for r in reranked[0]] == ["довший фрагмент", "коротко"]
+    assert [r["text"] for r in reranked[1]] == ["ввв", "бб", "а"]
+    assert reranked[1][0]["vector_score"] == pytest.approx(0.8)
+
+
+@pytest.mark.asyncio
+async def test_rerank_timeout_keeps_vector_order():
+    """Після бюджету часу — векторний порядок; поки прохід триває, модель не викликається."""
+    model = FakeCrossEncoder(delay=0.3)
+    reranker = make_reranker(model, timeout=0.05)
+    candidates = [hits("коротко", "довший фрагмент")]
+
+    assert await reranker.rerank_batch(["секція 1"], candidates) == candidates
+    assert await reranker.rerank_batch(["секція 1"], candidates) == candidates
+
+    time.sleep(0.4)
+    assert model.calls == [2]
+
+
+@pytest.mark.asyncio
+async def test_job_cancelled_before_start_releases_busy_flag():
+    """Скасований до старту прохід не лишає переранжування зайнятим."""
+    model = FakeCrossEncoder()
+    reranker = make_reranker(model)
+    candidates = [hits("коротко", "довший фрагмент")]
+    release = threading.Event()
+    reranker._executor.submit(release.wait)
+
+    task = asyncio.create_task(reranker.rerank_batch(["секція 1"], candidates))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    release.set()
+
+    assert not reranker._running.is_set()
+    reranked = await reranker.rerank_batch(["секція 1"], candidates)
+    assert [r["text"] for r in reranked[0]] == ["довший фрагмент", "коротко"]
+    assert model.calls == [2]
@@ -0,0 +1,200 @@
+"""
+Тести для RAGRetriever (in-memory Qdrant).
+"""
+
+import pytest
+import pytest_asyncio
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import (
+    Distance,
+    Modifier,
+    PointStruct,
+    SparseVector,
+    SparseVectorParams,
+    VectorParams,
+)
+
+from src.config import settings
+from src.rag.lexical import sparse_document
+from src.rag.reranker import CrossEncoderReranker
+from src.rag.retriever import RAGRetriever, reciprocal_rank_fusion
+
+COLLECTION = "test_tz"
+
+
+class FakeEmbeddingService:
+    """Детермінований ембедінг без завантаження моделі."""
+
+    def __init__(self) -> None:
+        self.encoded = 0
+
+    def embed(self, text: str) -> list[float]:
+        self.encoded += 1
+        return [1.0, 0.0, 0.0] if "безпек" in text else [0.0, 1.0, 0.0]
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed(t) for t in texts]
+
+
+@pytest_asyncio.fixture
+async def retriever():
+    """Retriever з in-memory колекцією з трьох чанків."""
+    client = AsyncQdrantClient(location=":memory:")
+    await client.create_collection(
+        COLLECTION,
+        vectors_config=VectorParams(size=3, distance=Distance.COSINE),
+    )
+    await client.upsert(
+        COLLECTION,
+        points=[
+            PointStruct(
+                id=1, vector=[1.0, 0.0, 0.0], payload={"text": "Захист", "section_id": "7"}
+            ),
+            PointStruct(
+                id=2, vector=[0.0, 1.0, 0.0], payload={"text": "Загальні", "section_id": "1"}
+            ),
+            PointStruct(
+                id=3, vector=[0.9, 0.1, 0.0], payload={"text": "Шифрування", "section_id": "7"}
+            ),
+        ],
+    )
+    rag = RAGRetriever(
+        embedding_service=FakeEmbeddingService(),
+        collection_name=COLLECTION,
+        qdrant_client=client,
+    )
+    yield rag
+    await rag.close()
+
+
+@pytest.mark.asyncio
+async def test_search_with_section_filter(retriever):
+    """Фільтр по секції повертає лише чанки цієї секції."""
+    results = await retriever.search("вимоги безпеки", top_k=5, section_filter="7")
+
+    assert {r["section_id"] for r in results} == {"7"}
+    assert results[0]["text"] == "Захист"
+
+
+@pytest.mark.asyncio
+async def test_search_for_section_falls_back_without_filter(retriever):
+    """Порожній результат з фільтром — повторний пошук без фільтра."""
+    context = await retriever.search_for_section("5", "портал", top_k=1)
+
+    assert context == "Загальні"
+
+
+@pytest.mark.asyncio
+async def test_search_for_sections_batches_and_falls_back(retriever):
+    """Пакетний пошук: секція 7 з фільтром, секція 5 — fallback без фільтра."""
+    contexts = await retriever.search_for_sections(["7", "5"], "вимоги безпеки", top_k=1)
+
+    assert contexts == {"7": "Захист", "5": "Захист"}
+
+
+@pytest.mark.asyncio
+async def test_repeat_search_served_from_cache_until_version_changes(retriever):
+    """Повторна генерація не ембедить запити; нова версія даних інвалідує кеш."""
+    await retriever.backend.qdrant_client.update_collection(
+        COLLECTION, metadata={"data_version": "v1"}
+    )
+    first = await retriever.search_for_sections(["7", "5"], "вимоги безпеки", top_k=1)
+    encoded = retriever.embedding_service.encoded
+
+    assert await retriever.search_for_sections(["7", "5"], "вимоги безпеки", top_k=1) == first
+    assert await retriever.search("вимоги безпеки", top_k=5, section_filter="7")
+    await retriever.search("вимоги безпеки", top_k=5, section_filter="7")
+    assert retriever.embedding_service.encoded == encoded + 1
+
+    await retriever.backend.qdrant_client.update_collection(
+        COLLECTION, metadata={"data_version": "v2"}
+    )
+    await retriever.search_for_sections(["7", "5"], "вимоги безпеки", top_k=1)
+    assert retriever.embedding_service.encoded > encoded + 1
+
+
+@pytest.mark.asyncio
+async def test_search_not_cached_without_data_version(retriever):
+    """Колекція без версії даних (ще не було інгестії) — кеш не використовується."""
+    await retriever.search("вимоги безпеки", top_k=5, section_filter="7")
+    await retriever.search("вимоги безпеки", top_k=5, section_filter="7")
+
+    assert retriever.embedding_service.encoded == 2
+    assert len(retriever.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_search_for_sections_reranks_candidates(retriever):
+    """Cross-encoder змінює порядок кандидатів секції перед відбором контексту."""
+
+    class PrefersEncryption:
+        def predict(self, pairs, batch_size=32, show_progress_bar=False):
+            return [0.9 if text == "Шифрування" else 0.1 for _, text in pairs]
+
+    retriever.reranker = CrossEncoderReranker(model_name="fake")
+    retriever.reranker._model = PrefersEncryption()
+
+    contexts = await retriever.search_for_sections(["7"], "вимоги безпеки", top_k=1)
+
+    assert contexts == {"7": "Шифрування"}
+
+
+@pytest.mark.asyncio
+async def test_hybrid_mode_falls_back_to_dense_without_sparse_vectors(retriever, monkeypatch):
+    """Колекція без sparse-вектора — гібридний режим виконує щільний пошук."""
+    monkeypatch.setattr(settings, "rag_search_mode", "hybrid")
+
+    results = await retriever.search("вимоги безпеки", top_k=2, section_filter="7")
+
+    assert [r["text"] for r in results] == ["Захист", "Шифрування"]
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_ranks_exact_reference_first(monkeypatch):
+    """Точне нормативне посилання піднімається BM25, хоча щільний пошук ставить його останнім."""
+    monkeypatch.setattr(settings, "rag_search_mode", "hybrid")
+    client = AsyncQdrantClient(location=":memory:")
+    await client.create_collection(
+        COLLECTION,
+        vectors_config=VectorParams(size=3, distance=Distance.COSINE),
+        sparse_vectors_config={"bm25": SparseVectorParams(modifier=Modifier.IDF)},
+    )
+    chunks = [
+        ([1.0, 0.0, 0.0], "Загальні положення"),
+        ([0.9, 0.1, 0.0], "Політика установи"),
+        ([0.0, 1.0, 0.0], "Захист відповідно до НД ТЗІ 2.5-004-99"),
+    ]
+    points = []
+    for point_id, (vector, text) in enumerate(chunks, start=1):
+        indices, values = sparse_document(text)
+        points.append(
+            PointStruct(
+                id=point_id,
+                vector={"": vector, "bm25": SparseVector(indices=indices, values=values)},
+                payload={"text": text, "section_id": "7"},
+            )
+        )
+    await client.upsert(COLLECTION, points=points)
+    rag = RAGRetriever(
+        embedding_service=FakeEmbeddingService(),
+        collection_name=COLLECTION,
+        qdrant_client=client,
+    )
+
+    results = await rag.search("безпека за НД ТЗІ 2.5-004-99", top_k=2, section_filter="7")
+    batch = await rag.search_batch([("безпека за НД ТЗІ 2.5-004-99", None)], top_k=2)
+    await rag.close()
+
+    assert results[0]["text"] == "Захист відповідно до НД ТЗІ 2.5-004-99"
+    assert [r["id"] for r in batch[0]] == [r["id"] for r in results]
+
+
+def test_reciprocal_rank_fusion_merges_by_id():
+    """Документ з обох ранжувань випереджає лідера одного з них."""
+    dense = [{"id": "a", "score": 0.9}, {"id": "b", "score": 0.8}]
+    lexical = [{"id": "b", "score": 12.0}, {"id": "c", "score": 3.0}]
+
+    fused = reciprocal_rank_fusion([dense, lexical], top_k=2, k=60)
+
+    assert [r["id"] for r in fused] == ["b", "a"]
+    assert fused[0]["score"] == pytest.approx(1 / 62 + 1 / 61)
@@ -0,0 +1,120 @@
+"""
+Тести для вбудованого векторного індексу (NumPy).
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.rag.search_backend import NumpySearchBackend
+from src.rag.vector_index import VectorIndex
+
+
+def point(point_id: str, vector: list[float], section_id: str, file_hash: str = "h1"):
+    return SimpleNamespace(
+        id=point_id,
+        vector=vector,
+        payload={
+            "text": f"чанк {point_id}",
+            "section_id": section_id,
+            "source_file": "tz.docx",
+            "file_hash": file_hash,
+        },
+    )
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Індекс з трьох точок у двох секціях."""
+    index = VectorIndex(tmp_path / "index")
+    index.upsert(
+        [
+            point("a", [1.0, 0.0, 0.0], "7"),
+            point("b", [0.0, 1.0, 0.0], "1"),
+            point("c", [0.9, 0.1, 0.0], "7"),
+        ]
+    )
+    return index
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16"])
+def test_search_persists_and_filters_by_section(tmp_path, dtype):
+    """Збережений індекс відкривається через mmap та фільтрує по секції."""
+    index = VectorIndex(tmp_path / "index", dtype=dtype)
+    index.upsert([point("a", [1.0, 0.0, 0.0], "7"), point("b", [0.0, 1.0, 0.0], "1")])
+    index.save()
+
+    loaded = VectorIndex.load(tmp_path / "index")
+    unfiltered, filtered = loaded.search([[0.0, 1.0, 0.0]] * 2, [None, "7"], top_k=5)
+
+    assert str(loaded.dtype) == dtype
+    assert loaded.version == index.version is not None
+    assert [p["text"] for _, p in unfiltered] == ["чанк b", "чанк a"]
+    assert [p["text"] for _, p in filtered] == ["чанк a"]
+    assert unfiltered[0][0] == pytest.approx(1.0, abs=1e-3)
+
+
+def test_upsert_replaces_and_delete_stale(index):
+    """Той самий ID замінює точку; delete_stale прибирає стару версію файлу."""
+    index.upsert([point("a", [0.0, 0.0, 1.0], "7", file_hash="h2")])
+
+    assert len(index) == 3
+    assert index.search([[0.0, 0.0, 1.0]], [None], top_k=1)[0][0][1]["text"] == "чанк a"
+    assert index.delete_stale("tz.docx", "h2") == 2
+    assert [p["section_id"] for _, p in index.search([[1.0, 0.0, 0.0]], ["7"], top_k=5)[0]] == ["7"]
+
+
+@pytest.mark.asyncio
+async def test_numpy_backend_search_batch(index):
+    """Бекенд повертає результати у форматі RAGRetriever."""
+    backend = NumpySearchBackend(index)
+
+    results = await backend.search_batch([[1.0, 0.0, 0.0], [1.0, 0.0, 0.0]], ["7", "5"], top_k=2)
+
+    assert [r["text"] for r in results[0]] == ["чанк a", "чанк c"]
+    assert results[1] == []
+    assert await backend.health_check()
+
+
+@pytest.mark.asyncio
+async def test_sparse_search_finds_exact_reference(tmp_path):
+    """BM25 знаходить чанк з точним кодом документа, зберігається на диск."""
+    from qdrant_client.models import SparseVector
+
+    from src.rag.lexical import sparse_document, sparse_query
+
+    texts = {"a": "Захист згідно НД ТЗІ 2.5-004-99", "b": "Захист інформації в системі"}
+    index = VectorIndex(tmp_path / "index")
+    for point_id, text in texts.items():
+        indices, values = sparse_document(text)
+        p = point(point_id, [1.0, 0.0, 0.0], "7")
+        p.vector = {"": p.vector, "bm25": SparseVector(indices=indices, values=values)}
+        index.upsert([p])
+    index.save()
+
+    backend = NumpySearchBackend(VectorIndex.load(tmp_path / "index"))
+    results = await backend.search_sparse_batch(
+        [sparse_query("НД ТЗІ 2.5-004-99"), sparse_query("захист")], [None, "1"], top_k=5
+    )
+
+    assert await backend.supports_sparse()
+    assert [r["id"] for r in results[0]] == ["a"]
+    assert results[1] == []
+
+
+@pytest.mark.asyncio
+async def test_numpy_backend_reloads_index_saved_by_another_process(tmp_path):
+    """Інгестія в іншому процесі змінює версію — бекенд перевідкриває індекс."""
+    writer = VectorIndex(tmp_path / "index")
+    writer.upsert([point("a", [1.0, 0.0, 0.0], "7")])
+    writer.save()
+    backend = NumpySearchBackend(path=str(tmp_path / "index"))
+    first_version = await backend.data_version()
+
+    other = VectorIndex.load(tmp_path / "index")
+    other.upsert([point("b", [0.0, 1.0, 0.0], "7")])
+    other.save()
+
+    assert await backend.data_version() == other.version != first_version
+    results = await backend.search_batch([[0.0, 1.0, 0.0]], [None], top_k=1)
+    assert results[0][0]["id"] == "b"
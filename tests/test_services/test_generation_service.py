@@ -0,0 +1,99 @@
+"""
+Тести для дедлайнів GenerationService.
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.services.generation_service import GenerationService
+from src.utils.deadline import Deadline, current_deadline
+from src.utils.exceptions import GenerationTimeoutError
+
+
+@pytest_asyncio.fixture
+async def service(db_session: AsyncSession):
+    """Сервіс генерації з тестовою БД."""
+    return GenerationService(db_session)
+
+
+@pytest.mark.asyncio
+async def test_stage_exceeding_budget_raises(service):
+    """Етап, що не вклався у бюджет, скасовується з GenerationTimeoutError."""
+    with pytest.raises(GenerationTimeoutError):
+        await service._run_stage("analysis", 0.05, asyncio.sleep(5))
+
+
+@pytest.mark.asyncio
+async def test_stage_budget_limited_by_deadline(service):
+    """Бюджет етапу обмежується залишком загального дедлайну."""
+    token = current_deadline.set(Deadline(0.05))
+    try:
+        with pytest.raises(GenerationTimeoutError):
+            await service._run_stage("analysis", 60, asyncio.sleep(5))
+    finally:
+        current_deadline.reset(token)
+
+
+@pytest.mark.asyncio
+async def test_parallel_sections_keep_finished_on_timeout(service, monkeypatch):
+    """Секції, що не встигли, позначаються помилкою; готові зберігаються."""
+
+    async def fake_execute(**kwargs):
+        if kwargs["section_id"] == "10":
+            await asyncio.sleep(5)
+        return {"id": kwargs["section_id"], "title": "", "content": "ok", "subsections": []}
+
+    async def noop_update(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(service.section_generator, "execute", fake_execute)
+    monkeypatch.setattr(service, "_update_task", noop_update)
+
+    sections = await service._generate_sections_parallel(
+        task_id="t",
+        project_name="p",
+        project_description="d",
+        requirements={},
+        contexts={},
+        budget=0.1,
+    )
+
+    assert [s["content"] for s in sections[:9]] == ["ok"] * 9
+    assert "перевищено час" in sections[9]["content"]
+
+
+@pytest.mark.asyncio
+async def test_sequential_sections_keep_finished_on_timeout(service, monkeypatch):
+    """Послідовний режим: таймаут секції не скасовує вже готові секції."""
+
+    async def fake_execute(**kwargs):
+        if kwargs["section_id"] == "3":
+            await asyncio.sleep(5)
+        return {"id": kwargs["section_id"], "title": "", "content": "ok", "subsections": []}
+
+    async def noop_update(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(service.section_generator, "execute", fake_execute)
+    monkeypatch.setattr(service, "_update_task", noop_update)
+
+    sections = await service._generate_sections_sequential(
+        task_id="t",
+        project_name="p",
+        project_description="d",
+        requirements={},
+        contexts={},
+        budget=0.1,
+    )
+
+    assert len(sections) == 10
+    assert [s["content"] for s in sections[:2]] == ["ok"] * 2
+    assert all("перевищено час" in s["content"] for s in sections[2:])
+
+
+def test_cancel_without_running_generation():
+    """Скасування без активної генерації повертає False."""
+    assert GenerationService.cancel_generation("missing") is False